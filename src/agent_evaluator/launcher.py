@@ -1,12 +1,14 @@
 import os
 import sys
 import json
+import time
+import argparse
 import asyncio
 import subprocess
 from pathlib import Path
 from dotenv import load_dotenv
 
-async def run_job(python_exe, runner_script, item_id, log_file, json_path=None, label_key=None):
+async def run_job(python_exe, runner_script, item_id, log_file, json_path=None, label_key=None, result_path=None):
     """Run a single evaluation job."""
     print(f"🚀 提交任务: item {item_id}")
     # Ensure log directory exists
@@ -17,6 +19,8 @@ async def run_job(python_exe, runner_script, item_id, log_file, json_path=None,
         cmd.extend(["--json_path", str(json_path)])
     if label_key:
         cmd.extend(["--label_key", str(label_key)])
+    if result_path:
+        cmd.extend(["--result_path", str(result_path)])
     
     env = os.environ.copy()
     print(f"cmd: {' '.join(cmd)}")
@@ -28,7 +32,64 @@ async def run_job(python_exe, runner_script, item_id, log_file, json_path=None,
             env=env
         )
         await process.wait()
-    return item_id
+    return process.returncode
+
+
+def load_item_results(path):
+    """Read per-item records from a run checkpoint; the last record for an item wins."""
+    results = {}
+    if not path.exists():
+        return results
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 进程被杀时最后一行可能写了一半
+                continue
+            if isinstance(record, dict) and isinstance(record.get("item_id"), int):
+                results[record["item_id"]] = record
+    return results
+
+
+def load_conversation_result(path):
+    """Read the conversation summary the runner wrote for one item, if any."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return result if isinstance(result, dict) else {}
+
+
+def record_history(history_path, report):
+    """Ingest a finished run into the shared results history database."""
+    try:
+        from mcp_evaluator.utils.history import git_commit, record_history as ingest
+    except ImportError as e:
+        print(f"⚠️ 未记录历史: {e}")
+        return
+    run = {
+        "run_id": report["run_id"],
+        "suite": report["eval_type"],
+        "git_commit": git_commit(),
+        "total": report["total"],
+        "passed": report["passed"],
+    }
+    try:
+        rows = ingest(history_path, "agent", run, report["items"])
+    except Exception as e:
+        print(f"⚠️ 未记录历史: {e}")
+        return
+    print(f"📈 历史记录: {rows} 条 -> {history_path}")
+
+
+def append_item_result(path, record):
+    """Append one item record and fsync so a crash never loses a finished item."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
 
 async def main():
     # Load environment variables
@@ -39,9 +100,17 @@ async def main():
     agent_cases_dir_str = os.getenv("AGENT_CASES_DIR", "cases/agent_cases")
     agent_scripts_dir_str = os.getenv("AGENT_SCRIPTS_DIR", "src/agent_evaluator/experiments/threads")
     log_base_dir_str = os.getenv("LOG_BASE_DIR", "cases/logs")
+    # 置空可关闭历史记录
+    history_path = os.getenv("HISTORY_PATH", os.path.join("reports", "history.sqlite"))
     
+    parser = argparse.ArgumentParser(prog="main.py agent")
+    parser.add_argument("eval_type", nargs="?", help="数据集名称 (AGENT_CASES_DIR/<eval_type>.json)")
+    parser.add_argument("--resume", metavar="RUN_ID", help="继续中断的运行，跳过已完成的 item")
+    parser.add_argument("--rerun-failed", action="store_true", help="配合 --resume，重新运行失败的 item")
+    args = parser.parse_args()
+
     # Get evaluation type from command line
-    if len(sys.argv) < 2:
+    if not args.eval_type:
         # Try to list available types from cases dir
         agent_cases_dir = Path(agent_cases_dir_str)
         if agent_cases_dir.exists():
@@ -51,7 +120,7 @@ async def main():
             print("Please specify evaluation type.")
         sys.exit(1)
         
-    eval_type = sys.argv[1]
+    eval_type = args.eval_type
     agent_cases_dir = Path(agent_cases_dir_str)
     log_base_dir = Path(log_base_dir_str)
     
@@ -79,6 +148,22 @@ async def main():
         sys.exit(1)
         
     print(f"总数据量: {total}")
+
+    # 每个 item 的返回码按完成顺序写入 LOG_BASE_DIR/eval_type/runs/<run_id>.jsonl
+    run_id = args.resume or time.strftime("%Y%m%d-%H%M%S")
+    runs_dir = logs_dir / "runs"
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = runs_dir / f"{run_id}.jsonl"
+    print(f"Run ID: {run_id}")
+
+    previous = load_item_results(checkpoint_path) if args.resume else {}
+    done = {
+        i for i, r in previous.items()
+        if i < total and (r.get("returncode") == 0 or not args.rerun_failed)
+    }
+    pending_items = [i for i in range(total) if i not in done]
+    if args.resume:
+        print(f"♻️ 继续运行 {run_id}: 已完成 {len(done)}，待运行 {len(pending_items)}")
     
     # Get python executable (prefer virtual env)
     root_dir_str = os.getenv("ROOT_DIR", ".")
@@ -97,21 +182,56 @@ async def main():
     async def sem_run_job(item_id):
         async with semaphore:
             log_file = logs_dir / f"item_{item_id}.log"
-            await run_job(
+            result_path = logs_dir / f"item_{item_id}.result.json"
+            result_path.unlink(missing_ok=True)
+            started = time.time()
+            returncode = await run_job(
                 str(python_exe), 
                 str(runner_script), 
                 item_id, 
                 str(log_file), 
                 json_path=str(json_path),
-                label_key=eval_type
+                label_key=eval_type,
+                result_path=str(result_path)
             )
+            conversation = load_conversation_result(result_path)
+            append_item_result(checkpoint_path, {
+                "item_id": item_id,
+                "returncode": returncode,
+                "final_state": conversation.get("final_state"),
+                "total_turns": conversation.get("total_turns"),
+                "duration_s": round(time.time() - started, 1),
+                "log_file": str(log_file),
+                "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            })
             # Sleep a bit between submissions as in run.sh
             await asyncio.sleep(3)
 
-    tasks = [sem_run_job(i) for i in range(total)]
+    tasks = [sem_run_job(i) for i in pending_items]
     await asyncio.gather(*tasks)
-    
-    print("✅ 所有任务完成")
+
+    # 合并本次与之前运行的结果，生成最终报告
+    results = load_item_results(checkpoint_path)
+    items = [results[i] for i in range(total) if i in results]
+    failed = [r["item_id"] for r in items if r.get("returncode") != 0]
+    report = {
+        "run_id": run_id,
+        "eval_type": eval_type,
+        "total": total,
+        "completed": len(items),
+        "passed": len(items) - len(failed),
+        "failed": failed,
+        "items": items,
+    }
+    report_path = runs_dir / f"{run_id}.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+
+    print(f"✅ 所有任务完成: {report['passed']}/{total} 成功，报告: {report_path}")
+    if history_path:
+        record_history(history_path, report)
+    if failed:
+        print(f"❌ 失败 item: {failed}（可用 --resume {run_id} --rerun-failed 重跑）")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -27,6 +27,7 @@ def run_single_evaluation():
     parser.add_argument('--item_id', type=int, default=0, help='样本索引')
     parser.add_argument('--json_path', type=str, help='数据集JSON路径')
     parser.add_argument('--label_key', type=str, help='标签（用于日志目录）')
+    parser.add_argument('--result_path', type=str, help='对话结果摘要的输出路径（供 launcher 汇总）')
     args = parser.parse_args()
 
     # 如果没有提供 label_key，尝试从脚本路径或环境变量推断
@@ -34,7 +35,7 @@ def run_single_evaluation():
     if not label_key:
         label_key = os.getenv("AGENT_LABEL_KEY", "default")
 
-    asyncio.run(
+    result = asyncio.run(
         evaluation_threads_single_task(
             args.json_path,
             item_id=args.item_id,
@@ -43,3 +44,10 @@ def run_single_evaluation():
             label_key=label_key,
         )
     )
+    if args.result_path and isinstance(result, dict):
+        with open(args.result_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {k: result.get(k) for k in ('final_state', 'total_turns', 'duration_minutes')},
+                f,
+                ensure_ascii=False,
+            )
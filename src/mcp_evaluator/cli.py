@@ -2,44 +2,112 @@ import argparse
 import asyncio
 import json
 import os
+import platform
+import sqlite3
+import sys
 import time
-from dataclasses import asdict
 from typing import Any, List
 
-from .core import get_tool_schema, list_tools, run_one_case
-from .models import ToolCall, ToolSchema
+from .core import (
+    ARRIVALS,
+    MODES,
+    BlobStore,
+    Cassette,
+    OracleCache,
+    ResultCache,
+    RetryPolicies,
+    Scheduler,
+    DEFAULT_LEVELS,
+    SessionPool,
+    ToolCatalog,
+    find_knee,
+    run_cases,
+    run_load,
+    sweep_point,
+)
+from .core.bench import DEFAULT_BENCH_CONCURRENCY, DEFAULT_REGRESSION_THRESHOLD, compare_bench, run_macro, run_micro
+from .core.blobs import DEFAULT_BLOB_THRESHOLD_BYTES
+from .core.cache import DEFAULT_CACHE_PATH
+from .core.diff import DEFAULT_DIFF_ALPHA, DEFAULT_DIFF_MIN_SHIFT, diff_reports
+from .core.oracle import DEFAULT_ORACLE_MAX_BYTES
+from .core.runner import ShardConfig, merge_shard_stats, run_sharded, shard_configs
 from .utils import (
+    CaseSource,
+    DEFAULT_HISTORY_PATH,
+    FSYNC_POLICIES,
+    HistoryStore,
+    ReportAccumulator,
+    ResultWriter,
+    SuiteAggregator,
+    compact_jsonl,
+    fold_report,
+    git_commit,
+    iter_jsonl,
+    iter_suite_cases,
     load_json,
+    render_bench_report_md,
+    render_diff_report_md,
     render_human_report,
     render_human_report_md,
+    render_load_report_md,
+    render_sweep_report_md,
     write_json,
+    write_json_stream,
     write_text,
-    parse_suite_cases,
+    record_history,
 )
 
 DEFAULT_SERVER_URL = "http://bowd1412840.bohrium.tech:50001/sse"
 
 
-async def run_suite(
+def load_global_config(cases_root: str | None) -> tuple[str, dict[str, Any]]:
+    if not cases_root:
+        cases_root = os.path.join("cases", "mcp_cases") if os.path.isdir(os.path.join("cases", "mcp_cases")) else "cases"
+
+    # Load global config from <cases_root>/config.json (falling back to cases/config.json)
+    global_config: dict[str, Any] = {}
+    global_config_path = os.path.join(cases_root, "config.json")
+    if not os.path.exists(global_config_path):
+        global_config_path = os.path.join("cases", "config.json")
+    if os.path.exists(global_config_path):
+        try:
+            global_config = load_json(global_config_path)
+        except Exception as e:
+            print(f"Warning: Failed to load global config from {global_config_path}: {e}")
+    return cases_root, global_config
+
+
+def suite_cases_path(suite_dir: str) -> str | None:
+    for name in ("cases.jsonl", "cases.json"):
+        path = os.path.join(suite_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def discover_suites(cases_root: str) -> list[str]:
+    if not os.path.isdir(cases_root):
+        return []
+    return [
+        os.path.join(cases_root, item)
+        for item in sorted(os.listdir(cases_root))
+        if os.path.isdir(os.path.join(cases_root, item)) and suite_cases_path(os.path.join(cases_root, item))
+    ]
+
+
+def resolve_suite(
     suite_dir: str | None,
     config_path: str | None,
     cases_path: str | None,
     server_url_override: str | None,
-    timeout_s_cli: float | None,
-    budget_n_results_max_cli: int | None,
-    print_tools_cli: bool | None,
-    threads_cli: int | None,
-    report_path_cli: str | None,
-    report_detail_path_cli: str | None,
-    report_md_path_cli: str | None,
     global_config: dict[str, Any],
-) -> dict[str, Any] | None:
+) -> tuple[str, dict[str, Any], str | None, str]:
     config: dict[str, Any] = {}
     agent_name = ""
 
     if suite_dir:
         config_path = config_path or os.path.join(suite_dir, "config.json")
-        cases_path = cases_path or os.path.join(suite_dir, "cases.json")
+        cases_path = cases_path or suite_cases_path(suite_dir) or os.path.join(suite_dir, "cases.json")
         agent_name = os.path.basename(suite_dir.rstrip(os.sep))
 
     if config_path and os.path.exists(config_path):
@@ -47,16 +115,6 @@ async def run_suite(
         if isinstance(raw, dict):
             config = raw
 
-    # Hierarchical resolution
-    def get_setting(key: str, cli_val: Any = None, default: Any = None) -> Any:
-        if cli_val is not None:
-            return cli_val
-        if key in config:
-            return config[key]
-        if key in global_config:
-            return global_config[key]
-        return default
-
     # Special resolution for server_url
     server_url = server_url_override
     if not server_url or server_url == DEFAULT_SERVER_URL:
@@ -66,26 +124,167 @@ async def run_suite(
             server_url = global_config["agents"][agent_name]
         else:
             server_url = server_url or DEFAULT_SERVER_URL
+    return agent_name, config, cases_path, server_url
+
+
+def resolve_setting(
+    key: str, config: dict[str, Any], global_config: dict[str, Any], cli_val: Any = None, default: Any = None
+) -> Any:
+    if cli_val is not None:
+        return cli_val
+    if key in config:
+        return config[key]
+    if key in global_config:
+        return global_config[key]
+    return default
+
+
+def suite_output_dir(
+    agent_name: str, suite_dir: str | None, cases_path: str, global_config: dict[str, Any], report_path: str | None
+) -> str:
+    base_report_path = report_path or global_config.get("report_path")
+    if base_report_path and agent_name:
+        return os.path.join(base_report_path, agent_name)
+    return suite_dir or os.path.dirname(cases_path) or "."
+
+
+async def run_suite(
+    suite_dir: str | None,
+    config_path: str | None,
+    cases_path: str | None,
+    server_url_override: str | None,
+    timeout_s_cli: float | None,
+    budget_n_results_max_cli: int | None,
+    print_tools_cli: bool | None,
+    threads_cli: int | None,
+    report_path_cli: str | None,
+    report_detail_path_cli: str | None,
+    report_md_path_cli: str | None,
+    global_config: dict[str, Any],
+    mode_cli: str | None = None,
+    cassette_dir_cli: str | None = None,
+    cache_cli: bool | None = None,
+    cache_path_cli: str | None = None,
+    scheduler: Scheduler | None = None,
+    concurrency_mode_cli: str | None = None,
+    fsync_cli: str | None = None,
+    run_id: str | None = None,
+    resume: bool = False,
+    rerun_failed: bool = False,
+    retry_cli: bool | None = None,
+    workers_cli: int | None = None,
+    history_cli: bool | None = None,
+    history_path_cli: str | None = None,
+) -> dict[str, Any] | None:
+    agent_name, config, cases_path, server_url = resolve_suite(
+        suite_dir, config_path, cases_path, server_url_override, global_config
+    )
+
+    # Hierarchical resolution
+    def get_setting(key: str, cli_val: Any = None, default: Any = None) -> Any:
+        return resolve_setting(key, config, global_config, cli_val, default)
 
     timeout_s = float(get_setting("timeout_s", timeout_s_cli, 20.0))
     budget_n_results_max = int(get_setting("budget_n_results_max", budget_n_results_max_cli, 50))
     print_tools = bool(get_setting("print_tools", print_tools_cli, False))
     threads = int(get_setting("threads", threads_cli, 1))
+    pool_size = int(get_setting("pool_size", None, 1))
+    health_check_interval_s = float(get_setting("health_check_interval_s", None, 30.0))
+    mode = str(get_setting("mode", mode_cli, "live"))
+    cassette_dir = str(get_setting("cassette_dir", cassette_dir_cli, "cassettes"))
+    fsync = str(get_setting("fsync", fsync_cli, "batch"))
+    oracle_max_bytes = get_setting("oracle_max_bytes", None, DEFAULT_ORACLE_MAX_BYTES)
+    blob_threshold_bytes = get_setting("blob_threshold_bytes", None, DEFAULT_BLOB_THRESHOLD_BYTES)
+    workers = max(1, int(get_setting("workers", workers_cli, 1)))
+    retry_config = get_setting("retry", None, None) if retry_cli is not False else None
+    try:
+        retry = RetryPolicies.from_config(retry_config) if retry_cli is not False else None
+    except (TypeError, ValueError) as e:
+        raise SystemExit(f"invalid retry config: {e}")
+
+    cache_config = get_setting("cache", None, {})
+    if not isinstance(cache_config, dict):
+        cache_config = {"enabled": bool(cache_config)}
+    cache_enabled = cache_cli if cache_cli is not None else bool(cache_config.get("enabled", False))
+    concurrency = get_setting("concurrency", None, {})
+    if not isinstance(concurrency, dict):
+        concurrency = {}
+    concurrency_mode = concurrency_mode_cli or concurrency.get("mode", "adaptive")
+    history_config = get_setting("history", None, {})
+    if not isinstance(history_config, dict):
+        history_config = {"enabled": bool(history_config)}
+    history_enabled = history_cli if history_cli is not None else bool(history_config.get("enabled", True))
+    # Replayed latencies are the cassette's, not the server's; keep them out of trends.
+    history_path = (
+        history_path_cli or history_config.get("path") or DEFAULT_HISTORY_PATH
+        if history_enabled and mode != "replay"
+        else None
+    )
+
+    if mode not in MODES:
+        raise SystemExit(f"unknown mode: {mode} (expected one of {', '.join(MODES)})")
 
     if not cases_path or not os.path.exists(cases_path):
         print(f"Skipping {agent_name or suite_dir}: cases.json not found at {cases_path}")
         return None
 
-    print(f"\n>>> Running suite: {agent_name or suite_dir}")
-    if threads > 1:
-        print(f"    Concurrent threads: {threads}")
+    cassette: Cassette | None = None
+    if mode != "live":
+        cassette_name = agent_name or os.path.splitext(os.path.basename(cases_path))[0]
+        cassette_path = os.path.join(cassette_dir, f"{cassette_name}.json")
+        if mode == "replay":
+            if not os.path.exists(cassette_path):
+                print(f"Skipping {agent_name or suite_dir}: cassette not found at {cassette_path}")
+                return None
+            cassette = Cassette.load(cassette_path)
+        elif resume and os.path.exists(cassette_path):
+            cassette = Cassette.load(cassette_path)
+        else:
+            cassette = Cassette(cassette_path)
+            cassette.server_url = server_url
+
+    cache_options: dict[str, Any] | None = None
+    if cache_enabled and mode != "replay":
+        cache_options = {
+            "path": cache_path_cli or cache_config.get("path") or DEFAULT_CACHE_PATH,
+            "ttl_s": float(cache_config.get("ttl_s", 3600.0)),
+            "tool_ttl_s": cache_config.get("tool_ttl_s"),
+            "max_bytes": int(cache_config.get("max_bytes", 256 * 1024 * 1024)),
+        }
+    # With workers, each process opens the cache database itself.
+    cache = ResultCache(**cache_options) if cache_options is not None and workers == 1 else None
+
+    label = agent_name or suite_dir or cases_path
+    print(f"\n>>> Running suite: {label}")
+    if mode != "live":
+        print(f"    Mode: {mode} ({cassette.path})")
+    if cache_options is not None:
+        print(f"    Result cache: {cache_options['path']}")
+    if threads > 1 or concurrency_mode == "adaptive":
+        print(f"    Concurrent threads: {threads} ({concurrency_mode})")
+    if workers > 1:
+        print(f"    Worker processes: {workers}")
+
+    scheduler = scheduler or Scheduler()
+    limiter_options = {
+        "adaptive": concurrency_mode == "adaptive",
+        "min_limit": int(concurrency.get("min", 1)),
+        "max_limit": int(concurrency.get("max", 32)),
+        "latency_tolerance": float(concurrency.get("latency_tolerance", 2.0)),
+        "target_p95_ms": concurrency.get("target_p95_ms"),
+        "max_error_rate": float(concurrency.get("max_error_rate", 0.1)),
+    }
+    limiter = scheduler.register(server_url, threads, **limiter_options)
 
-    # Path resolution
-    report_detail_path = report_detail_path_cli or report_path_cli or config.get("report_detail_path") or config.get("report_path")
+    # Path resolution: as for the aggregated report, a --report-path ending in
+    # .json is the detail file and anything else a directory of per-suite reports.
+    report_file_cli = report_path_cli if report_path_cli and report_path_cli.endswith(".json") else None
+    report_dir_cli = report_path_cli if report_path_cli and report_file_cli is None else None
+    report_detail_path = report_detail_path_cli or report_file_cli or config.get("report_detail_path") or config.get("report_path")
     report_md_path = report_md_path_cli or config.get("report_md_path")
 
     if not report_detail_path or not report_md_path:
-        base_report_path = report_path_cli or global_config.get("report_path")
+        base_report_path = report_dir_cli or global_config.get("report_path")
         if base_report_path and agent_name:
             target_dir = os.path.join(base_report_path, agent_name)
             if not report_detail_path:
@@ -99,80 +298,610 @@ async def run_suite(
         if not report_md_path:
             report_md_path = os.path.join(suite_dir, "report.md")
 
-    suite_cases = parse_suite_cases(load_json(cases_path))
-    
-    tools: list[str] | None = None
-    if print_tools:
-        try:
-            tools = await list_tools(server_url, timeout_s=timeout_s)
-        except Exception as e:
-            print(f"    Warning: Failed to list tools: {e}")
-
-    schema_cache: dict[str, ToolSchema | None] = {}
-    schema_lock = asyncio.Lock()
-    semaphore = asyncio.Semaphore(threads)
-
-    async def get_cached_schema(tool_name: str) -> ToolSchema | None:
-        async with schema_lock:
-            if tool_name not in schema_cache:
-                try:
-                    schema = await get_tool_schema(server_url, tool_name=tool_name, timeout_s=timeout_s)
-                    schema_cache[tool_name] = schema
-                except Exception:
-                    schema_cache[tool_name] = None
-            return schema_cache[tool_name]
-
-    async def run_with_semaphore(c):
-        async with semaphore:
-            schema = await get_cached_schema(c.tool_name)
-            return await run_one_case(
-                server_url,
-                ToolCall(tool_name=c.tool_name, args=c.args),
-                timeout_s=timeout_s,
-                tool_schema=schema,
-                budget_n_results_max=budget_n_results_max,
-                case_id=c.case_id,
-                expect=c.expect,
-            )
+    run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+    results_dir = os.path.dirname(report_detail_path or cases_path)
+    # Every suite of an invocation shares the run id, and may share a report
+    # directory, so each streams into its own file under runs/<run_id>/.
+    suite_name = agent_name or os.path.splitext(os.path.basename(cases_path))[0]
+    results_path = os.path.join(results_dir, "runs", run_id, f"{suite_name}.jsonl")
+    legacy_path = os.path.join(results_dir, "runs", f"{run_id}.jsonl")
+    if resume and not os.path.exists(results_path) and os.path.exists(legacy_path):
+        results_path = legacy_path
+    # Shared by every run of the suite, so repeated outputs are stored once.
+    blobs = (
+        BlobStore(os.path.join(results_dir, "blobs"), threshold_bytes=int(blob_threshold_bytes))
+        if blob_threshold_bytes
+        else None
+    )
+
+    # Cases are parsed, and matrices expanded, only as the scheduler pulls them.
+    done: set[str] = set()
+    acc = ReportAccumulator()
+    resumed = 0
+    if resume and os.path.exists(results_path):
+        case_ids = {c.case_id for c in iter_suite_cases(cases_path)}
+        resumed = compact_jsonl(
+            results_path,
+            lambda r: r.get("case_id") in case_ids and (r.get("ok") is True or not rerun_failed),
+        )
+        for record in iter_jsonl(results_path):
+            done.add(record["case_id"])
+            acc.add(record)
+        print(f"    Resuming run {run_id}: {resumed} cases done, {len(case_ids - done)} to run")
+        del case_ids
+    elif resume:
+        print(f"    Resuming run {run_id}: no results at {results_path}, running all cases")
+
+    pool = SessionPool(
+        size=pool_size,
+        timeout_s=timeout_s,
+        health_check_interval_s=health_check_interval_s,
+    )
+    catalog = ToolCatalog(timeout_s=timeout_s, pool=pool)
+    if mode == "replay":
+        catalog.preload(server_url, cassette.tools or [])
+    sharded: dict[str, Any] | None = None
+    try:
+        tools: list[str] | None = None
+        if print_tools:
+            try:
+                tools = await catalog.tool_names(server_url)
+            except Exception as e:
+                print(f"    Warning: Failed to list tools: {e}")
 
-    tasks = [run_with_semaphore(c) for c in suite_cases]
-    results = await asyncio.gather(*tasks)
+        writer = ResultWriter(results_path, fsync=fsync, append=resume)
+        print(f"    Streaming results: {results_path}")
 
-    passed = sum(1 for r in results if r.ok)
-    avg_latency = int(sum(r.latency_ms for r in results) / max(1, len(results)))
-    avg_policy = int(sum(r.policy_score for r in results) / max(1, len(results)))
-    
+        def record(result: dict[str, Any]) -> None:
+            writer.write(result)
+            acc.add(result)
+
+        try:
+            if workers > 1:
+                base = ShardConfig(
+                    server_url=server_url,
+                    timeout_s=timeout_s,
+                    budget_n_results_max=budget_n_results_max,
+                    threads=threads,
+                    pool_size=pool_size,
+                    health_check_interval_s=health_check_interval_s,
+                    limiter=limiter_options,
+                    max_concurrency=scheduler.max_concurrency,
+                    mode=mode,
+                    cassette_path=cassette.path if cassette is not None else None,
+                    cache=cache_options,
+                    oracle_max_bytes=int(oracle_max_bytes) if oracle_max_bytes else None,
+                    blob_root=blobs.root if blobs is not None else None,
+                    blob_threshold_bytes=blobs.threshold_bytes if blobs is not None else 0,
+                    retry=(retry_config or {}) if retry is not None else None,
+                )
+                # Each worker reads its round-robin share straight from the cases file.
+                shards = [CaseSource(cases_path, i, workers, frozenset(done)) for i in range(workers)]
+                sharded = merge_shard_stats(await run_sharded(shard_configs(base, len(shards)), shards, record))
+                if mode == "record":
+                    cassette.calls.update(sharded["calls"])
+            else:
+                await run_cases(
+                    server_url,
+                    CaseSource(cases_path, skip=frozenset(done)),
+                    timeout_s,
+                    scheduler=scheduler,
+                    catalog=catalog,
+                    on_result=record,
+                    budget_n_results_max=budget_n_results_max,
+                    pool=pool,
+                    mode=mode,
+                    cassette=cassette,
+                    cache=cache,
+                    oracle_max_bytes=int(oracle_max_bytes) if oracle_max_bytes else None,
+                    oracles=OracleCache(),
+                    blobs=blobs,
+                    retry=retry,
+                )
+        finally:
+            writer.close()
+    finally:
+        await pool.drain()
+        if cache is not None:
+            cache.close()
+        if mode == "record":
+            cassette.tools = catalog.raw_tools.get(server_url) or (sharded or {}).get("tools")
+            cassette.save()
+            print(f"    Cassette recorded: {cassette.path}")
+
+    summary = acc.summary()
+    if resume:
+        summary["resumed"] = resumed
+    summary["connections"] = pool.connects
+    summary["reconnects"] = pool.reconnects
+    summary["concurrency"] = limiter.snapshot()
+    if cache is not None:
+        summary["cache"] = cache.stats()
+    if blobs is not None:
+        summary["blobs"] = blobs.stats()
+    if sharded is not None:
+        summary["workers"] = workers
+        summary["connections"] += sharded["connections"]
+        summary["reconnects"] += sharded["reconnects"]
+        summary["concurrency"] = sharded["concurrency"]
+        for key in ("cache", "blobs"):
+            if key in sharded:
+                summary[key] = sharded[key]
     report = {
         "version": "l1-mvp-1",
         "agent_name": agent_name,
         "server_url": server_url,
+        "mode": mode,
+        "run_id": run_id,
         "timestamp_ms": int(time.time() * 1000),
         "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
         "tools": tools,
-        "cases": [asdict(r) for r in results],
-        "summary": {
-            "total": len(results),
-            "passed": passed,
-            "avg_policy_score": avg_policy,
-            "avg_latency_ms": avg_latency,
-        },
+        "results_path": results_path,
     }
+    passed = summary["passed"]
+    total = summary["total"]
 
-    print(f"    Results: {passed}/{len(results)} passed.")
+    print(f"    [{label}] Results: {passed}/{total} passed.")
 
     if report_detail_path:
-        write_json(report_detail_path, report)
-        print(f"    Detailed report: {report_detail_path}")
+        head = {k: v for k, v in report.items() if k != "results_path"}
+        write_json_stream(report_detail_path, head, "cases", iter_jsonl(results_path), {"summary": summary})
+        print(f"    [{label}] Detailed report: {report_detail_path}")
+    report["summary"] = summary
     if report_md_path:
-        write_text(report_md_path, render_human_report_md(report))
-        print(f"    Markdown report: {report_md_path}")
+        write_text(report_md_path, render_human_report_md(report, acc))
+        print(f"    [{label}] Markdown report: {report_md_path}")
+    if history_path:
+        run = {
+            "run_id": run_id,
+            "suite": agent_name or label,
+            "server_url": server_url,
+            "mode": mode,
+            "git_commit": git_commit(),
+            "created_at": report["timestamp_ms"] / 1000,
+            "total": total,
+            "passed": passed,
+        }
+        try:
+            rows = await asyncio.to_thread(record_history, history_path, "mcp", run, iter_jsonl(results_path))
+            print(f"    [{label}] History: {rows} rows -> {history_path}")
+        except sqlite3.Error as e:
+            print(f"    Warning: Failed to record history: {e}")
 
     return report
 
 
+def load_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="mcp-evaluator load", description="Open-loop load generation against one suite's server")
+    parser.add_argument("--suite-dir", help="Directory containing config.json and cases.json")
+    parser.add_argument("--config-path", help="Path to config.json")
+    parser.add_argument("--cases-path", help="Path to cases.json")
+    parser.add_argument("--cases-root", help="Directory holding the global config.json (default: cases/mcp_cases, else cases)")
+    parser.add_argument("--server-url", help="MCP server SSE URL")
+    parser.add_argument("--rate", type=float, required=True, help="Target arrival rate in requests/sec")
+    parser.add_argument("--duration-s", type=float, default=60.0, help="How long to keep generating arrivals")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="poisson", help="Inter-arrival distribution")
+    parser.add_argument("--window-s", type=float, default=5.0, help="Width of the reporting time windows")
+    parser.add_argument("--max-in-flight", type=int, default=1024, help="Arrivals beyond this many outstanding calls are dropped")
+    parser.add_argument("--seed", type=int, help="Seed for Poisson arrivals")
+    parser.add_argument("--timeout-s", type=float, help="Timeout for each tool call")
+    parser.add_argument("--budget-n-results-max", type=int, help="Max n_results allowed by policy")
+    parser.add_argument("--report-path", help="Base directory for reports")
+    args = parser.parse_args(argv)
+
+    _, global_config = load_global_config(args.cases_root)
+    agent_name, config, cases_path, server_url = resolve_suite(
+        args.suite_dir, args.config_path, args.cases_path, args.server_url, global_config
+    )
+    if not cases_path or not os.path.exists(cases_path):
+        raise SystemExit(f"cases.json not found at {cases_path}")
+
+    timeout_s = float(resolve_setting("timeout_s", config, global_config, args.timeout_s, 20.0))
+    budget_n_results_max = int(
+        resolve_setting("budget_n_results_max", config, global_config, args.budget_n_results_max, 50)
+    )
+    pool_size = int(resolve_setting("pool_size", config, global_config, None, 1))
+    health_check_interval_s = float(resolve_setting("health_check_interval_s", config, global_config, None, 30.0))
+    # Arrivals cycle through the cases, so the load generator needs them all.
+    cases = list(iter_suite_cases(cases_path))
+
+    label = agent_name or cases_path
+    print(f">>> Load: {label} @ {args.rate} req/s ({args.arrival}) for {args.duration_s}s -> {server_url}")
+
+    async def generate() -> dict[str, Any]:
+        pool = SessionPool(size=pool_size, timeout_s=timeout_s, health_check_interval_s=health_check_interval_s)
+        catalog = ToolCatalog(timeout_s=timeout_s, pool=pool)
+        try:
+            # Connect and fetch schemas up front so they are not billed to the first arrivals.
+            try:
+                await catalog.load(server_url)
+            except Exception as e:
+                print(f"    Warning: Failed to list tools: {e}")
+            return await run_load(
+                server_url,
+                cases,
+                rate=args.rate,
+                duration_s=args.duration_s,
+                timeout_s=timeout_s,
+                budget_n_results_max=budget_n_results_max,
+                pool=pool,
+                catalog=catalog,
+                arrival=args.arrival,
+                window_s=args.window_s,
+                max_in_flight=args.max_in_flight,
+                seed=args.seed,
+            )
+        finally:
+            await pool.drain()
+
+    summary = asyncio.run(generate())
+    report = {
+        "version": "l1-load-1",
+        "agent_name": agent_name,
+        "server_url": server_url,
+        "timestamp_ms": int(time.time() * 1000),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": summary,
+    }
+
+    latency = summary["latency"]
+    print(
+        f"    Sent {summary['sent']}  completed {summary['completed']}  dropped {summary['dropped']}  "
+        f"throughput {summary['throughput_rps']} req/s  errors {summary['error_rate'] * 100:.1f}%"
+    )
+    print(f"    Latency p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms  max {latency['max']}ms")
+
+    out_dir = suite_output_dir(agent_name, args.suite_dir, cases_path, global_config, args.report_path)
+    write_json(os.path.join(out_dir, "load.json"), report)
+    write_text(os.path.join(out_dir, "load.md"), render_load_report_md(report))
+    print(f"    Load report: {os.path.join(out_dir, 'load.md')}")
+    return 0
+
+
+def sweep_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="mcp-evaluator sweep", description="Run suites at increasing fixed concurrency to find each server's throughput knee")
+    parser.add_argument("--suite-dir", help="Suite to sweep (default: every suite under --cases-root)")
+    parser.add_argument("--cases-root", help="Directory scanned for suites (default: cases/mcp_cases, else cases)")
+    parser.add_argument("--server-url", help="MCP server SSE URL")
+    parser.add_argument("--levels", help=f"Comma-separated concurrency levels (default: {','.join(map(str, DEFAULT_LEVELS))})")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="Throughput gain below which a level no longer pays off")
+    parser.add_argument("--latency-tolerance", type=float, default=2.0, help="p95 above this multiple of the lowest level's p95 marks saturation")
+    parser.add_argument("--timeout-s", type=float, help="Timeout for each tool call")
+    parser.add_argument("--report-path", help="Base directory for reports")
+    args = parser.parse_args(argv)
+
+    cases_root, global_config = load_global_config(args.cases_root)
+    levels = sorted({int(x) for x in args.levels.split(",") if x.strip()}) if args.levels else list(DEFAULT_LEVELS)
+    if not levels or levels[0] < 1:
+        raise SystemExit("--levels must be positive integers")
+    suite_dirs = [args.suite_dir] if args.suite_dir else discover_suites(cases_root)
+    if not suite_dirs:
+        print("No test suites found to sweep.")
+        return 1
+
+    sweep_id = time.strftime("%Y%m%d-%H%M%S")
+    recommendations: dict[str, int | None] = {}
+    for suite_dir in suite_dirs:
+        agent_name, _, cases_path, server_url = resolve_suite(suite_dir, None, None, args.server_url, global_config)
+        if not cases_path or not os.path.exists(cases_path):
+            print(f"Skipping {suite_dir}: cases.json not found at {cases_path}")
+            continue
+        out_dir = suite_output_dir(agent_name, suite_dir, cases_path, global_config, args.report_path)
+
+        points: list[dict[str, Any]] = []
+        for level in levels:
+            level_dir = os.path.join(out_dir, "sweep", f"c{level}")
+            started = time.perf_counter()
+            # A fresh scheduler per level keeps the limiter at exactly `level`;
+            # the result cache stays off so every case reaches the server. Levels
+            # are deliberate overloads, so they stay out of the history trends.
+            report = asyncio.run(
+                run_suite(
+                    suite_dir=suite_dir,
+                    config_path=None,
+                    cases_path=None,
+                    server_url_override=args.server_url,
+                    timeout_s_cli=args.timeout_s,
+                    budget_n_results_max_cli=None,
+                    print_tools_cli=None,
+                    threads_cli=level,
+                    report_path_cli=None,
+                    report_detail_path_cli=os.path.join(level_dir, "report_detail.json"),
+                    report_md_path_cli=os.path.join(level_dir, "report.md"),
+                    global_config=global_config,
+                    mode_cli="live",
+                    cache_cli=False,
+                    scheduler=Scheduler(),
+                    concurrency_mode_cli="fixed",
+                    run_id=f"{sweep_id}-c{level}",
+                    retry_cli=False,
+                    history_cli=False,
+                )
+            )
+            if not report:
+                break
+            points.append(sweep_point(level, report["summary"], time.perf_counter() - started))
+
+        knee = find_knee(points, min_gain=args.min_gain, latency_tolerance=args.latency_tolerance)
+        recommended = points[knee]["concurrency"] if knee is not None else None
+        recommendations[server_url] = recommended
+        sweep = {
+            "version": "l1-sweep-1",
+            "agent_name": agent_name,
+            "server_url": server_url,
+            "timestamp_ms": int(time.time() * 1000),
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "levels": levels,
+            "points": points,
+            "knee_index": knee,
+            "recommended_concurrency": recommended,
+        }
+        write_json(os.path.join(out_dir, "sweep.json"), sweep)
+        write_text(os.path.join(out_dir, "sweep.md"), render_sweep_report_md(sweep))
+
+        print(f"\n    [{agent_name or suite_dir}] concurrency  throughput    p50    p95  fail")
+        for i, p in enumerate(points):
+            marker = "  <- knee" if i == knee else ""
+            print(
+                f"    {p['concurrency']:>11}  {p['throughput_rps']:>8.2f}/s  {p['p50_ms']:>5}  {p['p95_ms']:>5}  "
+                f"{p['fail_rate'] * 100:.1f}%{marker}"
+            )
+        print(f"    Recommended threads: {recommended}  ({os.path.join(out_dir, 'sweep.md')})")
+
+    if len(recommendations) > 1:
+        print("\nRecommended per-server concurrency:")
+        for url, level in recommendations.items():
+            print(f"  {url}: {level}")
+    return 0
+
+
+def stub_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="mcp-evaluator stub", description="Serve stub versions of the suite tools over SSE on localhost")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=18080, help="Port to serve SSE on")
+    parser.add_argument("--config", help="JSON file with stub latency/error/payload settings (default: the \"stub\" block of the global config)")
+    parser.add_argument("--cases-root", help="Directory holding the global config.json (default: cases/mcp_cases, else cases)")
+    parser.add_argument("--seed", type=int, help="Seed for latency and error draws")
+    parser.add_argument("--latency", help="Override the latency distribution for every tool")
+    parser.add_argument("--latency-ms", type=float, help="Override the latency value/mean/median for every tool")
+    parser.add_argument("--error-rate", type=float, help="Override the error rate for every tool")
+    parser.add_argument("--payload-bytes", type=int, help="Override the response size for every tool")
+    args = parser.parse_args(argv)
+
+    # fastmcp is only needed to serve, so it is not imported by the runner.
+    from .stub import STUB_TOOLS, StubProfiles, build_stub_server
+
+    if args.config:
+        raw = load_json(args.config)
+    else:
+        _, global_config = load_global_config(args.cases_root)
+        raw = global_config.get("stub")
+    overrides = {
+        k: v
+        for k, v in (
+            ("latency", args.latency),
+            ("latency_ms", args.latency_ms),
+            ("error_rate", args.error_rate),
+            ("payload_bytes", args.payload_bytes),
+        )
+        if v is not None
+    }
+    raw = dict(raw) if isinstance(raw, dict) else {}
+    if overrides:
+        raw.update(overrides)
+        raw["tools"] = {name: {**cfg, **overrides} for name, cfg in (raw.get("tools") or {}).items()}
+    try:
+        profiles = StubProfiles.from_config(raw, seed=args.seed)
+    except (TypeError, ValueError) as e:
+        raise SystemExit(f"invalid stub config: {e}")
+
+    url = f"http://{args.host}:{args.port}/sse"
+    print(f">>> Stub MCP server: {url}")
+    for tool in STUB_TOOLS:
+        p = profiles.for_tool(tool)
+        print(
+            f"    {tool}: {p.describe_latency()}  error {p.error_rate * 100:.1f}%  "
+            f"hang {p.hang_rate * 100:.1f}%  payload {p.payload_bytes}B"
+        )
+    build_stub_server(profiles).run(transport="sse", host=args.host, port=args.port, show_banner=False)
+    return 0
+
+
+def bench_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="mcp-evaluator bench", description="Benchmark the evaluator's own overhead and compare against a stored baseline")
+    parser.add_argument("--only", choices=["micro", "macro"], help="Run only the micro- or only the end-to-end benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats per micro-benchmark; the fastest is reported and compared with the baseline")
+    parser.add_argument("--cases", type=int, default=500, help="Cases per end-to-end run")
+    parser.add_argument("--levels", help=f"Comma-separated end-to-end concurrency levels (default: {','.join(map(str, DEFAULT_BENCH_CONCURRENCY))})")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="Constant latency of the stub server used end-to-end")
+    parser.add_argument("--payload-bytes", type=int, default=2048, help="Response size of the stub server used end-to-end")
+    parser.add_argument("--output-dir", default=os.path.join("reports", "bench"), help="Where bench.json and bench.md are written")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against (default: <output-dir>/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD, help="Relative drop that counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    levels = tuple(sorted({int(x) for x in args.levels.split(",") if x.strip()})) if args.levels else DEFAULT_BENCH_CONCURRENCY
+    if not levels or levels[0] < 1:
+        raise SystemExit("--levels must be positive integers")
+
+    results: list[dict[str, Any]] = []
+    if args.only != "macro":
+        print(">>> Micro-benchmarks")
+        results += run_micro(repeat=max(1, args.repeat))
+    if args.only != "micro":
+        print(f">>> End-to-end: {args.cases} cases against a local stub at concurrency {', '.join(map(str, levels))}")
+        results += run_macro(
+            cases=args.cases, levels=levels, stub_latency_ms=args.stub_latency_ms, payload_bytes=args.payload_bytes
+        )
+
+    baseline_path = args.baseline or os.path.join(args.output_dir, "baseline.json")
+    baseline = load_json(baseline_path) if os.path.exists(baseline_path) else None
+    comparison = compare_bench(results, baseline, args.threshold)
+    report = {
+        "version": "l1-bench-1",
+        "timestamp_ms": int(time.time() * 1000),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "threshold": args.threshold,
+        "baseline_path": baseline_path if baseline is not None else None,
+        "results": results,
+        "comparison": comparison,
+    }
+
+    print(f"\n    {'benchmark':<22} {'value':>14} {'baseline':>14} {'change':>8}")
+    for r in comparison:
+        baseline_value = r["baseline"] if r["baseline"] is not None else "-"
+        change = f"{r['change'] * 100:+.1f}%" if r["change"] is not None else "-"
+        marker = "  <- regression" if r["regressed"] else ""
+        print(f"    {r['name']:<22} {r['value']:>14} {baseline_value:>14} {change:>8}{marker}")
+
+    write_json(os.path.join(args.output_dir, "bench.json"), report)
+    write_text(os.path.join(args.output_dir, "bench.md"), render_bench_report_md(report))
+    print(f"    Bench report: {os.path.join(args.output_dir, 'bench.md')}")
+    if args.update_baseline:
+        write_json(baseline_path, {k: v for k, v in report.items() if k not in ("comparison", "baseline_path")})
+        print(f"    Baseline updated: {baseline_path}")
+        return 0
+    regressions = [r["name"] for r in comparison if r["regressed"]]
+    if regressions:
+        print(f"    Regressions beyond {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def history_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="mcp-evaluator history", description="Print pass-rate and latency trends from the results history")
+    parser.add_argument("--history-path", help=f"History database (default: the global config's history.path, else {DEFAULT_HISTORY_PATH})")
+    parser.add_argument("--cases-root", help="Directory holding the global config.json (default: cases/mcp_cases, else cases)")
+    parser.add_argument("--agent", action="store_true", help="Show agent conversation runs instead of MCP tool calls")
+    parser.add_argument("--tool", help="Only calls to this tool")
+    parser.add_argument("--server-url", help="Only runs against this server")
+    parser.add_argument("--suite", help="Only this suite (MCP agent name, or the agent eval_type with --agent)")
+    parser.add_argument("--runs", type=int, default=30, help="Number of most recent runs to show")
+    parser.add_argument("--days", type=float, help="Only runs from the last N days")
+    parser.add_argument("--json", action="store_true", help="Print the trend points as JSON")
+    args = parser.parse_args(argv)
+
+    if args.agent and args.tool:
+        raise SystemExit("--tool only applies to MCP runs")
+    history_path = args.history_path
+    if not history_path:
+        _, global_config = load_global_config(args.cases_root)
+        history_config = global_config.get("history")
+        history_path = (history_config.get("path") if isinstance(history_config, dict) else None) or DEFAULT_HISTORY_PATH
+    if not os.path.exists(history_path):
+        raise SystemExit(f"history not found at {history_path}")
+
+    store = HistoryStore(history_path)
+    try:
+        points = store.trends(
+            "agent" if args.agent else "mcp",
+            tool_name=args.tool,
+            server_url=args.server_url,
+            suite=args.suite,
+            last_runs=args.runs,
+            since=time.time() - args.days * 86400 if args.days is not None else None,
+        )
+    finally:
+        store.close()
+
+    if args.json:
+        print(json.dumps(points, ensure_ascii=False, indent=2))
+        return 0
+    scope = ", ".join(x for x in (args.suite, args.tool, args.server_url) if x) or "all"
+    unit = "duration" if args.agent else "latency"
+    print(f">>> History ({'agent' if args.agent else 'mcp'}: {scope}), last {len(points)} runs: {history_path}")
+    if not points:
+        print("    No matching runs.")
+        return 0
+    print(f"    {'run_id':<16} {'created_at':<19} {'commit':<8} {'total':>6} {'pass%':>6}   {unit} p50/p95/p99 ms")
+    for p in points:
+        lat = p["latency_ms"]
+        created_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(p["created_at"]))
+        print(
+            f"    {p['run_id']:<16} {created_at:<19} {(p['git_commit'] or '-')[:8]:<8} {p['total']:>6} "
+            f"{p['pass_rate'] * 100:>5.1f}%   {lat['p50']}/{lat['p95']}/{lat['p99']}"
+        )
+    return 0
+
+
+def diff_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="mcp-evaluator diff", description="Compare two runs case by case and test per-tool latency shifts")
+    parser.add_argument("old", help="Baseline report_detail.json or runs/<run_id>/<suite>.jsonl")
+    parser.add_argument("new", help="Report or results JSONL to compare against the baseline")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_DIFF_ALPHA, help="Significance level of the Mann-Whitney U test")
+    parser.add_argument("--min-shift", type=float, default=DEFAULT_DIFF_MIN_SHIFT, help="Relative median latency change a significant shift must also exceed")
+    parser.add_argument("--limit", type=int, default=20, help="Case ids listed per section")
+    parser.add_argument("--report-detail-path", help="Path to save the full diff as JSON")
+    parser.add_argument("--report-md-path", help="Path to save the diff as Markdown")
+    args = parser.parse_args(argv)
+
+    for path in (args.old, args.new):
+        if not os.path.exists(path):
+            raise SystemExit(f"report not found: {path}")
+    started = time.perf_counter()
+    try:
+        diff = diff_reports(args.old, args.new, alpha=args.alpha, min_shift=args.min_shift)
+    except ValueError as e:
+        raise SystemExit(f"cannot read report: {e}")
+    old, new = diff["old"], diff["new"]
+
+    print(f">>> Diff: {args.old} -> {args.new} ({time.perf_counter() - started:.1f}s)")
+    print(
+        f"    Pass rate: {old['pass_rate'] * 100:.1f}% ({old['passed']}/{old['total']}) -> "
+        f"{new['pass_rate'] * 100:.1f}% ({new['passed']}/{new['total']})"
+    )
+    print(f"    Policy score mean: {old['policy_score_mean']} -> {new['policy_score_mean']}")
+    for label, key in (("pass -> fail", "broke"), ("fail -> pass", "fixed"), ("added", "added"), ("removed", "removed")):
+        ids = diff[key]
+        if ids:
+            more = f" (+{len(ids) - args.limit} more)" if len(ids) > args.limit else ""
+            print(f"    {label}: {len(ids)}: {', '.join(ids[: args.limit])}{more}")
+    changes = diff["policy_score_changes"]
+    if changes:
+        print(f"    Policy score changes: {len(changes)}")
+        for c in changes[: args.limit]:
+            print(f"      {c['case_id']}: {c['old']} -> {c['new']} ({c['delta']:+})")
+
+    print(f"\n    {'tool':<32} {'old p50':>8} {'new p50':>8} {'shift':>8} {'p':>9}  verdict")
+    for t in diff["tools"]:
+        shift = f"{t['shift'] * 100:+.1f}%" if t["shift"] is not None else "-"
+        p = f"{t['p_value']:.2g}" if t["p_value"] is not None else "-"
+        old_p50 = (t["old"] or {}).get("p50", "-")
+        new_p50 = (t["new"] or {}).get("p50", "-")
+        print(f"    {t['tool_name']:<32} {old_p50:>8} {new_p50:>8} {shift:>8} {p:>9}  {t['verdict']}")
+
+    if args.report_detail_path:
+        write_json(args.report_detail_path, diff)
+        print(f"    Diff report: {args.report_detail_path}")
+    if args.report_md_path:
+        write_text(args.report_md_path, render_diff_report_md(diff, limit=args.limit))
+        print(f"    Markdown diff: {args.report_md_path}")
+    if diff["broke"] or diff["regressed_tools"]:
+        return 1
+    return 0
+
+
 def main() -> int:
+    argv = sys.argv[1:]
+    if argv[:1] == ["load"]:
+        return load_main(argv[1:])
+    if argv[:1] == ["sweep"]:
+        return sweep_main(argv[1:])
+    if argv[:1] == ["stub"]:
+        return stub_main(argv[1:])
+    if argv[:1] == ["bench"]:
+        return bench_main(argv[1:])
+    if argv[:1] == ["history"]:
+        return history_main(argv[1:])
+    if argv[:1] == ["diff"]:
+        return diff_main(argv[1:])
+
     parser = argparse.ArgumentParser(prog="mcp-evaluator")
-    parser.add_argument("--render-report", help="Path to report.json to render as human-readable text")
+    parser.add_argument("--render-report", help="Path to report.json (or a results .jsonl) to render as human-readable text")
+    parser.add_argument("--render-format", choices=["text", "md"], default="text", help="Output format of --render-report")
     parser.add_argument("--report-detail-path", help="Path to save detailed JSON report")
     parser.add_argument("--report-md-path", help="Path to save Markdown report")
     parser.add_argument("--suite-dir", help="Directory containing config.json and cases.json")
@@ -187,23 +916,31 @@ def main() -> int:
     parser.add_argument("--print-tools", action="store_true", help="List available tools before running")
     parser.add_argument("--threads", type=int, help="Number of concurrent tool calls")
     parser.add_argument("--report-path", help="Base path for reports")
+    parser.add_argument("--cases-root", help="Directory scanned for suites (default: cases/mcp_cases, else cases)")
+    parser.add_argument("--concurrency-mode", choices=["adaptive", "fixed"], help="adaptive: AIMD per-server limit starting at --threads; fixed: exactly --threads")
+    parser.add_argument("--max-concurrency", type=int, help="Global cap on in-flight tool calls across all suites")
+    parser.add_argument("--mode", choices=MODES, help="live: call servers; record: call and save a cassette; replay: serve from cassette")
+    parser.add_argument("--cassette-dir", help="Directory holding per-suite cassettes")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=None, help="Serve repeated tool calls from the local result cache")
+    parser.add_argument("--cache-path", help="Path to the result cache database")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Continue an interrupted run, skipping cases already recorded under RUN_ID")
+    parser.add_argument("--rerun-failed", action="store_true", help="With --resume, also re-run cases that failed")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, help="When to fsync the streamed results JSONL (default: batch)")
+    parser.add_argument("--workers", type=int, help="Shard each suite's cases across this many worker processes")
+    parser.add_argument("--history", action=argparse.BooleanOptionalAction, default=None, help="Record every result in the history database (default: on)")
+    parser.add_argument("--history-path", help="Path to the history database")
     args = parser.parse_args()
 
     if args.render_report:
-        raw = load_json(args.render_report)
-        if not isinstance(raw, dict):
-            raise SystemExit("report.json must be an object")
-        print(render_human_report(raw))
+        try:
+            report, acc = fold_report(args.render_report)
+        except ValueError as e:
+            raise SystemExit(f"cannot read report: {e}")
+        render = render_human_report_md if args.render_format == "md" else render_human_report
+        print(render(report, acc))
         return 0
 
-    # Load global config from cases/config.json
-    global_config: dict[str, Any] = {}
-    global_config_path = os.path.join("cases", "config.json")
-    if os.path.exists(global_config_path):
-        try:
-            global_config = load_json(global_config_path)
-        except Exception as e:
-            print(f"Warning: Failed to load global config from {global_config_path}: {e}")
+    cases_root, global_config = load_global_config(args.cases_root)
 
     async def run_all():
         suites_to_run = []
@@ -216,25 +953,29 @@ def main() -> int:
                 "cases_path": args.cases_path
             })
         else:
-            # Auto-discover all suites in cases/ folder
-            cases_root = "cases"
-            if os.path.exists(cases_root) and os.path.isdir(cases_root):
-                for item in sorted(os.listdir(cases_root)):
-                    item_path = os.path.join(cases_root, item)
-                    if os.path.isdir(item_path) and os.path.exists(os.path.join(item_path, "cases.json")):
-                        suites_to_run.append({
-                            "suite_dir": item_path,
-                            "config_path": None,
-                            "cases_path": None
-                        })
+            # Auto-discover all suites under the cases root
+            for item_path in discover_suites(cases_root):
+                suites_to_run.append({
+                    "suite_dir": item_path,
+                    "config_path": None,
+                    "cases_path": None
+                })
 
         if not suites_to_run:
             print("No test suites found to run.")
             return
 
-        all_reports = []
-        for s in suites_to_run:
-            report = await run_suite(
+        run_id = args.resume or time.strftime("%Y%m%d-%H%M%S")
+        print(f"Run ID: {run_id}")
+
+        max_concurrency = args.max_concurrency or global_config.get("max_concurrency")
+        scheduler = Scheduler(int(max_concurrency) if max_concurrency else None)
+        started = time.perf_counter()
+
+        # Suites target independent servers, so they run concurrently; the
+        # scheduler enforces each server's `threads` and the global cap.
+        jobs = [
+            run_suite(
                 suite_dir=s["suite_dir"],
                 config_path=s["config_path"],
                 cases_path=s["cases_path"],
@@ -247,21 +988,66 @@ def main() -> int:
                 report_detail_path_cli=args.report_detail_path,
                 report_md_path_cli=args.report_md_path,
                 global_config=global_config,
+                mode_cli=args.mode,
+                cassette_dir_cli=args.cassette_dir,
+                cache_cli=args.cache,
+                cache_path_cli=args.cache_path,
+                scheduler=scheduler,
+                concurrency_mode_cli=args.concurrency_mode,
+                fsync_cli=args.fsync,
+                run_id=run_id,
+                resume=bool(args.resume),
+                rerun_failed=args.rerun_failed,
+                workers_cli=args.workers,
+                history_cli=args.history,
+                history_path_cli=args.history_path,
             )
+            for s in suites_to_run
+        ]
+        aggregate = SuiteAggregator()
+
+        async def run_and_fold(s: dict[str, Any], job: Any) -> None:
+            # Each suite is folded in as it finishes, from its summary alone.
+            name = s["suite_dir"] or s["cases_path"]
+            try:
+                report = await job
+            except (Exception, SystemExit) as e:
+                print(f"Suite {name} failed: {type(e).__name__}: {e}")
+                aggregate.fail(name, f"{type(e).__name__}: {e}")
+                return
             if report:
-                all_reports.append(report)
+                aggregate.add(report)
+
+        await asyncio.gather(*(run_and_fold(s, job) for s, job in zip(suites_to_run, jobs)))
 
         # Print summary of all suites
-        if len(all_reports) > 1:
+        if len(aggregate.suites) > 1:
+            aggregated = aggregate.report(
+                run_id=run_id,
+                timestamp_ms=int(time.time() * 1000),
+                created_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+                wall_s=round(time.perf_counter() - started, 1),
+            )
+            summary = aggregated["summary"]
+            latency = summary["latency"]
             print("\n" + "="*50)
             print("OVERALL SUMMARY")
             print("="*50)
-            total_cases = sum(r["summary"]["total"] for r in all_reports)
-            total_passed = sum(r["summary"]["passed"] for r in all_reports)
-            print(f"Total Suites: {len(all_reports)}")
-            print(f"Total Cases:  {total_passed}/{total_cases} passed ({(total_passed/total_cases*100):.1f}%)")
+            print(f"Total Suites: {summary['suites']}")
+            print(f"Total Cases:  {summary['passed']}/{summary['total']} passed ({summary['pass_rate']*100:.1f}%)")
+            print(f"Latency:      p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms")
+            for url, server in aggregated["servers"].items():
+                print(f"  {url}: {server['passed']}/{server['total']} passed, p95 {server['latency']['p95']}ms")
+            print(f"Wall Clock:   {aggregated['wall_s']:.1f}s")
             print("="*50)
 
+            report_root = global_config.get("report_path") or "reports"
+            if args.report_path and not args.report_path.endswith(".json"):
+                report_root = args.report_path
+            write_json(os.path.join(report_root, "report.json"), aggregated)
+            write_text(os.path.join(report_root, "report.md"), render_human_report_md(aggregated))
+            print(f"Aggregated report: {os.path.join(report_root, 'report.md')}")
+
     asyncio.run(run_all())
     return 0
 
@@ -1,12 +1,57 @@
-from .mcp import get_tool_schema, list_tools, run_one_case
-from .oracle import check_oracle, extract_text
-from .policy import repair_and_score_args
+from .blobs import BlobStore
+from .cache import ResultCache
+from .cassette import MODES, Cassette, CassetteMiss, call_key, canonical_json
+from .catalog import ToolCatalog
+from .limiter import AdaptiveLimiter
+from .loadgen import ARRIVALS, run_load
+from .mcp import ChainSession, call_tool, get_tool_schema, list_tools, open_session, run_one_case
+from .oracle import Oracle, OracleCache, check_oracle, compile_oracle, extract_text, iter_text
+from .policy import ArgPolicy, repair_and_score_args
+from .pool import SessionPool
+from .retry import RetryPolicies, RetryPolicy
+from .runner import ShardConfig, run_case, run_cases, run_sharded, shard_cases
+from .scheduler import Scheduler
+from .steps import run_steps_case, sequence_issues
+from .sweep import DEFAULT_LEVELS, find_knee, sweep_point
 
 __all__ = [
     "list_tools",
     "get_tool_schema",
     "run_one_case",
+    "run_steps_case",
+    "run_case",
+    "run_cases",
+    "run_sharded",
+    "shard_cases",
+    "ShardConfig",
+    "sequence_issues",
+    "call_tool",
+    "open_session",
+    "ChainSession",
+    "SessionPool",
+    "ToolCatalog",
+    "Scheduler",
+    "DEFAULT_LEVELS",
+    "find_knee",
+    "sweep_point",
+    "AdaptiveLimiter",
+    "ARRIVALS",
+    "run_load",
+    "ResultCache",
+    "RetryPolicy",
+    "RetryPolicies",
+    "BlobStore",
+    "MODES",
+    "Cassette",
+    "CassetteMiss",
+    "call_key",
+    "canonical_json",
     "extract_text",
+    "iter_text",
     "check_oracle",
+    "compile_oracle",
+    "Oracle",
+    "OracleCache",
+    "ArgPolicy",
     "repair_and_score_args",
 ]
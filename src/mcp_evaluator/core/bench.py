@@ -0,0 +1,332 @@
+import asyncio
+import gc
+import json
+import multiprocessing
+import random
+import socket
+import statistics
+import time
+from typing import Any, Callable
+
+from ..models import SuiteCase
+from ..utils.report import ReportAccumulator, render_human_report, render_human_report_md
+from ..utils.suite import parse_suite_cases
+from .catalog import ToolCatalog
+from .mcp import parse_tool_schema
+from .oracle import OracleCache, compile_oracle
+from .policy import ArgPolicy
+from .pool import SessionPool
+from .runner import run_cases
+from .scheduler import Scheduler
+
+DEFAULT_BENCH_CONCURRENCY = (1, 4, 16)
+DEFAULT_REGRESSION_THRESHOLD = 0.1
+
+_TOOLS = ("fetch_bohrium_crystals", "fetch_mofs_sql", "fetch_openlam_structures", "fetch_structures_with_filter")
+_ORACLE = {
+    "kind": "json",
+    "must_have": ["name"],
+    "checks": [
+        {"path": "$.results", "type": "array", "min_len": 1},
+        {"path": "$.results[0].name", "equals": "tobmof-27"},
+        {"path": "$.error", "exists": False},
+    ],
+}
+
+
+def measure(name: str, run: Callable[[], None], *, ops: int, repeat: int, unit: str = "ops/s") -> dict[str, Any]:
+    # As timeit does: GC paused and the fastest repeat taken as the figure of
+    # record, since slower repeats measure interference rather than the code.
+    run()
+    seconds: list[float] = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            seconds.append(time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    best_s = min(seconds)
+    return {
+        "name": name,
+        "unit": unit,
+        "value": round(ops / best_s, 2) if best_s > 0 else 0.0,
+        "median": round(ops / statistics.median(seconds), 2),
+        "per_op_us": round(best_s / ops * 1e6, 3),
+        "ops": ops,
+        "repeat": repeat,
+    }
+
+
+def _sample_value(prop: dict[str, Any], rng: random.Random) -> Any:
+    # A mix of valid values and the kinds of mistakes the policy repairs.
+    t = prop.get("type")
+    if "enum" in prop:
+        return rng.choice([*prop["enum"], "bogus"])
+    if t == "integer":
+        return rng.choice([3, 10, "7", 500, -1])
+    if t == "number":
+        return rng.choice([1.5, "2.5", -3])
+    if t == "array":
+        items = prop.get("items") or {}
+        return rng.choice([[_sample_value(items, rng)], _sample_value(items, rng), []])
+    if "anyOf" in prop:
+        return _sample_value(rng.choice(prop["anyOf"]), rng)
+    if t == "null":
+        return None
+    return rng.choice(["Fe2O3", "SiO2", 42])
+
+
+def bench_policy(tools: list[dict[str, Any]], *, n: int, repeat: int, rng: random.Random) -> dict[str, Any]:
+    policies = {
+        t["name"]: ArgPolicy(parse_tool_schema(t["inputSchema"]), budget_n_results_max=50) for t in tools
+    }
+    calls: list[tuple[ArgPolicy, dict[str, Any]]] = []
+    for i in range(n):
+        tool = tools[i % len(tools)]
+        props = tool["inputSchema"].get("properties") or {}
+        args = {k: _sample_value(v, rng) for k, v in props.items() if rng.random() < 0.6}
+        if rng.random() < 0.2:
+            args["unexpected"] = True
+        calls.append((policies[tool["name"]], args))
+
+    def run() -> None:
+        for policy, args in calls:
+            policy(args)
+
+    return measure("policy_repair", run, ops=n, repeat=repeat, unit="calls/s")
+
+
+def bench_oracle(name: str, text: str, *, n: int, repeat: int, chunk_bytes: int = 64 * 1024) -> dict[str, Any]:
+    oracle = compile_oracle(_ORACLE)
+    parts = [text[i : i + chunk_bytes] for i in range(0, len(text), chunk_bytes)]
+    ok, err = oracle(error=None, chunks=parts, max_bytes=None)
+    if not ok:
+        raise RuntimeError(f"{name}: benchmark payload fails its oracle: {err}")
+
+    def run() -> None:
+        for _ in range(n):
+            oracle(error=None, chunks=parts, max_bytes=None)
+
+    result = measure(name, run, ops=n, repeat=repeat, unit="checks/s")
+    result["payload_bytes"] = len(text.encode("utf-8"))
+    return result
+
+
+def synthetic_records(n: int, rng: random.Random) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    for i in range(n):
+        tool = _TOOLS[i % len(_TOOLS)]
+        ok = rng.random() > 0.05
+        latency = int(rng.lognormvariate(4, 0.6))
+        records.append(
+            {
+                "case_id": f"bench-{i:05d}",
+                "server_url": "http://127.0.0.1/sse",
+                "tool_name": tool,
+                "args": {"n_results": 10},
+                "args_used": {"n_results": 10},
+                "policy_score": rng.choice([100, 100, 95, 90]),
+                "policy_repairs": [{"type": "clip_max_budget", "field": "n_results"}] if i % 7 == 0 else [],
+                "policy_violations": [],
+                "ok": ok,
+                "latency_ms": latency,
+                "error": None if ok else "TimeoutError: ",
+                "output_text": "{}",
+                "oracle_ok": ok,
+                "oracle_error": None if ok else "TimeoutError: ",
+                "cached": False,
+                "phases_ms": {"policy": 0.02, "call": float(latency), "oracle": 0.05},
+                "attempts": 1,
+            }
+        )
+    return records
+
+
+def bench_report(n: int, *, repeat: int, rng: random.Random) -> dict[str, Any]:
+    records = synthetic_records(n, rng)
+    report = {"agent_name": "bench", "server_url": "http://127.0.0.1/sse"}
+
+    def run() -> None:
+        acc = ReportAccumulator()
+        for r in records:
+            acc.add(r)
+        summary = acc.summary()
+        render_human_report_md({**report, "summary": summary}, acc)
+        render_human_report({**report, "summary": summary}, acc)
+
+    return measure(f"report_render_{n}", run, ops=n, repeat=repeat, unit="cases/s")
+
+
+def bench_parse(n: int, *, repeat: int) -> dict[str, Any]:
+    items: list[dict[str, Any]] = []
+    for i in range(n):
+        if i % 10 == 9:
+            items.append(
+                {
+                    "case_id": f"chain-{i:05d}",
+                    "steps": [
+                        {"id": "a", "tool_name": "fetch_mofs_sql", "args": {"sql": f"SELECT {i}"}, "expect": _ORACLE},
+                        {"id": "b", "tool_name": "fetch_bohrium_crystals", "args": {"formula": "${a.$.name}"}},
+                    ],
+                }
+            )
+        else:
+            items.append(
+                {
+                    "case_id": f"case-{i:05d}",
+                    "tool_name": _TOOLS[i % len(_TOOLS)],
+                    "args": {"sql": f"SELECT {i}", "n_results": 10},
+                    "expect": _ORACLE,
+                }
+            )
+    text = json.dumps({"cases": items})
+
+    def run() -> None:
+        parse_suite_cases(json.loads(text))
+
+    return measure(f"case_parse_{n}", run, ops=n, repeat=repeat, unit="cases/s")
+
+
+def run_micro(*, repeat: int = 5, seed: int = 0) -> list[dict[str, Any]]:
+    from ..stub import StubProfiles, build_stub_server
+    from ..stub.server import render
+
+    rng = random.Random(seed)
+    server = build_stub_server(StubProfiles())
+    tools = [{"name": name, "inputSchema": t.parameters} for name, t in asyncio.run(server.get_tools()).items()]
+
+    def payload(n_bytes: int) -> str:
+        records = [{"name": f"tobmof-{27 + i}", "database": "Tobacco", "lcd": 10.0 + i} for i in range(10)]
+        return render({"name": "mofdb", "sql": "SELECT 1"}, records, n_bytes)
+
+    return [
+        bench_policy(tools, n=5000, repeat=repeat, rng=rng),
+        bench_oracle("oracle_small", payload(2 * 1024), n=2000, repeat=repeat),
+        bench_oracle("oracle_large", payload(4 * 1024 * 1024), n=3, repeat=repeat),
+        bench_report(10_000, repeat=repeat, rng=rng),
+        bench_parse(10_000, repeat=repeat),
+    ]
+
+
+def _serve_stub(port: int, latency_ms: float, payload_bytes: int) -> None:
+    from ..stub import StubProfiles, ToolProfile, build_stub_server
+
+    profile = ToolProfile(latency="constant", latency_ms=latency_ms, payload_bytes=payload_bytes)
+    server = build_stub_server(StubProfiles(profile, seed=0))
+    server.run(transport="sse", host="127.0.0.1", port=port, show_banner=False, log_level="error")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout_s: float) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"stub server did not start on port {port}")
+
+
+def macro_cases(n: int) -> list[SuiteCase]:
+    args = {
+        "fetch_bohrium_crystals": {"formula": "SrTiO3", "n_results": 5},
+        "fetch_mofs_sql": {"sql": "SELECT name FROM mofs", "n_results": 5},
+        "fetch_openlam_structures": {"formula": "Fe2O3", "n_results": 5},
+        "fetch_structures_with_filter": {"filter": 'elements HAS "O"', "n_results": 1},
+    }
+    expect = {"kind": "json", "checks": [{"path": "$.results", "type": "array", "min_len": 1}]}
+    return [
+        SuiteCase(case_id=f"macro-{i:05d}", tool_name=tool, args=args[tool], expect=expect)
+        for i, tool in ((i, _TOOLS[i % len(_TOOLS)]) for i in range(n))
+    ]
+
+
+async def _macro_point(server_url: str, cases: list[SuiteCase], concurrency: int, pool_size: int) -> dict[str, Any]:
+    pool = SessionPool(size=pool_size, timeout_s=30.0)
+    catalog = ToolCatalog(timeout_s=30.0, pool=pool)
+    scheduler = Scheduler()
+    scheduler.register(server_url, concurrency, adaptive=False)
+    acc = ReportAccumulator()
+    try:
+        # Connect and fetch schemas first so setup is not billed to throughput.
+        await catalog.load(server_url)
+        start = time.perf_counter()
+        await run_cases(
+            server_url,
+            cases,
+            30.0,
+            scheduler=scheduler,
+            catalog=catalog,
+            on_result=acc.add,
+            budget_n_results_max=50,
+            pool=pool,
+            oracles=OracleCache(),
+        )
+        wall_s = time.perf_counter() - start
+    finally:
+        await pool.drain()
+    latency = acc.suite.hist.summary()
+    return {
+        "name": f"e2e_c{concurrency}",
+        "unit": "cases/s",
+        "value": round(len(cases) / wall_s, 2) if wall_s > 0 else 0.0,
+        "concurrency": concurrency,
+        "cases": len(cases),
+        "passed": acc.suite.passed,
+        "wall_s": round(wall_s, 3),
+        "p50_ms": latency["p50"],
+        "p95_ms": latency["p95"],
+    }
+
+
+def run_macro(
+    *,
+    cases: int = 500,
+    levels: tuple[int, ...] = DEFAULT_BENCH_CONCURRENCY,
+    stub_latency_ms: float = 0.0,
+    payload_bytes: int = 2048,
+    pool_size: int = 1,
+) -> list[dict[str, Any]]:
+    port = _free_port()
+    ctx = multiprocessing.get_context("spawn")
+    stub = ctx.Process(target=_serve_stub, args=(port, stub_latency_ms, payload_bytes), daemon=True)
+    stub.start()
+    try:
+        _wait_for_port(port, 30.0)
+        server_url = f"http://127.0.0.1:{port}/sse"
+        suite = macro_cases(cases)
+        points = [asyncio.run(_macro_point(server_url, suite, c, pool_size)) for c in levels]
+    finally:
+        # A throwaway server: killing it skips uvicorn's graceful-shutdown noise.
+        stub.kill()
+        stub.join(5)
+    for p in points:
+        if p["passed"] != p["cases"]:
+            raise RuntimeError(f"{p['name']}: {p['cases'] - p['passed']} cases failed against the stub")
+    return points
+
+
+def compare_bench(
+    results: list[dict[str, Any]], baseline: dict[str, Any] | None, threshold: float
+) -> list[dict[str, Any]]:
+    # Every figure is a rate, so a drop of more than `threshold` is a regression.
+    before = {r["name"]: r for r in (baseline or {}).get("results") or [] if isinstance(r, dict)}
+    rows: list[dict[str, Any]] = []
+    for r in results:
+        base = before.get(r["name"])
+        row = {"name": r["name"], "unit": r["unit"], "value": r["value"], "baseline": None, "change": None, "regressed": False}
+        if base and base.get("value"):
+            change = r["value"] / base["value"] - 1
+            row.update(baseline=base["value"], change=round(change, 4), regressed=change < -threshold)
+        rows.append(row)
+    return rows
@@ -0,0 +1,80 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from typing import Any
+
+DEFAULT_BLOB_THRESHOLD_BYTES = 64 * 1024
+
+
+class BlobStore:
+    # Content-addressed, gzip-compressed store for large tool outputs. Blobs are
+    # keyed by the sha256 of the UTF-8 text, so identical outputs from other
+    # cases or earlier runs sharing the directory are written only once.
+    def __init__(
+        self,
+        root: str,
+        *,
+        threshold_bytes: int = DEFAULT_BLOB_THRESHOLD_BYTES,
+        preview_chars: int = 200,
+    ) -> None:
+        self.root = root
+        self.threshold_bytes = threshold_bytes
+        self.preview_chars = preview_chars
+        self.written = 0
+        self.deduplicated = 0
+        self.bytes_in = 0
+        self.bytes_stored = 0
+
+    def path_of(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest[2:]}.gz")
+
+    def preview(self, parts: list[str]) -> str:
+        text = ""
+        for part in parts:
+            text += part[: self.preview_chars + 1 - len(text)]
+            if len(text) > self.preview_chars:
+                return text[: self.preview_chars] + "…"
+        return text
+
+    def put(self, parts: list[str]) -> tuple[str, int]:
+        h = hashlib.sha256()
+        size = 0
+        for part in parts:
+            data = part.encode("utf-8")
+            h.update(data)
+            size += len(data)
+        digest = h.hexdigest()
+        self.bytes_in += size
+        path = self.path_of(digest)
+        if os.path.exists(path):
+            self.deduplicated += 1
+            return digest, size
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as gz:
+                    for part in parts:
+                        gz.write(part.encode("utf-8"))
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.written += 1
+        self.bytes_stored += os.path.getsize(path)
+        return digest, size
+
+    def get(self, digest: str) -> str:
+        with gzip.open(self.path_of(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "written": self.written,
+            "deduplicated": self.deduplicated,
+            "bytes_in": self.bytes_in,
+            "bytes_stored": self.bytes_stored,
+        }
@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from mcp.types import CallToolResult
+
+from .cassette import call_key
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "mcp_results.sqlite")
+
+# Worker processes share one database, so the byte total is kept next to the
+# entries by triggers rather than counted by each process.
+_USAGE = (
+    "CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO usage (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries",
+    "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries "
+    "BEGIN UPDATE usage SET bytes = bytes + NEW.size WHERE id = 0; END",
+    "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries "
+    "BEGIN UPDATE usage SET bytes = bytes - OLD.size WHERE id = 0; END",
+    "CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries "
+    "BEGIN UPDATE usage SET bytes = bytes + NEW.size - OLD.size WHERE id = 0; END",
+)
+
+
+class ResultCache:
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        *,
+        ttl_s: float = 3600.0,
+        tool_ttl_s: dict[str, float] | None = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.ttl_s = ttl_s
+        self.tool_ttl_s = dict(tool_ttl_s or {})
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Lookups and writes run in worker threads, one at a time.
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, tool_name TEXT NOT NULL, created_at REAL NOT NULL, "
+            "last_access REAL NOT NULL, size INTEGER NOT NULL, payload TEXT NOT NULL, latency_ms INTEGER)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(entries)")}
+        if "latency_ms" not in columns:
+            self._db.execute("ALTER TABLE entries ADD COLUMN latency_ms INTEGER")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        for statement in _USAGE:
+            self._db.execute(statement)
+        self.bytes = self._total_bytes()
+
+    def ttl_for(self, tool_name: str) -> float:
+        return float(self.tool_ttl_s.get(tool_name, self.ttl_s))
+
+    def get(self, server_url: str, tool_name: str, args_used: dict[str, Any]) -> CallToolResult | None:
+        entry = self.lookup(server_url, tool_name, args_used)
+        return entry[0] if entry is not None else None
+
+    def lookup(
+        self, server_url: str, tool_name: str, args_used: dict[str, Any]
+    ) -> tuple[CallToolResult, int | None] | None:
+        # Also returns the latency of the live call that filled the entry
+        # (None for entries written before it was stored).
+        ttl = self.ttl_for(tool_name)
+        if ttl <= 0:
+            return None
+        key = call_key(tool_name, args_used, server_url=server_url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at, payload, latency_ms FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is not None and now - row[0] > ttl:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return CallToolResult.model_validate(json.loads(row[1])), row[2]
+
+    def put(
+        self,
+        server_url: str,
+        tool_name: str,
+        args_used: dict[str, Any],
+        result: CallToolResult,
+        latency_ms: int | None = None,
+    ) -> None:
+        if self.ttl_for(tool_name) <= 0 or getattr(result, "isError", False):
+            return
+        payload = json.dumps(result.model_dump(mode="json", by_alias=True, exclude_none=True), ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        key = call_key(tool_name, args_used, server_url=server_url)
+        with self._lock:
+            now = time.time()
+            # An upsert, so replacing an entry fires the update trigger.
+            self._db.execute(
+                "INSERT INTO entries (key, tool_name, created_at, last_access, size, payload, latency_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET tool_name = excluded.tool_name, "
+                "created_at = excluded.created_at, last_access = excluded.last_access, size = excluded.size, "
+                "payload = excluded.payload, latency_ms = excluded.latency_ms",
+                (key, tool_name, now, now, size, payload, latency_ms),
+            )
+            self.bytes = self._total_bytes()
+            if self.bytes > self.max_bytes:
+                self._evict()
+
+    def _total_bytes(self) -> int:
+        return int(self._db.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()[0])
+
+    def _evict(self) -> None:
+        total = self._total_bytes()
+        freed = 0
+        victims: list[str] = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY last_access ASC"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append(key)
+            freed += size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in victims])
+        self.bytes = total - freed
+        self.evictions += len(victims)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": self.bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self.bytes = self._total_bytes()
+            self._db.close()
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any
+
+from mcp.types import CallToolResult
+
+MODES = ("live", "record", "replay")
+
+
+def canonical_json(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def call_key(tool_name: str, args: dict[str, Any], *, server_url: str | None = None) -> str:
+    payload = {"tool_name": tool_name, "args": args}
+    if server_url is not None:
+        payload["server_url"] = server_url
+    return hashlib.sha256(canonical_json(payload).encode("utf-8")).hexdigest()
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+class RecordedError(Exception):
+    pass
+
+
+class Cassette:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.server_url: str | None = None
+        self.tools: list[dict[str, Any]] | None = None
+        self.calls: dict[str, dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        cassette = cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        if not isinstance(raw, dict) or not isinstance(raw.get("calls"), dict):
+            raise ValueError(f"invalid cassette: {path}")
+        cassette.server_url = raw.get("server_url")
+        cassette.tools = raw.get("tools") if isinstance(raw.get("tools"), list) else None
+        cassette.calls = raw["calls"]
+        return cassette
+
+    def lookup(self, tool_name: str, args_used: dict[str, Any]) -> tuple[CallToolResult, int]:
+        entry = self.calls.get(call_key(tool_name, args_used))
+        if entry is None:
+            raise CassetteMiss(f"no recorded call for {tool_name} {canonical_json(args_used)}")
+        if entry.get("error") is not None:
+            raise RecordedError(entry["error"])
+        return CallToolResult.model_validate(entry["result"]), int(entry.get("latency_ms") or 0)
+
+    def record(self, tool_name: str, args_used: dict[str, Any], result: CallToolResult, latency_ms: int) -> None:
+        self.calls[call_key(tool_name, args_used)] = {
+            "tool_name": tool_name,
+            "args_used": args_used,
+            "result": result.model_dump(mode="json", by_alias=True, exclude_none=True),
+            "latency_ms": latency_ms,
+            "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def record_error(self, tool_name: str, args_used: dict[str, Any], error: str) -> None:
+        self.calls[call_key(tool_name, args_used)] = {
+            "tool_name": tool_name,
+            "args_used": args_used,
+            "error": error,
+            "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def save(self) -> None:
+        parent = os.path.dirname(self.path) or "."
+        os.makedirs(parent, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": 1, "server_url": self.server_url, "tools": self.tools, "calls": self.calls},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp_path, self.path)
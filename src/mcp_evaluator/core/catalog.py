@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any
+
+from ..models import ToolSchema
+from .mcp import open_session, parse_tool_schema
+from .policy import ArgPolicy
+from .pool import SessionPool
+
+
+class ToolCatalog:
+    def __init__(self, *, timeout_s: float, pool: SessionPool | None = None) -> None:
+        self.timeout_s = timeout_s
+        self.pool = pool
+        self.raw_tools: dict[str, list[dict[str, Any]]] = {}
+        self._loads: dict[str, asyncio.Future] = {}
+        self._policies: dict[tuple[str, str, int], ArgPolicy] = {}
+
+    def _index(self, server_url: str, tools: list[dict[str, Any]]) -> dict[str, ToolSchema | None]:
+        self.raw_tools[server_url] = tools
+        return {t["name"]: parse_tool_schema(t.get("inputSchema")) for t in tools}
+
+    async def _fetch(self, server_url: str) -> dict[str, ToolSchema | None]:
+        async with open_session(server_url, self.timeout_s, self.pool) as session:
+            tools_response = await asyncio.wait_for(session.list_tools(), timeout=self.timeout_s)
+        tools = [{"name": t.name, "inputSchema": getattr(t, "inputSchema", None)} for t in tools_response.tools]
+        return self._index(server_url, tools)
+
+    def preload(self, server_url: str, tools: list[dict[str, Any]]) -> None:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(self._index(server_url, [t for t in tools if isinstance(t, dict) and "name" in t]))
+        self._loads[server_url] = future
+
+    async def load(self, server_url: str) -> dict[str, ToolSchema | None]:
+        # One list_tools per server; concurrent callers await the same fetch.
+        task = self._loads.get(server_url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(server_url))
+            self._loads[server_url] = task
+        return await asyncio.shield(task)
+
+    async def tool_names(self, server_url: str) -> list[str]:
+        return list(await self.load(server_url))
+
+    async def get_schema(self, server_url: str, tool_name: str) -> ToolSchema | None:
+        try:
+            index = await self.load(server_url)
+        except Exception:
+            return None
+        return index.get(tool_name)
+
+    async def get_policy(self, server_url: str, tool_name: str, budget_n_results_max: int) -> ArgPolicy:
+        # Compiled once per tool and budget, then shared by every case calling it.
+        key = (server_url, tool_name, budget_n_results_max)
+        policy = self._policies.get(key)
+        if policy is None:
+            schema = await self.get_schema(server_url, tool_name)
+            policy = self._policies.setdefault(key, ArgPolicy(schema, budget_n_results_max=budget_n_results_max))
+        return policy
@@ -0,0 +1,161 @@
+import math
+from collections import Counter
+from typing import Any, Iterable
+
+from ..utils.histogram import LatencyHistogram
+from ..utils.stream import iter_report_cases
+
+DEFAULT_DIFF_ALPHA = 0.01
+DEFAULT_DIFF_MIN_SHIFT = 0.1
+# Below this many samples per side the normal approximation is not trusted.
+MIN_TEST_SAMPLES = 8
+
+
+def mann_whitney(old: Iterable[float], new: Iterable[float]) -> tuple[float, float]:
+    # Two-sided Mann-Whitney U of `new` against `old`, normal approximation with
+    # tie and continuity correction. Latencies are whole milliseconds, so ranks
+    # are assigned per distinct value rather than per sample.
+    a, b = Counter(old), Counter(new)
+    n1, n2 = sum(a.values()), sum(b.values())
+    if not n1 or not n2:
+        return 0.0, 1.0
+    rank = 0
+    rank_sum = 0.0
+    ties = 0
+    for v in sorted(a.keys() | b.keys()):
+        t = a[v] + b[v]
+        rank_sum += b[v] * (rank + (t + 1) / 2)
+        rank += t
+        ties += t**3 - t
+    u = rank_sum - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    var = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0:
+        return u, 1.0
+    z = max(0.0, abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(var)
+    return u, math.erfc(z / math.sqrt(2))
+
+
+def _calls(case: dict[str, Any]) -> Iterable[dict[str, Any]]:
+    # Multi-step cases contribute one latency sample per step to that step's tool.
+    return case.get("steps") or [case]
+
+
+class _Side:
+    def __init__(self) -> None:
+        self.total = 0
+        self.passed = 0
+        self.scored = 0
+        self.score_sum = 0
+        self.latency: dict[str, list[int]] = {}
+        self.head: dict[str, Any] = {}
+
+    def add(self, case: dict[str, Any]) -> None:
+        self.total += 1
+        self.passed += bool(case.get("ok"))
+        if isinstance(case.get("policy_score"), (int, float)):
+            self.scored += 1
+            self.score_sum += case["policy_score"]
+        for call in _calls(case):
+            tool = call.get("tool_name") or case.get("tool_name") or "unknown"
+            samples = self.latency.setdefault(tool, [])
+            # Cache hits take ~0 ms and would read as a shift between runs
+            # with and without the cache; the reports leave them out too.
+            if not call.get("cached"):
+                samples.append(int(call.get("latency_ms") or 0))
+
+    def keep_field(self, key: str, value: Any) -> None:
+        if not isinstance(value, (list, dict)):
+            self.head[key] = value
+
+
+def _source(side: _Side) -> dict[str, Any]:
+    return {
+        "run_id": side.head.get("run_id"),
+        "created_at": side.head.get("created_at"),
+        "server_url": side.head.get("server_url"),
+        "total": side.total,
+        "passed": side.passed,
+        "pass_rate": round(side.passed / side.total, 4) if side.total else 0.0,
+        "policy_score_mean": round(side.score_sum / side.scored, 2) if side.scored else None,
+    }
+
+
+def _tool_shift(tool: str, old: list[int], new: list[int], alpha: float, min_shift: float) -> dict[str, Any]:
+    old_hist, new_hist = LatencyHistogram.of(old), LatencyHistogram.of(new)
+    old_p50, new_p50 = old_hist.percentile(50), new_hist.percentile(50)
+    row: dict[str, Any] = {
+        "tool_name": tool,
+        "old": old_hist.summary() if old else None,
+        "new": new_hist.summary() if new else None,
+        "shift": round(new_p50 / old_p50 - 1, 4) if old and new and old_p50 > 0 else None,
+        "p_value": None,
+        "verdict": "untested",
+    }
+    if len(old) < MIN_TEST_SAMPLES or len(new) < MIN_TEST_SAMPLES:
+        return row
+    _, p = mann_whitney(old, new)
+    row["p_value"] = round(p, 6)
+    # Significance alone flags trivial shifts once there are thousands of
+    # samples, so the median must also move by min_shift.
+    if p >= alpha or row["shift"] is None or abs(row["shift"]) < min_shift:
+        row["verdict"] = "unchanged"
+    else:
+        row["verdict"] = "regressed" if row["shift"] > 0 else "improved"
+    return row
+
+
+def diff_reports(
+    old_path: str,
+    new_path: str,
+    *,
+    alpha: float = DEFAULT_DIFF_ALPHA,
+    min_shift: float = DEFAULT_DIFF_MIN_SHIFT,
+) -> dict[str, Any]:
+    # The old report is reduced to one small tuple per case; the new one is
+    # streamed and joined against it, so neither is ever held in full.
+    old, new = _Side(), _Side()
+    baseline: dict[str, tuple[bool, int | None]] = {}
+    for case in iter_report_cases(old_path, old.keep_field):
+        old.add(case)
+        baseline[str(case.get("case_id"))] = (bool(case.get("ok")), case.get("policy_score"))
+
+    broke: list[str] = []
+    fixed: list[str] = []
+    added: list[str] = []
+    score_changes: list[dict[str, Any]] = []
+    for case in iter_report_cases(new_path, new.keep_field):
+        new.add(case)
+        case_id = str(case.get("case_id"))
+        before = baseline.pop(case_id, None)
+        if before is None:
+            added.append(case_id)
+            continue
+        ok = bool(case.get("ok"))
+        if before[0] and not ok:
+            broke.append(case_id)
+        elif ok and not before[0]:
+            fixed.append(case_id)
+        score = case.get("policy_score")
+        if before[1] is not None and score is not None and score != before[1]:
+            score_changes.append({"case_id": case_id, "old": before[1], "new": score, "delta": score - before[1]})
+
+    score_changes.sort(key=lambda c: (c["delta"], c["case_id"]))
+    tools = [
+        _tool_shift(tool, old.latency.get(tool, []), new.latency.get(tool, []), alpha, min_shift)
+        for tool in sorted(old.latency.keys() | new.latency.keys())
+    ]
+    return {
+        "version": "l1-diff-1",
+        "alpha": alpha,
+        "min_shift": min_shift,
+        "old": {"path": old_path, **_source(old)},
+        "new": {"path": new_path, **_source(new)},
+        "broke": broke,
+        "fixed": fixed,
+        "added": added,
+        "removed": sorted(baseline),
+        "policy_score_changes": score_changes,
+        "tools": tools,
+        "regressed_tools": [t["tool_name"] for t in tools if t["verdict"] == "regressed"],
+    }
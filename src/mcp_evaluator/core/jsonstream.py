@@ -0,0 +1,389 @@
+import json
+import re
+from typing import Any, Callable, Iterable
+
+_SPACE = r"[ \t\n\r]*"
+_NUMBER_PATTERN = r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?"
+_PLAIN_STRING = r'"[^"\\\x00-\x1f]*"'
+_WS = re.compile(_SPACE)
+_SCALAR = re.compile(r'[^\s,:\[\]{}"]*')
+_NUMBER = re.compile(_NUMBER_PATTERN)
+# Runs of comma-terminated scalar items / members, consumed in one match when a
+# container has to be walked: the comma proves the item was not cut off.
+_ITEM = f"{_SPACE}(?:{_NUMBER_PATTERN}|true|false|null|{_PLAIN_STRING}){_SPACE},"
+_ITEM_RUN = re.compile(f"(?:{_ITEM})*")
+_MEMBER_RUN = re.compile(f"(?:{_SPACE}{_PLAIN_STRING}{_SPACE}:{_ITEM})*")
+# json.loads accepts the non-finite constants too, so skipping does the same.
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+_raw_decode = json.JSONDecoder().raw_decode
+_scanstring = json.decoder.scanstring
+_PATH_TOKEN = re.compile(r"\.([^.\[\]]+)|\[(\d+)\]|\[(\"(?:[^\"\\]|\\.)*\"|'[^']*')\]")
+
+MISSING = object()
+
+# How much a target needs to see of its value, cheapest first.
+EXISTS, TYPE, LENGTH, VALUE = 0, 1, 2, 3
+
+
+def utf8_size(text: str) -> int:
+    # isascii() is O(1) on CPython strings, so ASCII text is never encoded.
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def kind_of(value: Any) -> str:
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "boolean"
+    if value is None:
+        return "null"
+    return "number"
+
+
+_KIND_OF_CHAR = {"{": "object", "[": "array", '"': "string", "t": "boolean", "f": "boolean", "n": "null"}
+_KIND_OF_CHAR.update(dict.fromkeys("-0123456789NI", "number"))
+
+
+def _kind_of_char(c: str) -> str:
+    # The first character only names the kind; the caller validates the token.
+    kind = _KIND_OF_CHAR.get(c)
+    if kind is None:
+        raise InvalidJson("expected a value")
+    return kind
+
+
+class Seen:
+    # What the scan observed at a path: always the JSON kind, the length once
+    # counted, and the decoded value only for targets that asked for it.
+    __slots__ = ("kind", "length", "value", "has_value")
+
+    def __init__(self, kind: str, length: int | None = None, value: Any = None, has_value: bool = False) -> None:
+        self.kind = kind
+        self.length = length
+        self.value = value
+        self.has_value = has_value
+
+    @classmethod
+    def of(cls, value: Any) -> "Seen":
+        length = len(value) if isinstance(value, (dict, list, str)) else None
+        return cls(kind_of(value), length, value, True)
+
+
+class InvalidJson(ValueError):
+    pass
+
+
+class BudgetExceeded(ValueError):
+    pass
+
+
+def parse_path(path: str) -> tuple[str | int, ...]:
+    # "$" is the document root; ".key", "[0]" and '["key"]' step into it.
+    if not path.startswith("$"):
+        raise ValueError(f"path must start with $: {path}")
+    segments: list[str | int] = []
+    pos = 1
+    while pos < len(path):
+        m = _PATH_TOKEN.match(path, pos)
+        if m is None:
+            raise ValueError(f"invalid path: {path}")
+        name, index, quoted = m.groups()
+        if name is not None:
+            segments.append(name)
+        elif index is not None:
+            segments.append(int(index))
+        elif quoted.startswith('"'):
+            segments.append(json.loads(quoted))
+        else:
+            segments.append(quoted[1:-1])
+        pos = m.end()
+    return tuple(segments)
+
+
+def resolve_path(value: Any, segments: tuple[str | int, ...]) -> Any:
+    for seg in segments:
+        if isinstance(seg, int) and isinstance(value, list) and seg < len(value):
+            value = value[seg]
+        elif isinstance(seg, str) and isinstance(value, dict) and seg in value:
+            value = value[seg]
+        else:
+            return MISSING
+    return value
+
+
+class PathNode:
+    def __init__(self) -> None:
+        self.children: dict[str | int, "PathNode"] = {}
+        self.targets: list[int] = []
+        self.mode = EXISTS
+
+    def add(self, segments: tuple[str | int, ...], target: int, mode: int) -> None:
+        node = self
+        for seg in segments:
+            node = node.children.setdefault(seg, PathNode())
+        node.targets.append(target)
+        node.mode = max(node.mode, mode)
+
+
+class JsonStream:
+    # A cursor over text chunks that keeps only the unconsumed tail buffered and
+    # skips values it was not asked about without decoding them.
+    def __init__(self, chunks: Iterable[str], max_bytes: int | None = None) -> None:
+        self._chunks = iter(chunks)
+        self.max_bytes = max_bytes
+        self.seen = 0
+        self.buf = ""
+        self.pos = 0
+        self._mark: int | None = None
+        self._truncated = False
+
+    def _more(self) -> bool:
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            if self._truncated:
+                raise BudgetExceeded(f"oracle budget exceeded: {self.max_bytes} bytes")
+            return False
+        size = utf8_size(chunk)
+        if self.max_bytes is not None:
+            remaining = self.max_bytes - self.seen
+            if remaining <= 0:
+                raise BudgetExceeded(f"oracle budget exceeded: {self.max_bytes} bytes")
+            if size > remaining:
+                # Cut on a character boundary at or below the remaining bytes.
+                chunk = chunk.encode("utf-8")[:remaining].decode("utf-8", "ignore")
+                size = utf8_size(chunk)
+                self._truncated = True
+        self.seen += size
+        keep = self.pos if self._mark is None else self._mark
+        self.buf = self.buf[keep:] + chunk
+        self.pos -= keep
+        if self._mark is not None:
+            self._mark = 0
+        return True
+
+    def _need_more(self) -> None:
+        if not self._more():
+            raise InvalidJson("unexpected end of json")
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise InvalidJson(f"expected {ch!r}")
+        self.pos += 1
+
+    def skip_string(self) -> None:
+        # Finds the closing quote with str.find, then lets the C scanner check
+        # escapes and control characters, so long escape-heavy payloads (CIF
+        # text) cost a couple of C-level passes rather than a step per escape.
+        self.pos += 1
+        while True:
+            buf, start = self.buf, self.pos
+            i = buf.find('"', start)
+            while i != -1:
+                j = i
+                while j > start and buf[j - 1] == "\\":
+                    j -= 1
+                if (i - j) % 2 == 0:
+                    self.pos = self._scan_string(buf, start)
+                    return
+                i = buf.find('"', i + 1)
+            # Check what is buffered up to a cut that no escape straddles: before
+            # any backslash among the last five characters, and before its run.
+            end = len(buf)
+            backslash = buf.rfind("\\", max(start, end - 5))
+            if backslash != -1:
+                end = backslash
+            while end > start and buf[end - 1] == "\\":
+                end -= 1
+            if end > start:
+                self._scan_string(buf[start:end] + '"', 0)
+                self.pos = end
+            self._need_more()
+
+    @staticmethod
+    def _scan_string(text: str, start: int) -> int:
+        try:
+            return _scanstring(text, start)[1]
+        except ValueError:
+            raise InvalidJson("invalid string") from None
+
+    def skip_scalar(self) -> None:
+        while True:
+            m = _SCALAR.match(self.buf, self.pos)
+            if m.end() == len(self.buf) and self._more():
+                continue
+            token = m.group()
+            if token not in _LITERALS and _NUMBER.fullmatch(token) is None:
+                raise InvalidJson("expected a value")
+            self.pos = m.end()
+            return
+
+    def _decode_buffered(self) -> bool:
+        try:
+            self.pos = _raw_decode(self.buf, self.pos)[1]
+        except (ValueError, RecursionError):
+            return False
+        return True
+
+    def skip_key(self) -> None:
+        self.pos = _MEMBER_RUN.match(self.buf, self.pos).end()
+        if self.peek() != '"':
+            raise InvalidJson("expected an object key")
+        self.skip_string()
+        self.expect(":")
+
+    def skip_value(self) -> None:
+        # Validates what it skips. A container that is already buffered whole is
+        # checked by the C decoder; one that spans chunks (or is invalid) is walked
+        # token by token with an explicit stack of closing brackets.
+        stack: list[str] = []
+        while True:
+            if stack and stack[-1] == "]":
+                self.pos = _ITEM_RUN.match(self.buf, self.pos).end()
+            c = self.peek()
+            if c == '"':
+                self.skip_string()
+            elif c in ("{", "[") and self._decode_buffered():
+                pass
+            elif c in ("{", "["):
+                close = "}" if c == "{" else "]"
+                self.pos += 1
+                if self.peek() == close:
+                    self.pos += 1
+                else:
+                    stack.append(close)
+                    if close == "}":
+                        self.skip_key()
+                    continue
+            else:
+                self.skip_scalar()
+            while stack:
+                c = self.peek()
+                if c == stack[-1]:
+                    self.pos += 1
+                    stack.pop()
+                elif c == ",":
+                    self.pos += 1
+                    if stack[-1] == "}":
+                        self.skip_key()
+                    break
+                else:
+                    raise InvalidJson(f"expected ',' or {stack[-1]!r}")
+            else:
+                return
+
+    def read_value(self) -> Any:
+        self.peek()
+        self._mark = self.pos
+        try:
+            self.skip_value()
+            raw = self.buf[self._mark : self.pos]
+        finally:
+            self._mark = None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise InvalidJson(str(e)) from None
+
+    def read_key(self) -> str:
+        if self.peek() != '"':
+            raise InvalidJson("expected an object key")
+        key = self.read_value()
+        self.expect(":")
+        return key
+
+
+def scan(
+    stream: JsonStream,
+    root: PathNode,
+    on_value: Callable[[int, Seen | None], None],
+) -> str:
+    # Walks only the parts of the document that lead to a target. A target may
+    # be delivered more than once: with duplicate object keys json.loads keeps
+    # the last, so None first withdraws what an earlier occurrence delivered.
+    # Returns the root's first char.
+    first = stream.peek()
+    if first == "":
+        raise InvalidJson("empty output")
+    _visit(stream, root, on_value)
+    if stream.peek() != "":
+        raise InvalidJson("extra data after json")
+    return first
+
+
+def _visit(stream: JsonStream, node: PathNode, on_value: Callable[[int, Seen | None], None]) -> None:
+    c = stream.peek()
+    kind = _kind_of_char(c)
+    if node.mode == VALUE or (node.mode == LENGTH and kind == "string"):
+        _visit_value(stream.read_value(), node, on_value)
+        return
+    if kind not in ("object", "array") or (node.mode < LENGTH and not node.children):
+        # Validated before delivery, so a type check never passes on a bad token.
+        stream.skip_value()
+        _deliver(node, Seen(kind), on_value)
+        return
+    count = _members(stream, node, on_value)
+    _deliver(node, Seen(kind, count if node.mode == LENGTH else None), on_value)
+
+
+def _members(stream: JsonStream, node: PathNode, on_value: Callable[[int, Seen | None], None]) -> int:
+    close = "}" if stream.peek() == "{" else "]"
+    stream.pos += 1
+    if stream.peek() == close:
+        stream.pos += 1
+        return 0
+    count = 0
+    keys: set[str] = set()
+    while True:
+        if close == "}":
+            key = stream.read_key()
+            child = node.children.get(key)
+            if key not in keys:
+                keys.add(key)
+                count += 1
+            elif child is not None:
+                _forget(child, on_value)
+        else:
+            child = node.children.get(count)
+            count += 1
+        if child is None:
+            stream.skip_value()
+        else:
+            _visit(stream, child, on_value)
+        c = stream.peek()
+        stream.pos += 1
+        if c == close:
+            return count
+        if c != ",":
+            raise InvalidJson(f"expected ',' or {close!r}")
+
+
+def _deliver(node: PathNode, seen: Seen, on_value: Callable[[int, Seen | None], None]) -> None:
+    for target in node.targets:
+        on_value(target, seen)
+
+
+def _forget(node: PathNode, on_value: Callable[[int, Seen | None], None]) -> None:
+    for target in node.targets:
+        on_value(target, None)
+    for child in node.children.values():
+        _forget(child, on_value)
+
+
+def _visit_value(value: Any, node: PathNode, on_value: Callable[[int, Seen | None], None]) -> None:
+    _deliver(node, Seen.of(value), on_value)
+    for seg, child in node.children.items():
+        found = resolve_path(value, (seg,))
+        if found is not MISSING:
+            _visit_value(found, child, on_value)
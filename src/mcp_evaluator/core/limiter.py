@@ -0,0 +1,148 @@
+import asyncio
+import math
+import time
+from typing import Any
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return float(ordered[idx])
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        initial: int,
+        *,
+        adaptive: bool = True,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        latency_slack_ms: float = 50.0,
+        target_p95_ms: float | None = None,
+        max_error_rate: float = 0.1,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.adaptive = adaptive
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.latency_tolerance = latency_tolerance
+        self.latency_slack_ms = latency_slack_ms
+        self.target_p95_ms = target_p95_ms
+        self.max_error_rate = max_error_rate
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.baseline_p95_ms: float | None = None
+        self.trajectory: list[dict[str, Any]] = []
+        self._started = time.monotonic()
+        self._window_latencies: list[float] = []
+        self._window_errors = 0
+        self._window_saturated = False
+        self._last_decrease = float("-inf")
+        self._cond = asyncio.Condition()
+        self._wake_task: asyncio.Future | None = None
+        self._record("initial")
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def _record(self, reason: str) -> None:
+        self.trajectory.append(
+            {"t_ms": int((time.monotonic() - self._started) * 1000), "limit": self.current, "reason": reason}
+        )
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.current)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self.in_flight >= self.current:
+                self._window_saturated = True
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.release()
+
+    def _reset_window(self) -> None:
+        self._window_latencies = []
+        self._window_errors = 0
+        self._window_saturated = False
+
+    def _set_limit(self, value: float, reason: str) -> None:
+        value = min(self.max_limit, max(self.min_limit, value))
+        grew = int(value) > self.current
+        changed = int(value) != self.current
+        self.limit = value
+        if changed:
+            self._record(reason)
+        if grew:
+            self._wake_task = asyncio.ensure_future(self._wake())
+
+    async def _wake(self) -> None:
+        async with self._cond:
+            self._cond.notify_all()
+
+    def _decrease(self, reason: str) -> None:
+        self._set_limit(self.limit * self.decrease_factor, reason)
+        self._last_decrease = time.monotonic()
+        self._reset_window()
+
+    def observe(self, latency_ms: float, *, error: bool = False, timeout: bool = False) -> None:
+        if not self.adaptive:
+            return
+        if time.monotonic() - latency_ms / 1000 < self._last_decrease:
+            # Requests dispatched before the last back-off say nothing about the new limit.
+            return
+        if timeout:
+            # Timeouts mean the server is already overloaded: back off right away.
+            self._decrease("timeout")
+            return
+        self._window_latencies.append(latency_ms)
+        if error:
+            self._window_errors += 1
+        window_size = max(4, self.current)
+        if len(self._window_latencies) < window_size:
+            return
+
+        p95 = percentile(self._window_latencies, 95)
+        error_rate = self._window_errors / len(self._window_latencies)
+        if self.baseline_p95_ms is None or p95 < self.baseline_p95_ms:
+            self.baseline_p95_ms = p95
+        bound = self.target_p95_ms or max(
+            self.baseline_p95_ms * self.latency_tolerance,
+            self.baseline_p95_ms + self.latency_slack_ms,
+        )
+        if error_rate > self.max_error_rate:
+            self._decrease("errors")
+            return
+        if p95 > bound:
+            self._decrease("latency")
+            return
+        if self._window_saturated:
+            # Only probe upwards when the current limit was actually the bottleneck.
+            self._set_limit(self.limit + 1, "increase")
+        self._reset_window()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "mode": "adaptive" if self.adaptive else "fixed",
+            "initial": self.trajectory[0]["limit"] if self.trajectory else self.current,
+            "final": self.current,
+            "max": max((p["limit"] for p in self.trajectory), default=self.current),
+            "peak_in_flight": self.peak_in_flight,
+            "trajectory": list(self.trajectory),
+        }
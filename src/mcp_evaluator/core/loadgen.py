@@ -0,0 +1,146 @@
+import asyncio
+import random
+import time
+from typing import Any, Iterator
+
+from ..models import SuiteCase
+from ..utils.histogram import LatencyHistogram
+from .catalog import ToolCatalog
+from .oracle import OracleCache
+from .pool import SessionPool
+from .runner import run_case
+
+ARRIVALS = ("poisson", "constant")
+
+
+def arrival_offsets(
+    rate: float, duration_s: float, arrival: str = "poisson", rng: random.Random | None = None
+) -> Iterator[float]:
+    if arrival not in ARRIVALS:
+        raise ValueError(f"unknown arrival process: {arrival} (expected one of {', '.join(ARRIVALS)})")
+    rng = rng or random.Random()
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate) if arrival == "poisson" else 1.0 / rate
+        if t >= duration_s:
+            return
+        yield t
+
+
+class LoadStats:
+    def __init__(self) -> None:
+        self.sent = 0
+        self.completed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.failed = 0
+        self.response = LatencyHistogram()
+        self.service = LatencyHistogram()
+
+    def add(self, ok: bool, error: str | None, response_ms: float, service_ms: float) -> None:
+        self.completed += 1
+        self.errors += 1 if error is not None else 0
+        self.failed += 0 if ok else 1
+        self.response.record(response_ms)
+        self.service.record(service_ms)
+
+    def summary(self, elapsed_s: float) -> dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "failed": self.failed,
+            "throughput_rps": round(self.completed / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+            "error_rate": round(self.errors / max(1, self.completed), 4),
+            "fail_rate": round(self.failed / max(1, self.completed), 4),
+            "latency": self.response.summary(),
+            "service_latency": self.service.summary(),
+        }
+
+
+async def run_load(
+    server_url: str,
+    cases: list[SuiteCase],
+    *,
+    rate: float,
+    duration_s: float,
+    timeout_s: float,
+    budget_n_results_max: int,
+    pool: SessionPool,
+    catalog: ToolCatalog,
+    arrival: str = "poisson",
+    window_s: float = 5.0,
+    max_in_flight: int = 1024,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    if not cases:
+        raise ValueError("load generation needs at least one case")
+    if rate <= 0 or duration_s <= 0 or window_s <= 0:
+        raise ValueError("rate, duration_s and window_s must be positive")
+
+    rng = random.Random(seed)
+    total = LoadStats()
+    windows: dict[int, LoadStats] = {}
+    in_flight: set[asyncio.Task] = set()
+    max_send_lag_ms = 0.0
+    oracles = OracleCache()
+    start = time.perf_counter()
+
+    def window(t_s: float) -> LoadStats:
+        return windows.setdefault(int(t_s // window_s), LoadStats())
+
+    async def fire(case: SuiteCase, scheduled_s: float) -> None:
+        result = await run_case(
+            server_url,
+            case,
+            timeout_s,
+            catalog=catalog,
+            budget_n_results_max=budget_n_results_max,
+            pool=pool,
+            oracles=oracles,
+        )
+        done_s = time.perf_counter() - start
+        # Measured from the scheduled send time, not the actual one, so a
+        # stalled server or generator cannot hide queueing delay.
+        response_ms = (done_s - scheduled_s) * 1000
+        for stats in (total, window(done_s)):
+            stats.add(result.ok, result.error, response_ms, result.latency_ms)
+
+    for i, scheduled_s in enumerate(arrival_offsets(rate, duration_s, arrival, rng)):
+        delay = start + scheduled_s - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            max_send_lag_ms = max(max_send_lag_ms, -delay * 1000)
+        total.sent += 1
+        window(scheduled_s).sent += 1
+        if len(in_flight) >= max_in_flight:
+            # Open loop: never wait for a slot, count the arrival as shed instead.
+            total.dropped += 1
+            window(scheduled_s).dropped += 1
+            continue
+        task = asyncio.create_task(fire(cases[i % len(cases)], scheduled_s))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    await asyncio.gather(*list(in_flight))
+    elapsed_s = time.perf_counter() - start
+
+    summary = total.summary(elapsed_s)
+    summary.update(
+        {
+            "rate": rate,
+            "arrival": arrival,
+            "duration_s": duration_s,
+            "elapsed_s": round(elapsed_s, 3),
+            "window_s": window_s,
+            "max_send_lag_ms": int(max_send_lag_ms),
+            "histograms": {"latency": total.response.to_dict(), "service_latency": total.service.to_dict()},
+        }
+    )
+    summary["windows"] = [
+        {"t_s": round(idx * window_s, 3), **windows[idx].summary(window_s)}
+        for idx in sorted(windows)
+    ]
+    return summary
@@ -1,13 +1,28 @@
 import asyncio
 import time
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from mcp import ClientSession
-from mcp.client.sse import sse_client
+from mcp.types import CallToolResult
 
 from ..models import CaseResult, ToolCall, ToolSchema
-from .oracle import check_oracle, extract_text
-from .policy import repair_and_score_args
+from .blobs import BlobStore
+from .cache import ResultCache
+from .cassette import Cassette, RecordedError
+from .oracle import (
+    DEFAULT_ORACLE_MAX_BYTES,
+    ORACLE_THREAD_BYTES,
+    OracleCache,
+    compile_oracle,
+    extract_text,
+    iter_text,
+    text_chunks,
+    text_size,
+)
+from .policy import ArgPolicy
+from .pool import SessionPool, transport_failed
+from .retry import AttemptLog, RetryPolicies, call_with_retry
 
 
 def parse_tool_schema(raw: Any) -> ToolSchema | None:
@@ -27,24 +42,174 @@ def parse_tool_schema(raw: Any) -> ToolSchema | None:
     return ToolSchema(required=required_str, properties=prop_map)
 
 
-async def list_tools(server_url: str, timeout_s: float) -> list[str]:
-    async with sse_client(server_url) as (read, write):
-        async with ClientSession(read, write) as session:
-            await asyncio.wait_for(session.initialize(), timeout=timeout_s)
-            tools_response = await asyncio.wait_for(session.list_tools(), timeout=timeout_s)
-            return [t.name for t in tools_response.tools]
+@asynccontextmanager
+async def open_session(
+    server_url: str,
+    timeout_s: float,
+    pool: SessionPool | None = None,
+    phases: dict[str, float] | None = None,
+) -> AsyncIterator[ClientSession]:
+    if pool is not None:
+        async with pool.session(server_url, phases) as session:
+            yield session
+        return
+    transient = SessionPool(size=1, timeout_s=timeout_s)
+    try:
+        async with transient.session(server_url, phases) as session:
+            yield session
+    finally:
+        await transient.drain()
+
+
+class ChainSession:
+    # The session every step of a chain runs on. A transport failure hands it
+    # back to the pool as broken; the next attempt or step checks out a fresh one.
+    def __init__(
+        self, server_url: str, timeout_s: float, pool: SessionPool | None, phases: dict[str, float]
+    ) -> None:
+        self.server_url = server_url
+        self.timeout_s = timeout_s
+        self.pool = pool
+        self.phases = phases
+        self.session: ClientSession | None = None
+        self._context: Any = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> ClientSession:
+        async with self._lock:
+            if self.session is None:
+                own: dict[str, float] = {}
+                context = open_session(self.server_url, self.timeout_s, self.pool, own)
+                self.session = await context.__aenter__()
+                self._context = context
+                for phase, ms in own.items():
+                    self.phases[phase] = round(self.phases.get(phase, 0.0) + ms, 3)
+            return self.session
+
+    async def discard(self, session: ClientSession, e: BaseException) -> None:
+        async with self._lock:
+            # A concurrent hedge may already have replaced it.
+            if self.session is not session:
+                return
+            context, self._context, self.session = self._context, None, None
+        # Exiting with the error is what marks the pooled session broken.
+        await context.__aexit__(type(e), e, e.__traceback__)
+
+    async def close(self) -> None:
+        context, self._context, self.session = self._context, None, None
+        if context is not None:
+            await context.__aexit__(None, None, None)
+
+
+async def list_tools(server_url: str, timeout_s: float, pool: SessionPool | None = None) -> list[str]:
+    async with open_session(server_url, timeout_s, pool) as session:
+        tools_response = await asyncio.wait_for(session.list_tools(), timeout=timeout_s)
+        return [t.name for t in tools_response.tools]
 
 
-async def get_tool_schema(server_url: str, tool_name: str, timeout_s: float) -> ToolSchema | None:
-    async with sse_client(server_url) as (read, write):
-        async with ClientSession(read, write) as session:
-            await asyncio.wait_for(session.initialize(), timeout=timeout_s)
-            tools_response = await asyncio.wait_for(session.list_tools(), timeout=timeout_s)
-            tool = next((t for t in tools_response.tools if t.name == tool_name), None)
-            if tool is None:
-                return None
-            raw = getattr(tool, "inputSchema", None)
-            return parse_tool_schema(raw)
+async def get_tool_schema(
+    server_url: str, tool_name: str, timeout_s: float, pool: SessionPool | None = None
+) -> ToolSchema | None:
+    async with open_session(server_url, timeout_s, pool) as session:
+        tools_response = await asyncio.wait_for(session.list_tools(), timeout=timeout_s)
+        tool = next((t for t in tools_response.tools if t.name == tool_name), None)
+        if tool is None:
+            return None
+        raw = getattr(tool, "inputSchema", None)
+        return parse_tool_schema(raw)
+
+
+def format_error(e: BaseException) -> str:
+    if isinstance(e, RecordedError):
+        return str(e)
+    return f"{type(e).__name__}: {e}"
+
+
+async def call_tool(
+    server_url: str,
+    tool_name: str,
+    args_used: dict[str, Any],
+    timeout_s: float,
+    *,
+    pool: SessionPool | None = None,
+    mode: str = "live",
+    cassette: Cassette | None = None,
+    cache: ResultCache | None = None,
+    phases: dict[str, float] | None = None,
+    retry: RetryPolicies | None = None,
+    log: AttemptLog | None = None,
+    chain: ChainSession | None = None,
+) -> tuple[CallToolResult, int, bool]:
+    phases = phases if phases is not None else {}
+    if mode == "replay":
+        if cassette is None:
+            raise ValueError("replay mode requires a cassette")
+        result, latency_ms = cassette.lookup(tool_name, args_used)
+        phases["call"] = float(latency_ms)
+        return result, latency_ms, False
+
+    if cache is not None:
+        start = time.perf_counter()
+        # SQLite I/O stays off the event loop.
+        entry = await asyncio.to_thread(cache.lookup, server_url, tool_name, args_used)
+        recording = mode == "record" and cassette is not None
+        # The cassette gets the latency of the live call behind the entry, not
+        # the lookup; an entry that does not know it is fetched live instead.
+        if entry is not None and not (recording and entry[1] is None):
+            cached, live_ms = entry
+            phases["call"] = round((time.perf_counter() - start) * 1000, 3)
+            latency_ms = int(phases["call"])
+            if recording:
+                cassette.record(tool_name, args_used, cached, live_ms)
+            return cached, latency_ms, True
+
+    async def invoke(active: ClientSession, own: dict[str, float]) -> CallToolResult:
+        # Connection setup is amortised by the pool; latency covers the tool call only.
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(active.call_tool(tool_name, args_used), timeout=timeout_s)
+        finally:
+            own["call"] = round((time.perf_counter() - start) * 1000, 3)
+
+    async def attempt(own: dict[str, float]) -> CallToolResult:
+        if chain is not None:
+            session = await chain.get()
+            try:
+                return await invoke(session, own)
+            except Exception as e:
+                # Never retry on a session whose transport just failed.
+                if transport_failed(e):
+                    await chain.discard(session, e)
+                raise
+        async with open_session(server_url, timeout_s, pool, own) as active:
+            return await invoke(active, own)
+
+    log = log if log is not None else AttemptLog()
+    try:
+        if retry is None:
+            log.attempts += 1
+            result = await attempt(phases)
+        else:
+            result = await call_with_retry(
+                attempt,
+                retry.for_tool(tool_name),
+                rng=retry.rng,
+                phases=phases,
+                log=log,
+                hedge_after_s=retry.hedge_delay_s(server_url, tool_name),
+            )
+            retry.observe(server_url, tool_name, phases["call"])
+    except Exception as e:
+        if mode == "record" and cassette is not None:
+            cassette.record_error(tool_name, args_used, format_error(e))
+        raise
+    # Failed attempts and backoff are part of what the case cost.
+    latency_ms = int(phases["call"] + phases.get("retry", 0.0))
+    if cache is not None:
+        await asyncio.to_thread(cache.put, server_url, tool_name, args_used, result, latency_ms)
+    if mode == "record" and cassette is not None:
+        cassette.record(tool_name, args_used, result, latency_ms)
+    return result, latency_ms, False
 
 
 async def run_one_case(
@@ -56,16 +221,28 @@ async def run_one_case(
     budget_n_results_max: int,
     case_id: str,
     expect: dict[str, Any] | None,
+    pool: SessionPool | None = None,
+    mode: str = "live",
+    cassette: Cassette | None = None,
+    cache: ResultCache | None = None,
+    oracle_max_bytes: int | None = DEFAULT_ORACLE_MAX_BYTES,
+    oracles: OracleCache | None = None,
+    blobs: BlobStore | None = None,
+    retry: RetryPolicies | None = None,
+    arg_policy: ArgPolicy | None = None,
+    chain: ChainSession | None = None,
 ) -> CaseResult:
+    phases: dict[str, float] = {}
+    log = AttemptLog()
     start = time.perf_counter()
-    args_used, policy_score, repairs, violations = repair_and_score_args(
-        tool_schema,
-        tool_call.args,
-        budget_n_results_max=budget_n_results_max,
-    )
+    oracle = oracles.get(expect) if oracles is not None else compile_oracle(expect)
+    if arg_policy is None:
+        arg_policy = ArgPolicy(tool_schema, budget_n_results_max=budget_n_results_max)
+    args_used, policy_score, repairs, violations = arg_policy(tool_call.args)
+    phases["policy"] = round((time.perf_counter() - start) * 1000, 3)
     if violations:
         latency_ms = int((time.perf_counter() - start) * 1000)
-        oracle_ok, oracle_error = check_oracle(expect=expect, error="policy_violation", output_text=None)
+        oracle_ok, oracle_error = oracle(error="policy_violation")
         return CaseResult(
             case_id=case_id,
             server_url=server_url,
@@ -81,43 +258,73 @@ async def run_one_case(
             output_text=None,
             oracle_ok=oracle_ok,
             oracle_error=oracle_error,
+            phases_ms=phases,
+            attempts=0,
         )
 
     try:
-        async with sse_client(server_url) as (read, write):
-            async with ClientSession(read, write) as session:
-                await asyncio.wait_for(session.initialize(), timeout=timeout_s)
-                result = await asyncio.wait_for(
-                    session.call_tool(tool_call.tool_name, args_used),
-                    timeout=timeout_s,
-                )
-                latency_ms = int((time.perf_counter() - start) * 1000)
-                output_text = extract_text(result)
-                oracle_ok, oracle_error = check_oracle(
-                    expect=expect,
-                    error=None,
-                    output_text=output_text,
-                )
-                return CaseResult(
-                    case_id=case_id,
-                    server_url=server_url,
-                    tool_name=tool_call.tool_name,
-                    args=tool_call.args,
-                    args_used=args_used,
-                    policy_score=policy_score,
-                    policy_repairs=repairs,
-                    policy_violations=violations,
-                    ok=oracle_ok,
-                    latency_ms=latency_ms,
-                    error=None,
-                    output_text=output_text,
-                    oracle_ok=oracle_ok,
-                    oracle_error=oracle_error,
-                )
+        result, latency_ms, cached = await call_tool(
+            server_url,
+            tool_call.tool_name,
+            args_used,
+            timeout_s,
+            pool=pool,
+            mode=mode,
+            cassette=cassette,
+            cache=cache,
+            phases=phases,
+            retry=retry,
+            log=log,
+            chain=chain,
+        )
+        oracle_start = time.perf_counter()
+        size = text_size(result)
+        if size > ORACLE_THREAD_BYTES:
+            # Large payloads are checked off the event loop so other cases keep flowing.
+            oracle_ok, oracle_error = await asyncio.to_thread(
+                oracle, error=None, chunks=text_chunks(result), max_bytes=oracle_max_bytes
+            )
+        else:
+            oracle_ok, oracle_error = oracle(error=None, chunks=text_chunks(result), max_bytes=oracle_max_bytes)
+        phases["oracle"] = round((time.perf_counter() - oracle_start) * 1000, 3)
+        output_blob: str | None = None
+        output_size: int | None = None
+        if blobs is not None and size > blobs.threshold_bytes:
+            parts = list(iter_text(result))
+            output_blob, output_size = await asyncio.to_thread(blobs.put, parts)
+            output_text = blobs.preview(parts)
+        else:
+            output_text = extract_text(result)
+        return CaseResult(
+            case_id=case_id,
+            server_url=server_url,
+            tool_name=tool_call.tool_name,
+            args=tool_call.args,
+            args_used=args_used,
+            policy_score=policy_score,
+            policy_repairs=repairs,
+            policy_violations=violations,
+            ok=oracle_ok,
+            latency_ms=latency_ms,
+            error=None,
+            output_text=output_text,
+            oracle_ok=oracle_ok,
+            oracle_error=oracle_error,
+            cached=cached,
+            phases_ms=phases,
+            output_blob=output_blob,
+            output_size=output_size,
+            attempts=max(1, log.attempts),
+            hedged=log.hedged,
+            hedge_won=log.hedge_won,
+        )
     except Exception as e:
-        latency_ms = int((time.perf_counter() - start) * 1000)
-        err = f"{type(e).__name__}: {e}"
-        oracle_ok, oracle_error = check_oracle(expect=expect, error=err, output_text=None)
+        if "call" in phases:
+            latency_ms = int(phases["call"] + phases.get("retry", 0.0))
+        else:
+            latency_ms = int((time.perf_counter() - start) * 1000)
+        err = format_error(e)
+        oracle_ok, oracle_error = oracle(error=err)
         return CaseResult(
             case_id=case_id,
             server_url=server_url,
@@ -133,4 +340,8 @@ async def run_one_case(
             output_text=None,
             oracle_ok=oracle_ok,
             oracle_error=oracle_error,
+            phases_ms=phases,
+            attempts=max(1, log.attempts),
+            hedged=log.hedged,
+            hedge_won=log.hedge_won,
         )
@@ -1,80 +1,339 @@
-import json
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
+from .cassette import canonical_json
+from .jsonstream import (
+    EXISTS,
+    LENGTH,
+    TYPE,
+    VALUE,
+    BudgetExceeded,
+    InvalidJson,
+    JsonStream,
+    PathNode,
+    Seen,
+    parse_path,
+    scan,
+    utf8_size,
+)
+from .schema import JSON_TYPES, compile_schema, is_type
 
-def extract_text(result: Any) -> str | None:
-    content = getattr(result, "content", None)
-    if not content:
-        return None
-    parts: list[str] = []
-    for item in content:
+DEFAULT_ORACLE_MAX_BYTES = 64 * 1024 * 1024
+ORACLE_THREAD_BYTES = 1024 * 1024
+
+
+def iter_text(result: Any) -> Iterator[str]:
+    # Yields the same text extract_text would join, without building it.
+    first = True
+    for item in getattr(result, "content", None) or []:
         text = getattr(item, "text", None)
         if isinstance(text, str):
-            parts.append(text)
-    return "\n".join(parts) if parts else None
+            if not first:
+                yield "\n"
+            first = False
+            yield text
 
 
-def try_parse_json(text: str | None) -> Any | None:
-    if not isinstance(text, str):
-        return None
-    try:
-        return json.loads(text)
-    except Exception:
+def text_chunks(result: Any) -> Iterator[str] | None:
+    # None when the result has no text part at all, so oracles report missing output.
+    if not any(isinstance(getattr(item, "text", None), str) for item in getattr(result, "content", None) or []):
         return None
+    return iter_text(result)
 
 
-def check_oracle(
-    *,
-    expect: dict[str, Any] | None,
-    error: str | None,
-    output_text: str | None,
-) -> tuple[bool, str | None]:
-    if expect is None:
-        return True, None
+def text_size(result: Any) -> int:
+    # UTF-8 bytes, the unit output_size is reported in and thresholds are set in.
+    return sum(utf8_size(t) for t in iter_text(result))
 
-    kind = expect.get("kind")
-    if kind == "policy_violation":
-        ok = error == "policy_violation"
-        return ok, None if ok else "expected policy_violation"
 
-    if error is not None:
-        return False, error
+def extract_text(result: Any) -> str | None:
+    parts = list(iter_text(result))
+    return "".join(parts) if parts else None
+
+
+class Oracle:
+    # A compiled `expect`: parameters are validated and paths parsed once, the
+    # per-case call only streams the output through the prepared checks.
+    def __init__(
+        self,
+        kind: str | None,
+        evaluate: Callable[[Iterable[str], int | None], tuple[bool, str | None]] | None = None,
+        *,
+        invalid: str | None = None,
+        missing: str = "missing output_text",
+    ) -> None:
+        self.kind = kind
+        self._evaluate = evaluate
+        self.invalid = invalid
+        self.missing = missing
+
+    def __call__(
+        self,
+        *,
+        error: str | None,
+        output_text: str | None = None,
+        chunks: Iterable[str] | None = None,
+        max_bytes: int | None = DEFAULT_ORACLE_MAX_BYTES,
+    ) -> tuple[bool, str | None]:
+        if self.kind is None and self.invalid is None:
+            return True, None
+        if self.kind == "policy_violation":
+            ok = error == "policy_violation"
+            return ok, None if ok else "expected policy_violation"
+        if error is not None:
+            return False, error
+        if self.kind == "any":
+            return True, None
+        if self.invalid is not None:
+            return False, self.invalid
+        if chunks is None and isinstance(output_text, str):
+            chunks = [output_text]
+        if chunks is None:
+            return False, self.missing
+        return self._evaluate(chunks, max_bytes)
 
-    if kind == "any":
-        return True, None
+
+def compile_oracle(expect: dict[str, Any] | None) -> Oracle:
+    if expect is None:
+        return Oracle(None)
+    kind = expect.get("kind")
+    if kind in ("policy_violation", "any"):
+        return Oracle(kind)
 
     if kind == "text_in":
         values = expect.get("values")
         if not isinstance(values, list) or not all(isinstance(x, str) for x in values):
-            return False, "invalid oracle: values"
-        if not isinstance(output_text, str):
-            return False, "missing output_text"
-        ok = output_text.strip() in values
-        return ok, None if ok else f"text not in allowed values: {output_text.strip()}"
+            return Oracle(kind, invalid="invalid oracle: values")
+        return Oracle(kind, lambda chunks, max_bytes: check_text_in(chunks, values))
 
     if kind == "text_contains":
         needle = expect.get("text")
         if not isinstance(needle, str):
-            return False, "invalid oracle: text"
-        if not isinstance(output_text, str):
-            return False, "missing output_text"
-        ok = needle in output_text
-        return ok, None if ok else f"text not contains: {needle}"
+            return Oracle(kind, invalid="invalid oracle: text")
+        return Oracle(kind, lambda chunks, max_bytes: check_text_contains(chunks, needle, max_bytes))
 
     if kind == "json":
-        parsed = try_parse_json(output_text)
-        if parsed is None:
-            return False, "output not valid json"
+        try:
+            plan = JsonPlan(expect)
+        except ValueError as e:
+            return Oracle(kind, invalid=f"invalid oracle: {e}")
+        return Oracle(kind, plan, missing="output not valid json")
+
+    return Oracle(kind, invalid=f"unknown oracle kind: {kind}")
+
+
+class OracleCache:
+    # One per suite: cases sharing an `expect` share its compiled oracle.
+    def __init__(self) -> None:
+        self._compiled: dict[str, Oracle] = {}
+        self.hits = 0
+        self.compiles = 0
+
+    def get(self, expect: dict[str, Any] | None) -> Oracle:
+        key = canonical_json(expect)
+        oracle = self._compiled.get(key)
+        if oracle is None:
+            oracle = self._compiled[key] = compile_oracle(expect)
+            self.compiles += 1
+        else:
+            self.hits += 1
+        return oracle
+
+
+def check_oracle(
+    *,
+    expect: dict[str, Any] | None,
+    error: str | None,
+    output_text: str | None = None,
+    chunks: Iterable[str] | None = None,
+    max_bytes: int | None = DEFAULT_ORACLE_MAX_BYTES,
+) -> tuple[bool, str | None]:
+    return compile_oracle(expect)(error=error, output_text=output_text, chunks=chunks, max_bytes=max_bytes)
+
+
+def check_text_in(chunks: Iterable[str], values: list[str]) -> tuple[bool, str | None]:
+    # Anything longer than the longest allowed value (after stripping) cannot match.
+    limit = max((len(v) for v in values), default=0)
+    text = ""
+    for chunk in chunks:
+        text = (text + chunk).lstrip()
+        if len(text.rstrip()) > limit:
+            return False, f"text not in allowed values: {text[:limit + 1]}…"
+    ok = text.strip() in values
+    return ok, None if ok else f"text not in allowed values: {text.strip()}"
+
+
+def check_text_contains(chunks: Iterable[str], needle: str, max_bytes: int | None) -> tuple[bool, str | None]:
+    # Keep just enough of the previous chunks to catch a match spanning a boundary.
+    overlap = max(0, len(needle) - 1)
+    tail = ""
+    seen = 0
+    for chunk in chunks:
+        if needle in chunk or needle in tail + chunk[:overlap]:
+            return True, None
+        seen += utf8_size(chunk)
+        if max_bytes is not None and seen > max_bytes:
+            return False, f"oracle budget exceeded: {max_bytes} bytes"
+        tail = (tail + chunk[-overlap:])[-overlap:] if overlap else ""
+    return False, f"text not contains: {needle}"
+
+
+class JsonTarget:
+    def __init__(
+        self, segments: tuple[str | int, ...], mode: int, check: Callable[[Seen | None], str | None], legacy: bool = False
+    ) -> None:
+        self.segments = segments
+        self.mode = mode
+        self.check = check
+        # Plain equals/must_have keys only apply when the document is an object.
+        self.legacy = legacy
+
+
+CHECK_KEYS = {"path", "exists", "type", "min_len", "max_len", "equals", "schema"}
+
+
+class JsonPlan:
+    def __init__(self, expect: dict[str, Any]) -> None:
+        self.targets: list[JsonTarget] = []
         equals = expect.get("equals")
-        if isinstance(equals, dict) and isinstance(parsed, dict):
+        if isinstance(equals, dict):
             for k, v in equals.items():
-                if parsed.get(k) != v:
-                    return False, f"json field mismatch: {k}"
+                self.targets.append(_equals_target(k, v))
         must_have = expect.get("must_have")
-        if isinstance(must_have, list) and isinstance(parsed, dict):
+        if isinstance(must_have, list):
             for k in must_have:
-                if isinstance(k, str) and k not in parsed:
-                    return False, f"json missing key: {k}"
+                if isinstance(k, str):
+                    self.targets.append(_must_have_target(k))
+        checks = expect.get("checks")
+        if checks is not None:
+            if not isinstance(checks, list):
+                raise ValueError("checks must be a list")
+            for i, spec in enumerate(checks):
+                self.targets.append(_compile_check(i, spec))
+
+        self.root = PathNode()
+        for i, target in enumerate(self.targets):
+            self.root.add(target.segments, i, target.mode)
+
+    def __call__(self, chunks: Iterable[str], max_bytes: int | None) -> tuple[bool, str | None]:
+        # Checks run once the whole document is scanned: it must be valid json,
+        # and a later duplicate key may still replace what a target saw.
+        found: dict[int, Seen] = {}
+
+        def on_value(i: int, seen: Seen | None) -> None:
+            if seen is None:
+                found.pop(i, None)
+            else:
+                found[i] = seen
+
+        stream = JsonStream(chunks, max_bytes)
+        try:
+            root_char = scan(stream, self.root, on_value)
+        except InvalidJson:
+            return False, "output not valid json"
+        except BudgetExceeded as e:
+            return False, str(e)
+
+        for i, target in enumerate(self.targets):
+            seen = found.get(i)
+            if seen is None and target.legacy and root_char != "{":
+                continue
+            message = target.check(seen)
+            if message is not None:
+                return False, message
         return True, None
 
-    return False, f"unknown oracle kind: {kind}"
+
+def _split_path(key: str) -> tuple[tuple[str | int, ...], bool]:
+    if key.startswith("$"):
+        try:
+            return parse_path(key), False
+        except ValueError:
+            pass
+    return (key,), True
+
+
+def _equals_target(key: str, expected: Any) -> JsonTarget:
+    segments, legacy = _split_path(key)
+
+    def check(seen: Seen | None) -> str | None:
+        if seen is None:
+            # Matches dict.get() semantics for plain keys: missing equals None.
+            return None if legacy and expected is None else f"json field mismatch: {key}"
+        return None if seen.value == expected else f"json field mismatch: {key}"
+
+    return JsonTarget(segments, VALUE, check, legacy)
+
+
+def _must_have_target(key: str) -> JsonTarget:
+    segments, legacy = _split_path(key)
+    return JsonTarget(segments, EXISTS, lambda seen: f"json missing key: {key}" if seen is None else None, legacy)
+
+
+def _compile_check(i: int, spec: Any) -> JsonTarget:
+    if not isinstance(spec, dict):
+        raise ValueError(f"checks[{i}] must be an object")
+    unknown = set(spec) - CHECK_KEYS
+    if unknown:
+        raise ValueError(f"checks[{i}] unknown keys: {', '.join(sorted(unknown))}")
+    path = spec.get("path")
+    if not isinstance(path, str) or not path:
+        raise ValueError(f"checks[{i}].path")
+    segments = parse_path(path) if path.startswith("$") else (path,)
+
+    if spec.get("exists", True) is False:
+        return JsonTarget(segments, EXISTS, lambda seen: None if seen is None else f"json unexpected path: {path}")
+
+    mode = EXISTS
+    tests: list[Callable[[Seen], str | None]] = []
+
+    if "type" in spec:
+        t = spec["type"]
+        if t not in JSON_TYPES:
+            raise ValueError(f"checks[{i}].type")
+        mode = max(mode, VALUE if t == "integer" else TYPE)
+        tests.append(
+            lambda seen: None
+            if (is_type(seen.value, t) if t == "integer" else seen.kind == t)
+            else f"json type mismatch at {path}: expected {t}, got {seen.kind}"
+        )
+
+    min_len, max_len = spec.get("min_len"), spec.get("max_len")
+    if min_len is not None or max_len is not None:
+        if not all(b is None or (isinstance(b, int) and not isinstance(b, bool)) for b in (min_len, max_len)):
+            raise ValueError(f"checks[{i}].min_len/max_len")
+        mode = max(mode, LENGTH)
+
+        def length_test(seen: Seen) -> str | None:
+            if seen.length is None:
+                return f"json length check at {path}: {seen.kind} has no length"
+            if (min_len is not None and seen.length < min_len) or (max_len is not None and seen.length > max_len):
+                return f"json length out of range at {path}: {seen.length}"
+            return None
+
+        tests.append(length_test)
+
+    if "equals" in spec:
+        expected = spec["equals"]
+        mode = VALUE
+        tests.append(lambda seen: None if seen.value == expected else f"json field mismatch: {path}")
+
+    if "schema" in spec:
+        validate = compile_schema(spec["schema"])
+        mode = VALUE
+
+        def schema_test(seen: Seen) -> str | None:
+            failure = validate(seen.value)
+            return None if failure is None else f"json schema violation at {path}{failure[0]}: {failure[1]}"
+
+        tests.append(schema_test)
+
+    def check(seen: Seen | None) -> str | None:
+        if seen is None:
+            return f"json missing path: {path}"
+        for test in tests:
+            message = test(seen)
+            if message is not None:
+                return message
+        return None
+
+    return JsonTarget(segments, mode, check)
@@ -1,6 +1,62 @@
-from typing import Any
+import math
+from typing import Any, Callable
 
 from ..models import ToolSchema
+from .schema import compile_schema, is_type
+
+# Fields capped by the suite's result budget rather than only by the schema.
+BUDGET_FIELDS = ("n_results",)
+
+# Keywords checked as-is (no repair) once a value has the right type.
+_CONSTRAINTS = ("minLength", "maxLength", "pattern", "minItems", "uniqueItems", "minProperties", "maxProperties")
+
+
+class Outcome:
+    __slots__ = ("repairs", "violations", "penalty")
+
+    def __init__(self) -> None:
+        self.repairs: list[dict[str, Any]] = []
+        self.violations: list[dict[str, Any]] = []
+        self.penalty = 0
+
+    def repair(self, repair: dict[str, Any], penalty: int) -> None:
+        self.repairs.append(repair)
+        self.penalty += penalty
+
+    def merge(self, other: "Outcome") -> None:
+        self.repairs.extend(other.repairs)
+        self.violations.extend(other.violations)
+        self.penalty += other.penalty
+
+
+# Takes (value, field path, outcome) and returns the value to send.
+Fixer = Callable[[Any, str, Outcome], Any]
+
+
+class ArgPolicy:
+    # A ToolSchema compiled once into per-field fixers; calling it repairs and
+    # scores one set of arguments without looking at the raw schema again.
+    def __init__(self, tool_schema: ToolSchema | None, *, budget_n_results_max: int) -> None:
+        self.tool_schema = tool_schema
+        self.budget_n_results_max = budget_n_results_max
+        self._object: ObjectFixer | None = None
+        if tool_schema is not None:
+            self._object = ObjectFixer(
+                tool_schema.properties,
+                tool_schema.required,
+                drop_unknown=True,
+                budget=budget_n_results_max,
+            )
+
+    def __call__(
+        self, original_args: dict[str, Any]
+    ) -> tuple[dict[str, Any], int, list[dict[str, Any]], list[dict[str, Any]]]:
+        if self._object is None:
+            violations = [{"type": "schema_missing", "message": "tool input schema not available; skip validation"}]
+            return dict(original_args), 60, [], violations
+        out = Outcome()
+        args_used = self._object.fix(dict(original_args), "", out)
+        return args_used, max(0, 100 - out.penalty), out.repairs, out.violations
 
 
 def repair_and_score_args(
@@ -9,117 +65,352 @@ def repair_and_score_args(
     *,
     budget_n_results_max: int,
 ) -> tuple[dict[str, Any], int, list[dict[str, Any]], list[dict[str, Any]]]:
-    args_used = dict(original_args)
-    repairs: list[dict[str, Any]] = []
-    violations: list[dict[str, Any]] = []
-    penalty = 0
-
-    if tool_schema is None:
-        violations.append(
-            {
-                "type": "schema_missing",
-                "message": "tool input schema not available; skip validation",
-            }
-        )
-        return args_used, 60, repairs, violations
-
-    allowed_keys = set(tool_schema.properties.keys())
-    unknown_keys = [k for k in list(args_used.keys()) if k not in allowed_keys]
-    for k in unknown_keys:
-        old = args_used.pop(k, None)
-        repairs.append({"type": "drop_unknown", "field": k, "from": old, "to": None})
-        penalty += 5
-
-    for name in tool_schema.required:
-        if name not in args_used or args_used.get(name) in (None, ""):
-            default_available = (
-                name in tool_schema.properties and "default" in tool_schema.properties[name]
-            )
-            if default_available:
-                default = tool_schema.properties[name].get("default")
-                args_used[name] = default
-                repairs.append({"type": "fill_required_default", "field": name, "to": default})
-                penalty += 10
+    return ArgPolicy(tool_schema, budget_n_results_max=budget_n_results_max)(original_args)
+
+
+class ObjectFixer:
+    def __init__(
+        self,
+        properties: dict[str, Any],
+        required: list[str],
+        *,
+        drop_unknown: bool,
+        budget: int | None = None,
+    ) -> None:
+        self.allowed = frozenset(properties)
+        self.drop_unknown = drop_unknown
+        self.required = [
+            (name, isinstance(properties.get(name), dict) and "default" in properties[name], properties.get(name))
+            for name in required
+        ]
+        self.fields: list[tuple[str, Fixer]] = []
+        for name, schema in properties.items():
+            if name in BUDGET_FIELDS and budget is not None:
+                fixer = compile_fixer(schema, budget)
             else:
-                violations.append(
-                    {
-                        "type": "missing_required",
-                        "field": name,
-                    }
-                )
-
-    if "n_results" in args_used:
+                fixer = compile_fixer(schema)
+                if fixer is not None and name not in required and isinstance(schema, dict) and "default" in schema:
+                    fixer = _null_default_fixer(schema, fixer)
+            if fixer is not None:
+                self.fields.append((name, fixer))
+
+    def fix(self, value: dict[str, Any], prefix: str, out: Outcome) -> dict[str, Any]:
+        # `value` is already a private copy.
+        if self.drop_unknown and not self.allowed.issuperset(value):
+            for k in [k for k in value if k not in self.allowed]:
+                old = value.pop(k, None)
+                out.repair({"type": "drop_unknown", "field": prefix + k, "from": old, "to": None}, 5)
+
+        missing: tuple[str, ...] = ()
+        for name, has_default, schema in self.required:
+            if name not in value or value.get(name) in (None, ""):
+                if has_default:
+                    value[name] = schema.get("default")
+                    out.repair({"type": "fill_required_default", "field": prefix + name, "to": value[name]}, 10)
+                else:
+                    out.violations.append({"type": "missing_required", "field": prefix + name})
+                    missing += (name,)
+
+        for name, fixer in self.fields:
+            # A field reported missing has nothing more to check, except the
+            # budget field, whose value is always parsed (null or "" is also a type_error).
+            if name in value and (name not in missing or name in BUDGET_FIELDS):
+                value[name] = fixer(value[name], prefix + name, out)
+        return value
+
+    def __call__(self, value: Any, field: str, out: Outcome) -> Any:
+        if not isinstance(value, dict):
+            out.violations.append({"type": "type_error", "field": field})
+            return value
+        return self.fix(dict(value), f"{field}.", out)
+
+
+def compile_fixer(schema: Any, budget: int | None = None) -> Fixer | None:
+    # None means there is nothing to check for this schema.
+    if not isinstance(schema, dict):
+        return None
+    if budget is not None:
+        return _number_fixer(schema, "integer", budget)
+    branches = schema.get("anyOf") or schema.get("oneOf")
+    if isinstance(branches, list) and branches:
+        return _union_fixer(branches)
+
+    t = schema.get("type")
+    if isinstance(t, list) and t:
+        return _union_fixer([{**schema, "type": x} for x in t])
+    if t in ("integer", "number"):
+        fixer = _number_fixer(schema, t)
+    elif t == "boolean":
+        fixer = _boolean_fixer()
+    elif t == "string":
+        fixer = _string_fixer()
+    elif t == "array":
+        fixer = _array_fixer(schema)
+    elif t == "object" and isinstance(schema.get("properties"), dict):
+        required = [r for r in schema.get("required") or [] if isinstance(r, str)]
+        fixer = ObjectFixer(
+            schema["properties"], required, drop_unknown=schema.get("additionalProperties") is False
+        )
+    elif t in ("object", "null"):
+        fixer = _type_fixer(t)
+    else:
+        fixer = None
+
+    if isinstance(schema.get("enum"), list) and t != "array":
+        fixer = _chain(fixer, _enum_fixer(schema))
+    constraints = {k: schema[k] for k in _CONSTRAINTS if k in schema}
+    if constraints:
+        fixer = _chain(fixer, _constraint_fixer(constraints))
+    return fixer
+
+
+def _chain(first: Fixer | None, then: Fixer) -> Fixer:
+    if first is None:
+        return then
+
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        checked = len(out.violations)
+        value = first(value, field, out)
+        # Later checks on a value that is already invalid would only repeat the violation.
+        return value if len(out.violations) > checked else then(value, field, out)
+
+    return fix
+
+
+def _null_default_fixer(schema: dict[str, Any], fixer: Fixer) -> Fixer:
+    # An optional argument sent as null where null is not allowed is treated
+    # as omitted, so the tool sees its declared default.
+    default = schema["default"]
+    trial = Outcome()
+    fixer(None, "", trial)
+    if not trial.violations:
+        return fixer
+
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        if value is None:
+            out.repair({"type": "fill_default", "field": field, "from": None, "to": default}, 5)
+            return default
+        return fixer(value, field, out)
+
+    return fix
+
+
+def _type_fixer(t: str) -> Fixer:
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        if not is_type(value, t):
+            out.violations.append({"type": "type_error", "field": field})
+        return value
+
+    return fix
+
+
+def _to_number(value: Any, t: str) -> int | float:
+    # Bools are not numbers, an integer must be integral, and NaN or infinity
+    # would slip past every bound since comparisons with them are false.
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError(value)
+    n = value
+    if isinstance(value, str):
         try:
-            n = int(args_used["n_results"])
-            if n < 1:
-                repairs.append({"type": "clip_min", "field": "n_results", "from": n, "to": 1})
-                args_used["n_results"] = 1
-                penalty += 10
-            if n > budget_n_results_max:
-                repairs.append(
-                    {
-                        "type": "clip_max_budget",
-                        "field": "n_results",
-                        "from": n,
-                        "to": budget_n_results_max,
-                    }
-                )
-                args_used["n_results"] = budget_n_results_max
-                penalty += 10
-        except Exception:
-            violations.append({"type": "type_error", "field": "n_results"})
-
-    if "output_formats" in args_used:
-        of = args_used.get("output_formats")
-        if isinstance(of, str):
-            normalized = [s.strip() for s in of.split(",") if s.strip()]
-            repairs.append({"type": "coerce_array", "field": "output_formats", "from": of, "to": normalized})
-            args_used["output_formats"] = normalized
-            penalty += 5
-        elif isinstance(of, list):
-            normalized = [x for x in of if isinstance(x, str) and x.strip()]
-            if normalized != of:
-                repairs.append({"type": "filter_array", "field": "output_formats", "from": of, "to": normalized})
-                args_used["output_formats"] = normalized
-                penalty += 5
-
-        prop = tool_schema.properties.get("output_formats")
-        if isinstance(prop, dict) and prop.get("type") == "array":
-            allowed = None
-            items = prop.get("items")
-            if isinstance(items, dict) and isinstance(items.get("enum"), list):
-                allowed = [x for x in items.get("enum") if isinstance(x, str)]
-            if allowed is not None and isinstance(args_used.get("output_formats"), list):
-                current = args_used["output_formats"]
-                filtered = [x for x in current if x in allowed]
-                if filtered != current:
-                    if filtered:
-                        repairs.append(
-                            {
-                                "type": "filter_enum",
-                                "field": "output_formats",
-                                "from": current,
-                                "to": filtered,
-                            }
-                        )
-                        args_used["output_formats"] = filtered
-                        penalty += 15
+            n = int(value) if t == "integer" else float(value)
+        except ValueError:
+            n = float(value)
+    if isinstance(n, float):
+        if not math.isfinite(n):
+            raise ValueError(value)
+        if t == "integer":
+            if not n.is_integer():
+                raise ValueError(value)
+            n = int(n)
+    return n
+
+
+def _number_fixer(schema: dict[str, Any], t: str, budget: int | None = None) -> Fixer:
+    # Budget fields keep the original checks: any value int() accepts passes
+    # and is only rewritten when clipped. Other fields are type-checked
+    # strictly and get numeric strings coerced, so enums and later checks
+    # see the number.
+    convert = int if budget is not None else lambda value: _to_number(value, t)
+    lo = schema.get("minimum") if is_type(schema.get("minimum"), "number") else None
+    hi = schema.get("maximum") if is_type(schema.get("maximum"), "number") else None
+    exclusive_lo = schema.get("exclusiveMinimum") if is_type(schema.get("exclusiveMinimum"), "number") else None
+    exclusive_hi = schema.get("exclusiveMaximum") if is_type(schema.get("exclusiveMaximum"), "number") else None
+    exclusive = None
+    if t == "integer":
+        # Exclusive integer bounds have an inclusive equivalent to clip to.
+        if exclusive_lo is not None:
+            lo = max(x for x in (lo, math.floor(exclusive_lo) + 1) if x is not None)
+        if exclusive_hi is not None:
+            hi = min(x for x in (hi, math.ceil(exclusive_hi) - 1) if x is not None)
+    elif exclusive_lo is not None or exclusive_hi is not None:
+        bounds = {"exclusiveMinimum": exclusive_lo, "exclusiveMaximum": exclusive_hi}
+        exclusive = compile_schema({k: v for k, v in bounds.items() if v is not None})
+    hi_type = "clip_max"
+    if budget is not None:
+        lo = 1 if lo is None else max(lo, 1)
+        if hi is None or budget <= hi:
+            hi, hi_type = budget, "clip_max_budget"
+
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        try:
+            n = convert(value)
+        except (TypeError, ValueError, OverflowError):
+            out.violations.append({"type": "type_error", "field": field})
+            return value
+        if lo is not None and n < lo:
+            out.repair({"type": "clip_min", "field": field, "from": n, "to": lo}, 10)
+            value = n = lo
+        elif hi is not None and n > hi:
+            out.repair({"type": hi_type, "field": field, "from": n, "to": hi}, 10)
+            value = n = hi
+        elif budget is None and isinstance(value, str):
+            out.repair({"type": "coerce_type", "field": field, "from": value, "to": n}, 5)
+            value = n
+        if exclusive is not None and exclusive(n) is not None:
+            out.violations.append({"type": "out_of_range", "field": field})
+        return value
+
+    return fix
+
+
+def _boolean_fixer() -> Fixer:
+    coercible = {"true": True, "false": False, "1": True, "0": False}
+
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        if isinstance(value, bool):
+            return value
+        to = None
+        if isinstance(value, str):
+            to = coercible.get(value.strip().lower())
+        elif is_type(value, "number") and value in (0, 1):
+            to = bool(value)
+        if to is None:
+            out.violations.append({"type": "type_error", "field": field})
+            return value
+        out.repair({"type": "coerce_type", "field": field, "from": value, "to": to}, 5)
+        return to
+
+    return fix
+
+
+def _string_fixer() -> Fixer:
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        if isinstance(value, str):
+            return value
+        if is_type(value, "number"):
+            to = str(value)
+            out.repair({"type": "coerce_type", "field": field, "from": value, "to": to}, 5)
+            return to
+        out.violations.append({"type": "type_error", "field": field})
+        return value
+
+    return fix
+
+
+def _enum_fixer(schema: dict[str, Any]) -> Fixer:
+    allowed = schema["enum"]
+    default = schema.get("default")
+    has_default = "default" in schema and default in allowed
+
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        if value in allowed:
+            return value
+        if has_default:
+            out.repair({"type": "fallback_default", "field": field, "from": value, "to": default}, 15)
+            return default
+        out.violations.append({"type": "invalid_enum", "field": field})
+        return value
+
+    return fix
+
+
+def _constraint_fixer(constraints: dict[str, Any]) -> Fixer:
+    try:
+        validate = compile_schema(constraints)
+    except ValueError:
+        validate = None
+
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        failure = validate(value) if validate is not None else None
+        if failure is not None:
+            out.violations.append({"type": "schema_violation", "field": field, "message": failure[1]})
+        return value
+
+    return fix
+
+
+def _array_fixer(schema: dict[str, Any]) -> Fixer:
+    items = schema.get("items") if isinstance(schema.get("items"), dict) else {}
+    enum = items.get("enum") if isinstance(items.get("enum"), list) else None
+    # Entries that are not non-empty strings are dropped unless the items are
+    # declared as some other type.
+    untyped = not any(k in items for k in ("type", "anyOf", "oneOf", "properties"))
+    strings = items.get("type") == "string" or (
+        all(isinstance(x, str) for x in enum) if enum is not None else untyped
+    )
+    item_fixer = None if strings or enum is not None else compile_fixer(items)
+    default = schema.get("default")
+    max_items = schema.get("maxItems") if is_type(schema.get("maxItems"), "integer") else None
+
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        if isinstance(value, str):
+            normalized = [s.strip() for s in value.split(",") if s.strip()]
+            out.repair({"type": "coerce_array", "field": field, "from": value, "to": normalized}, 5)
+            value = normalized
+        elif not isinstance(value, list):
+            out.violations.append({"type": "type_error", "field": field})
+            return value
+        elif strings and not all(isinstance(x, str) and x.strip() for x in value):
+            normalized = [x for x in value if isinstance(x, str) and x.strip()]
+            if normalized != value:
+                out.repair({"type": "filter_array", "field": field, "from": value, "to": normalized}, 5)
+                value = normalized
+
+        if enum is not None and not all(x in enum for x in value):
+            filtered = [x for x in value if x in enum]
+            if filtered != value:
+                if filtered:
+                    out.repair({"type": "filter_enum", "field": field, "from": value, "to": filtered}, 15)
+                    value = filtered
+                else:
+                    fallback = default if default else [enum[0]] if enum else None
+                    if fallback:
+                        out.repair({"type": "fallback_default", "field": field, "from": value, "to": fallback}, 15)
+                        value = fallback
                     else:
-                        default = prop.get("default")
-                        if not default and allowed:
-                            default = [allowed[0]]
-                        if default:
-                            repairs.append(
-                                {
-                                    "type": "fallback_default",
-                                    "field": "output_formats",
-                                    "from": current,
-                                    "to": default,
-                                }
-                            )
-                            args_used["output_formats"] = default
-                            penalty += 15
-                        else:
-                            violations.append({"type": "invalid_enum", "field": "output_formats"})
-
-    return args_used, max(0, 100 - penalty), repairs, violations
+                        out.violations.append({"type": "invalid_enum", "field": field})
+        elif item_fixer is not None:
+            fixed = [item_fixer(x, f"{field}[{i}]", out) for i, x in enumerate(value)]
+            value = fixed if any(a is not b for a, b in zip(fixed, value)) else value
+
+        if max_items is not None and len(value) > max_items:
+            out.repair({"type": "clip_max_items", "field": field, "from": value, "to": value[:max_items]}, 10)
+            value = value[:max_items]
+        return value
+
+    return fix
+
+
+def _union_fixer(branches: list[Any]) -> Fixer | None:
+    try:
+        validators = [compile_schema(b) for b in branches]
+    except ValueError:
+        return None
+    fixers = [compile_fixer(b) for b in branches]
+
+    def fix(value: Any, field: str, out: Outcome) -> Any:
+        if any(v(value) is None for v in validators):
+            return value
+        # Otherwise take the first branch that can repair the value cleanly.
+        for fixer in fixers:
+            if fixer is None:
+                continue
+            trial = Outcome()
+            repaired = fixer(value, field, trial)
+            if not trial.violations:
+                out.merge(trial)
+                return repaired
+        out.violations.append({"type": "type_error", "field": field})
+        return value
+
+    return fix
@@ -0,0 +1,207 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
+
+
+def transport_failed(e: BaseException) -> bool:
+    # McpError means the server answered and a timeout may just be a slow tool;
+    # anything else leaves the session's transport in an unknown state.
+    return not isinstance(e, (McpError, asyncio.TimeoutError))
+
+
+class PooledSession:
+    def __init__(self, server_url: str) -> None:
+        self.server_url = server_url
+        self.session: ClientSession | None = None
+        self.in_flight = 0
+        self.broken = False
+        self.last_used = time.monotonic()
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._error: BaseException | None = None
+        self._task: asyncio.Task | None = None
+        self.connect_ms = 0.0
+        self.initialize_ms = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and not self.broken and not self._closing.is_set()
+
+    @property
+    def pending(self) -> bool:
+        return self._task is not None and not self._ready.is_set()
+
+    def start(self, timeout_s: float) -> None:
+        # sse_client and ClientSession are anyio task-group scoped, so the
+        # connection lives in its own task for the lifetime of the pool.
+        self._task = asyncio.create_task(self._run(timeout_s))
+
+    async def wait_ready(self) -> None:
+        await self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self, timeout_s: float) -> None:
+        start = time.perf_counter()
+        try:
+            async with sse_client(self.server_url) as (read, write):
+                async with ClientSession(read, write) as session:
+                    connected = time.perf_counter()
+                    self.connect_ms = (connected - start) * 1000
+                    await asyncio.wait_for(session.initialize(), timeout=timeout_s)
+                    self.initialize_ms = (time.perf_counter() - connected) * 1000
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            if not self._ready.is_set():
+                self._error = e
+        finally:
+            self.broken = True
+            self._ready.set()
+
+    def begin(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def end(self) -> None:
+        self.in_flight -= 1
+        self.last_used = time.monotonic()
+        if self.in_flight <= 0:
+            self._idle.set()
+
+    async def ping(self, timeout_s: float) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout_s)
+            return True
+        except Exception:
+            self.broken = True
+            return False
+
+    async def close(self, drain_timeout_s: float | None = None) -> None:
+        if drain_timeout_s is not None:
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout_s)
+            except asyncio.TimeoutError:
+                pass
+        self._closing.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=5.0)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+            try:
+                await self._task
+            except BaseException:
+                pass
+
+
+class SessionPool:
+    def __init__(
+        self,
+        *,
+        size: int = 1,
+        timeout_s: float = 20.0,
+        health_check_interval_s: float = 30.0,
+        drain_timeout_s: float = 30.0,
+    ) -> None:
+        self.size = max(1, size)
+        self.timeout_s = timeout_s
+        self.health_check_interval_s = health_check_interval_s
+        self.drain_timeout_s = drain_timeout_s
+        self.connects = 0
+        self.reconnects = 0
+        self._sessions: dict[str, list[PooledSession]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._retiring: set[asyncio.Task] = set()
+        self._closed = False
+
+    def _retire(self, pooled: PooledSession) -> None:
+        task = asyncio.create_task(pooled.close())
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def _checkout(self, server_url: str) -> tuple[PooledSession, bool]:
+        if self._closed:
+            raise RuntimeError("session pool is closed")
+        lock = self._locks.setdefault(server_url, asyncio.Lock())
+        async with lock:
+            sessions = self._sessions.setdefault(server_url, [])
+            for s in [s for s in sessions if not s.alive and not s.pending]:
+                sessions.remove(s)
+                self.reconnects += 1
+                self._retire(s)
+
+            candidate = min(sessions, key=lambda s: s.in_flight, default=None)
+            while candidate is not None and candidate.in_flight == 0:
+                idle_s = time.monotonic() - candidate.last_used
+                if idle_s < self.health_check_interval_s or await candidate.ping(self.timeout_s):
+                    break
+                sessions.remove(candidate)
+                self.reconnects += 1
+                self._retire(candidate)
+                candidate = min(sessions, key=lambda s: s.in_flight, default=None)
+
+            # Multiplex onto an existing session unless a fresh slot is free.
+            # A fresh session only reserves its slot here; the handshake runs
+            # after the lock is released, so other callers are not held up by it.
+            fresh = candidate is None or (candidate.in_flight > 0 and len(sessions) < self.size)
+            if fresh:
+                candidate = PooledSession(server_url)
+                candidate.start(self.timeout_s)
+                sessions.append(candidate)
+            candidate.begin()
+
+        try:
+            # Callers multiplexed onto a session still connecting wait for it too.
+            await candidate.wait_ready()
+        except BaseException:
+            candidate.end()
+            # A failed handshake leaves nothing to retire or count as a reconnect.
+            if not candidate.alive and not candidate.pending and candidate in sessions:
+                sessions.remove(candidate)
+            raise
+        if fresh:
+            self.connects += 1
+        return candidate, fresh
+
+    @asynccontextmanager
+    async def session(
+        self, server_url: str, phases: dict[str, float] | None = None
+    ) -> AsyncIterator[ClientSession]:
+        start = time.perf_counter()
+        pooled, fresh = await self._checkout(server_url)
+        if phases is not None:
+            # Checkout time is lock wait + health check (+ handshake for a fresh session).
+            waited_ms = (time.perf_counter() - start) * 1000
+            initialize_ms = pooled.initialize_ms if fresh else 0.0
+            phases["connect"] = round(waited_ms - initialize_ms, 3)
+            phases["initialize"] = round(initialize_ms, 3)
+        try:
+            yield pooled.session
+        except Exception as e:
+            if transport_failed(e):
+                pooled.broken = True
+            raise
+        finally:
+            pooled.end()
+
+    async def drain(self) -> None:
+        self._closed = True
+        sessions = [s for group in self._sessions.values() for s in group]
+        self._sessions.clear()
+        await asyncio.gather(
+            *(s.close(drain_timeout_s=self.drain_timeout_s) for s in sessions),
+            *self._retiring,
+            return_exceptions=True,
+        )
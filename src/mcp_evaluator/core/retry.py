@@ -0,0 +1,182 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Any, Awaitable, Callable, TypeVar
+
+from ..utils.histogram import LatencyHistogram
+
+T = TypeVar("T")
+
+# Matched against the class names in the exception's MRO, so "TransportError"
+# covers every httpx transport failure without importing httpx here.
+DEFAULT_RETRY_ON = (
+    "TimeoutError",
+    "ConnectionError",
+    "TransportError",
+    "ClosedResourceError",
+    "BrokenResourceError",
+    "EndOfStream",
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 1
+    retry_on: tuple[str, ...] = DEFAULT_RETRY_ON
+    base_delay_s: float = 0.2
+    max_delay_s: float = 5.0
+    multiplier: float = 2.0
+    hedge: bool = False
+    hedge_quantile: float = 95.0
+    hedge_min_samples: int = 20
+
+    def updated(self, raw: dict[str, Any]) -> "RetryPolicy":
+        names = {f.name for f in fields(self)}
+        unknown = set(raw) - names
+        if unknown:
+            raise ValueError(f"unknown retry settings: {', '.join(sorted(unknown))}")
+        values = dict(raw)
+        if "retry_on" in values:
+            values["retry_on"] = tuple(values["retry_on"])
+        policy = replace(self, **values)
+        if policy.max_attempts < 1:
+            raise ValueError("retry max_attempts must be at least 1")
+        return policy
+
+    def retryable(self, e: BaseException) -> bool:
+        if isinstance(e, BaseExceptionGroup):
+            return all(self.retryable(x) for x in e.exceptions)
+        return any(k.__name__ in self.retry_on for k in type(e).__mro__)
+
+    def backoff_s(self, attempt: int, rng: random.Random) -> float:
+        # Full jitter: spreads the retries of cases that failed together.
+        cap = min(self.max_delay_s, self.base_delay_s * self.multiplier ** (attempt - 1))
+        return rng.uniform(0, cap)
+
+
+class RetryPolicies:
+    # Suite-wide default plus per-tool overrides; also tracks each tool's
+    # observed call latency, which is what the hedge delay is derived from.
+    def __init__(
+        self,
+        default: RetryPolicy | None = None,
+        tools: dict[str, RetryPolicy] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.default = default or RetryPolicy()
+        self.tools = tools or {}
+        self.rng = random.Random(seed)
+        self.latency: dict[tuple[str, str], LatencyHistogram] = {}
+
+    @classmethod
+    def from_config(cls, raw: Any) -> "RetryPolicies":
+        if not isinstance(raw, dict):
+            return cls()
+        raw = dict(raw)
+        tools = raw.pop("tools", None) or {}
+        if not isinstance(tools, dict):
+            raise ValueError("retry.tools must be an object")
+        default = RetryPolicy().updated(raw)
+        return cls(default, {name: default.updated(cfg) for name, cfg in tools.items()})
+
+    def for_tool(self, tool_name: str) -> RetryPolicy:
+        return self.tools.get(tool_name, self.default)
+
+    def observe(self, server_url: str, tool_name: str, latency_ms: float) -> None:
+        self.latency.setdefault((server_url, tool_name), LatencyHistogram()).record(latency_ms)
+
+    def hedge_delay_s(self, server_url: str, tool_name: str) -> float | None:
+        policy = self.for_tool(tool_name)
+        hist = self.latency.get((server_url, tool_name))
+        if not policy.hedge or hist is None or hist.count < policy.hedge_min_samples:
+            return None
+        return hist.percentile(policy.hedge_quantile) / 1000
+
+
+class AttemptLog:
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.hedged = False
+        self.hedge_won = False
+
+
+async def call_with_retry(
+    call: Callable[[dict[str, float]], Awaitable[T]],
+    policy: RetryPolicy,
+    *,
+    rng: random.Random,
+    phases: dict[str, float],
+    log: AttemptLog,
+    hedge_after_s: float | None = None,
+) -> T:
+    # Each request gets its own phases dict; the one that decided the round is
+    # merged into `phases`, and time lost to failed rounds and backoff is
+    # reported as the "retry" phase.
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        attempt += 1
+        round_start = time.perf_counter()
+        used: dict[str, float] = {}
+        try:
+            result = await _hedged(call, hedge_after_s, log, used)
+        except Exception as e:
+            if attempt < policy.max_attempts and policy.retryable(e):
+                await asyncio.sleep(policy.backoff_s(attempt, rng))
+                continue
+            _merge(phases, used, attempt, round_start - start)
+            raise
+        _merge(phases, used, attempt, round_start - start)
+        if log.hedged:
+            # A hedged round lasts from the first request to the winning reply.
+            phases["call"] = round((time.perf_counter() - round_start) * 1000, 3)
+        return result
+
+
+def _merge(phases: dict[str, float], used: dict[str, float], attempt: int, retry_s: float) -> None:
+    phases.update(used)
+    if attempt > 1:
+        phases["retry"] = round(retry_s * 1000, 3)
+
+
+async def _hedged(
+    call: Callable[[dict[str, float]], Awaitable[T]],
+    hedge_after_s: float | None,
+    log: AttemptLog,
+    used: dict[str, float],
+) -> T:
+    own: dict[asyncio.Future, dict[str, float]] = {}
+
+    def launch() -> asyncio.Future:
+        log.attempts += 1
+        phases: dict[str, float] = {}
+        task = asyncio.ensure_future(call(phases))
+        own[task] = phases
+        return task
+
+    primary = launch()
+    tasks = {primary}
+    try:
+        if hedge_after_s is not None:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after_s)
+            if not done:
+                log.hedged = True
+                tasks.add(launch())
+        first_error: BaseException | None = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: t is not primary):
+                if task.exception() is None:
+                    used.update(own[task])
+                    log.hedge_won = task is not primary
+                    return task.result()
+                if first_error is None:
+                    first_error = task.exception()
+                    used.update(own[task])
+        raise first_error
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,303 @@
+import asyncio
+import multiprocessing
+import queue as queue_module
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterable
+
+from ..models import CaseResult, SuiteCase, ToolCall
+from .blobs import BlobStore
+from .cache import ResultCache
+from .cassette import Cassette
+from .catalog import ToolCatalog
+from .mcp import run_one_case
+from .oracle import OracleCache
+from .pool import SessionPool
+from .retry import RetryPolicies
+from .scheduler import Scheduler
+from .steps import run_steps_case
+
+
+async def run_case(
+    server_url: str,
+    case: SuiteCase,
+    timeout_s: float,
+    *,
+    catalog: ToolCatalog,
+    budget_n_results_max: int,
+    **options: Any,
+) -> CaseResult:
+    if case.steps is not None:
+        policies = {
+            s.tool_name: await catalog.get_policy(server_url, s.tool_name, budget_n_results_max) for s in case.steps
+        }
+        return await run_steps_case(
+            server_url, case, timeout_s, policies=policies, budget_n_results_max=budget_n_results_max, **options
+        )
+    policy = await catalog.get_policy(server_url, case.tool_name, budget_n_results_max)
+    return await run_one_case(
+        server_url,
+        ToolCall(tool_name=case.tool_name, args=case.args),
+        timeout_s,
+        tool_schema=policy.tool_schema,
+        arg_policy=policy,
+        budget_n_results_max=budget_n_results_max,
+        case_id=case.case_id,
+        expect=case.expect,
+        **options,
+    )
+
+
+async def run_cases(
+    server_url: str,
+    cases: Iterable[SuiteCase],
+    timeout_s: float,
+    *,
+    scheduler: Scheduler,
+    catalog: ToolCatalog,
+    on_result: Callable[[dict[str, Any]], None],
+    **options: Any,
+) -> None:
+    async def run_scheduled(c: SuiteCase) -> None:
+        unstarted.discard(asyncio.current_task())
+        try:
+            result = await run_case(server_url, c, timeout_s, catalog=catalog, **options)
+        finally:
+            await scheduler.release(server_url)
+        scheduler.observe(server_url, result)
+        on_result(asdict(result))
+
+    # A slot is taken before each task is spawned, so only the in-flight
+    # cases are ever held in memory; finished ones go straight to on_result.
+    pending: set[asyncio.Task] = set()
+    unstarted: set[asyncio.Task] = set()
+    try:
+        for c in cases:
+            await scheduler.acquire(server_url)
+            task = asyncio.create_task(run_scheduled(c))
+            unstarted.add(task)
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            failed = next((t for t in list(pending) if t.done() and t.exception()), None)
+            if failed is not None:
+                failed.result()
+        while pending:
+            await asyncio.gather(*list(pending))
+    finally:
+        for task in list(pending):
+            task.cancel()
+        await asyncio.gather(*list(pending), return_exceptions=True)
+        # A task cancelled before it started never reaches its own release.
+        for _ in range(len(unstarted)):
+            await scheduler.release(server_url)
+
+
+@dataclass
+class ShardConfig:
+    # Everything a worker process needs to rebuild the suite's runtime; must pickle.
+    server_url: str
+    timeout_s: float
+    budget_n_results_max: int
+    threads: int
+    pool_size: int
+    health_check_interval_s: float
+    limiter: dict[str, Any] = field(default_factory=dict)
+    max_concurrency: int | None = None
+    mode: str = "live"
+    cassette_path: str | None = None
+    cache: dict[str, Any] | None = None
+    oracle_max_bytes: int | None = None
+    blob_root: str | None = None
+    blob_threshold_bytes: int = 0
+    retry: dict[str, Any] | None = None
+
+
+def split_evenly(total: int, parts: int) -> list[int]:
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def shard_cases(cases: list[SuiteCase], workers: int) -> list[list[SuiteCase]]:
+    # Round-robin rather than contiguous, so slow tools clustered in the case
+    # file are spread over every worker.
+    return [s for s in (cases[i::workers] for i in range(workers)) if s]
+
+
+def shard_configs(config: ShardConfig, workers: int) -> list[ShardConfig]:
+    # The suite's concurrency budget is divided, not multiplied, by the workers.
+    configs: list[ShardConfig] = []
+    threads = split_evenly(config.threads, workers)
+    cap = split_evenly(config.max_concurrency, workers) if config.max_concurrency else [None] * workers
+    for i in range(workers):
+        limiter = dict(config.limiter)
+        if "max_limit" in limiter:
+            limiter["max_limit"] = max(1, split_evenly(int(limiter["max_limit"]), workers)[i])
+        if "min_limit" in limiter:
+            limiter["min_limit"] = max(1, split_evenly(int(limiter["min_limit"]), workers)[i])
+        configs.append(
+            ShardConfig(
+                **{
+                    **asdict(config),
+                    "threads": max(1, threads[i]),
+                    "limiter": limiter,
+                    "max_concurrency": max(1, cap[i]) if cap[i] is not None else None,
+                }
+            )
+        )
+    return configs
+
+
+async def run_shard(
+    config: ShardConfig, cases: Iterable[SuiteCase], on_result: Callable[[dict[str, Any]], None]
+) -> dict[str, Any]:
+    pool = SessionPool(
+        size=config.pool_size,
+        timeout_s=config.timeout_s,
+        health_check_interval_s=config.health_check_interval_s,
+    )
+    catalog = ToolCatalog(timeout_s=config.timeout_s, pool=pool)
+    scheduler = Scheduler(config.max_concurrency)
+    limiter = scheduler.register(config.server_url, config.threads, **config.limiter)
+    cassette: Cassette | None = None
+    if config.mode == "replay":
+        cassette = Cassette.load(config.cassette_path)
+        catalog.preload(config.server_url, cassette.tools or [])
+    elif config.mode == "record":
+        # Only this worker's calls; the parent merges them into the suite cassette.
+        cassette = Cassette(config.cassette_path)
+    cache = ResultCache(**config.cache) if config.cache is not None else None
+    blobs = (
+        BlobStore(config.blob_root, threshold_bytes=config.blob_threshold_bytes) if config.blob_root else None
+    )
+    try:
+        await run_cases(
+            config.server_url,
+            cases,
+            config.timeout_s,
+            scheduler=scheduler,
+            catalog=catalog,
+            on_result=on_result,
+            budget_n_results_max=config.budget_n_results_max,
+            pool=pool,
+            mode=config.mode,
+            cassette=cassette,
+            cache=cache,
+            oracle_max_bytes=config.oracle_max_bytes,
+            oracles=OracleCache(),
+            blobs=blobs,
+            retry=RetryPolicies.from_config(config.retry) if config.retry is not None else None,
+        )
+    finally:
+        await pool.drain()
+        if cache is not None:
+            cache.close()
+    return {
+        "connections": pool.connects,
+        "reconnects": pool.reconnects,
+        "concurrency": limiter.snapshot(),
+        "cache": cache.stats() if cache is not None else None,
+        "blobs": blobs.stats() if blobs is not None else None,
+        "calls": cassette.calls if config.mode == "record" else None,
+        "tools": catalog.raw_tools.get(config.server_url),
+    }
+
+
+def _shard_main(index: int, config: ShardConfig, cases: Iterable[SuiteCase], results: Any) -> None:
+    try:
+        stats = asyncio.run(run_shard(config, cases, lambda record: results.put(("result", index, record))))
+        results.put(("done", index, stats))
+    except BaseException as e:
+        results.put(("error", index, f"{type(e).__name__}: {e}"))
+
+
+def _drain(results: Any, timeout_s: float, limit: int = 256) -> list[tuple[str, int, Any]]:
+    # One blocking get, then whatever else is already queued, so the parent
+    # pays one thread hop per batch instead of per result.
+    batch = [results.get(True, timeout_s)]
+    try:
+        while len(batch) < limit:
+            batch.append(results.get_nowait())
+    except queue_module.Empty:
+        pass
+    return batch
+
+
+async def run_sharded(
+    configs: list[ShardConfig],
+    shards: list[Iterable[SuiteCase]],
+    on_result: Callable[[dict[str, Any]], None],
+) -> list[dict[str, Any]]:
+    # Spawned, not forked: the parent already runs an event loop and threads.
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_shard_main, args=(i, config, shard, results), daemon=True)
+        for i, (config, shard) in enumerate(zip(configs, shards))
+    ]
+    for p in procs:
+        p.start()
+    stats: dict[int, dict[str, Any]] = {}
+    suspects: set[int] = set()
+    try:
+        while len(stats) < len(procs):
+            try:
+                batch = await asyncio.to_thread(_drain, results, 0.5)
+            except queue_module.Empty:
+                # A worker that died without reporting is only declared lost after
+                # a second empty poll, so its final messages can still arrive.
+                dead = {i for i, p in enumerate(procs) if i not in stats and not p.is_alive()}
+                lost = dead & suspects
+                if lost:
+                    i = min(lost)
+                    raise RuntimeError(f"worker {i} exited with code {procs[i].exitcode}")
+                suspects = dead
+                continue
+            for kind, index, payload in batch:
+                if kind == "result":
+                    on_result(payload)
+                elif kind == "done":
+                    stats[index] = payload
+                else:
+                    raise RuntimeError(f"worker {index} failed: {payload}")
+    finally:
+        for p in procs:
+            if len(stats) < len(procs) and p.is_alive():
+                p.terminate()
+            p.join(5)
+            if p.is_alive():
+                p.kill()
+                p.join()
+    return [stats[i] for i in range(len(procs))]
+
+
+def merge_shard_stats(stats: list[dict[str, Any]]) -> dict[str, Any]:
+    snapshots = [s["concurrency"] for s in stats]
+    merged: dict[str, Any] = {
+        "connections": sum(s["connections"] for s in stats),
+        "reconnects": sum(s["reconnects"] for s in stats),
+        "concurrency": {
+            "mode": snapshots[0]["mode"],
+            "initial": sum(c["initial"] for c in snapshots),
+            "final": sum(c["final"] for c in snapshots),
+            "max": sum(c["max"] for c in snapshots),
+            "peak_in_flight": sum(c["peak_in_flight"] for c in snapshots),
+            "trajectory": [],
+            "workers": snapshots,
+        },
+        "tools": next((s["tools"] for s in stats if s["tools"] is not None), None),
+        "calls": {k: v for s in stats for k, v in (s["calls"] or {}).items()},
+    }
+    caches = [s["cache"] for s in stats if s["cache"] is not None]
+    if caches:
+        hits = sum(c["hits"] for c in caches)
+        misses = sum(c["misses"] for c in caches)
+        merged["cache"] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "evictions": sum(c["evictions"] for c in caches),
+            # Every worker shares one database; the latest view is the closest.
+            "bytes": max(c["bytes"] for c in caches),
+        }
+    blob_stats = [s["blobs"] for s in stats if s["blobs"] is not None]
+    if blob_stats:
+        merged["blobs"] = {k: sum(b[k] for b in blob_stats) for k in blob_stats[0]}
+    return merged
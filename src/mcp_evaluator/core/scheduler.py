@@ -0,0 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from ..models import CaseResult
+from .limiter import AdaptiveLimiter
+
+
+class Scheduler:
+    def __init__(self, max_concurrency: int | None = None) -> None:
+        self.max_concurrency = max_concurrency if max_concurrency and max_concurrency > 0 else None
+        self._global = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        self.limiters: dict[str, AdaptiveLimiter] = {}
+
+    def register(self, server_url: str, limit: int, **options: Any) -> AdaptiveLimiter:
+        # Suites sharing a server share its limiter; the first suite to register configures it.
+        if server_url not in self.limiters:
+            self.limiters[server_url] = AdaptiveLimiter(max(1, limit), **options)
+        return self.limiters[server_url]
+
+    def observe(self, server_url: str, result: CaseResult) -> None:
+        limiter = self.limiters.get(server_url)
+        if limiter is None or result.cached or result.error == "policy_violation":
+            return
+        error = result.error
+        limiter.observe(
+            result.latency_ms,
+            error=error is not None,
+            timeout=error is not None and error.startswith("TimeoutError"),
+        )
+
+    async def acquire(self, server_url: str) -> None:
+        limiter = self.limiters.get(server_url) or self.register(server_url, 1)
+        # Take the per-server slot first so a busy server never pins global slots.
+        await limiter.acquire()
+        if self._global is not None:
+            try:
+                await self._global.acquire()
+            except BaseException:
+                await limiter.release()
+                raise
+
+    async def release(self, server_url: str) -> None:
+        if self._global is not None:
+            self._global.release()
+        await self.limiters[server_url].release()
+
+    @asynccontextmanager
+    async def slot(self, server_url: str) -> AsyncIterator[None]:
+        await self.acquire(server_url)
+        try:
+            yield
+        finally:
+            await self.release(server_url)
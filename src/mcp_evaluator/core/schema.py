@@ -0,0 +1,185 @@
+import re
+from typing import Any, Callable
+
+# Returns None when the value conforms, else (relative path, reason).
+Validator = Callable[[Any], tuple[str, str] | None]
+
+JSON_TYPES = ("object", "array", "string", "number", "integer", "boolean", "null")
+
+
+def is_type(value: Any, t: str) -> bool:
+    if t == "object":
+        return isinstance(value, dict)
+    if t == "array":
+        return isinstance(value, list)
+    if t == "string":
+        return isinstance(value, str)
+    if t == "boolean":
+        return isinstance(value, bool)
+    if t == "null":
+        return value is None
+    if isinstance(value, bool):
+        return False
+    if t == "integer":
+        return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+    if t == "number":
+        return isinstance(value, (int, float))
+    return False
+
+
+def compile_schema(schema: Any) -> Validator:
+    # Compiles the commonly used subset of JSON Schema into nested closures;
+    # unknown keywords are ignored, as JSON Schema itself does.
+    if schema is True or schema == {}:
+        return lambda value: None
+    if schema is False:
+        return lambda value: ("", "no value allowed")
+    if not isinstance(schema, dict):
+        raise ValueError("schema must be an object")
+
+    checks: list[Validator] = []
+
+    types = schema.get("type")
+    if types is not None:
+        types = [types] if isinstance(types, str) else types
+        if not isinstance(types, list) or not all(t in JSON_TYPES for t in types):
+            raise ValueError(f"invalid schema type: {schema.get('type')}")
+        expected = " | ".join(types)
+        checks.append(
+            lambda v, types=types, expected=expected: None
+            if any(is_type(v, t) for t in types)
+            else ("", f"expected {expected}")
+        )
+
+    if "enum" in schema:
+        enum = schema["enum"]
+        if not isinstance(enum, list):
+            raise ValueError("schema enum must be a list")
+        checks.append(lambda v, enum=enum: None if v in enum else ("", f"not one of {enum}"))
+    if "const" in schema:
+        const = schema["const"]
+        checks.append(lambda v, const=const: None if v == const else ("", f"expected {const!r}"))
+
+    for key, fits, measure in (
+        ("minLength", lambda n, b: n >= b, lambda v: len(v) if isinstance(v, str) else None),
+        ("maxLength", lambda n, b: n <= b, lambda v: len(v) if isinstance(v, str) else None),
+        ("minItems", lambda n, b: n >= b, lambda v: len(v) if isinstance(v, list) else None),
+        ("maxItems", lambda n, b: n <= b, lambda v: len(v) if isinstance(v, list) else None),
+        ("minProperties", lambda n, b: n >= b, lambda v: len(v) if isinstance(v, dict) else None),
+        ("maxProperties", lambda n, b: n <= b, lambda v: len(v) if isinstance(v, dict) else None),
+        ("minimum", lambda n, b: n >= b, lambda v: v if is_type(v, "number") else None),
+        ("maximum", lambda n, b: n <= b, lambda v: v if is_type(v, "number") else None),
+        ("exclusiveMinimum", lambda n, b: n > b, lambda v: v if is_type(v, "number") else None),
+        ("exclusiveMaximum", lambda n, b: n < b, lambda v: v if is_type(v, "number") else None),
+    ):
+        if key in schema:
+            bound = schema[key]
+            if not is_type(bound, "number"):
+                raise ValueError(f"schema {key} must be a number")
+            checks.append(
+                lambda v, key=key, bound=bound, fits=fits, measure=measure: None
+                if (n := measure(v)) is None or fits(n, bound)
+                else ("", f"{key} {bound} violated ({n})")
+            )
+
+    if "pattern" in schema:
+        try:
+            pattern = re.compile(schema["pattern"])
+        except (re.error, TypeError) as e:
+            raise ValueError(f"invalid schema pattern: {e}") from None
+        checks.append(
+            lambda v, pattern=pattern: None
+            if not isinstance(v, str) or pattern.search(v)
+            else ("", f"does not match {pattern.pattern!r}")
+        )
+
+    required = schema.get("required")
+    if required is not None:
+        if not isinstance(required, list) or not all(isinstance(k, str) for k in required):
+            raise ValueError("schema required must be a list of strings")
+        checks.append(
+            lambda v, required=required: next(
+                ((f".{k}", "required property missing") for k in required if isinstance(v, dict) and k not in v),
+                None,
+            )
+        )
+
+    properties = schema.get("properties")
+    if properties is not None:
+        if not isinstance(properties, dict):
+            raise ValueError("schema properties must be an object")
+        compiled = {k: compile_schema(sub) for k, sub in properties.items()}
+        checks.append(lambda v, compiled=compiled: _check_properties(v, compiled))
+
+    additional = schema.get("additionalProperties")
+    if additional is not None and additional is not True:
+        known = set(properties or {})
+        sub = compile_schema(additional)
+        checks.append(lambda v, known=known, sub=sub: _check_additional(v, known, sub))
+
+    if "items" in schema:
+        sub = compile_schema(schema["items"])
+        checks.append(lambda v, sub=sub: _check_items(v, sub))
+
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = schema[key]
+            if not isinstance(options, list) or not options:
+                raise ValueError(f"schema {key} must be a non-empty list")
+            checks.append(_combinator(key, [compile_schema(o) for o in options]))
+
+    def validate(value: Any) -> tuple[str, str] | None:
+        for check in checks:
+            failure = check(value)
+            if failure is not None:
+                return failure
+        return None
+
+    return validate
+
+
+def _check_properties(value: Any, compiled: dict[str, Validator]) -> tuple[str, str] | None:
+    if not isinstance(value, dict):
+        return None
+    for k, sub in compiled.items():
+        if k in value:
+            failure = sub(value[k])
+            if failure is not None:
+                return f".{k}{failure[0]}", failure[1]
+    return None
+
+
+def _check_additional(value: Any, known: set[str], sub: Validator) -> tuple[str, str] | None:
+    if not isinstance(value, dict):
+        return None
+    for k, item in value.items():
+        if k not in known:
+            failure = sub(item)
+            if failure is not None:
+                return f".{k}{failure[0]}", "additional property not allowed" if failure[1] == "no value allowed" else failure[1]
+    return None
+
+
+def _check_items(value: Any, sub: Validator) -> tuple[str, str] | None:
+    if not isinstance(value, list):
+        return None
+    for i, item in enumerate(value):
+        failure = sub(item)
+        if failure is not None:
+            return f"[{i}]{failure[0]}", failure[1]
+    return None
+
+
+def _combinator(key: str, options: list[Validator]) -> Validator:
+    def check(value: Any) -> tuple[str, str] | None:
+        failures = [o(value) for o in options]
+        passed = sum(1 for f in failures if f is None)
+        if key == "allOf":
+            return next((f for f in failures if f is not None), None)
+        if key == "anyOf" and passed == 0:
+            return "", f"matches none of anyOf ({failures[0][1]})"
+        if key == "oneOf" and passed != 1:
+            return "", f"matches {passed} of oneOf"
+        return None
+
+    return check
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import time
+from dataclasses import asdict, replace
+from typing import Any
+
+from ..models import CaseResult, SuiteCase, SuiteStep, ToolCall
+from ..utils.suite import REFERENCE
+from .blobs import BlobStore
+from .cache import ResultCache
+from .cassette import Cassette, canonical_json
+from .jsonstream import MISSING, parse_path, resolve_path
+from .mcp import ChainSession, run_one_case
+from .oracle import DEFAULT_ORACLE_MAX_BYTES, OracleCache
+from .policy import ArgPolicy
+from .pool import SessionPool
+from .retry import RetryPolicies
+
+SEQUENCE_PENALTY = 10
+
+
+class StepReferenceError(ValueError):
+    pass
+
+
+class StepOutputs:
+    # Outputs of finished steps; a step's JSON is parsed once, on first use.
+    def __init__(self, blobs: BlobStore | None = None) -> None:
+        self.blobs = blobs
+        self.texts: dict[str, str | None] = {}
+        self._parsed: dict[str, Any] = {}
+
+    def add(self, step_id: str, result: CaseResult) -> None:
+        if result.output_blob is not None and self.blobs is not None:
+            self.texts[step_id] = self.blobs.get(result.output_blob)
+        else:
+            self.texts[step_id] = result.output_text
+
+    def lookup(self, step_id: str, path: str | None) -> Any:
+        text = self.texts.get(step_id)
+        if text is None:
+            raise StepReferenceError(f"step {step_id} has no output")
+        if path is None:
+            return text
+        if step_id not in self._parsed:
+            try:
+                self._parsed[step_id] = json.loads(text)
+            except json.JSONDecodeError:
+                raise StepReferenceError(f"step {step_id} output is not json") from None
+        try:
+            value = resolve_path(self._parsed[step_id], parse_path(path))
+        except ValueError as e:
+            raise StepReferenceError(str(e)) from None
+        if value is MISSING:
+            raise StepReferenceError(f"{path} not found in step {step_id} output")
+        return value
+
+
+def resolve_args(value: Any, outputs: StepOutputs) -> Any:
+    # A reference that is the whole string keeps the referenced value's type;
+    # one embedded in a longer string is interpolated as text.
+    if isinstance(value, str):
+        m = REFERENCE.fullmatch(value)
+        if m:
+            return outputs.lookup(m.group(1), m.group(2))
+        return REFERENCE.sub(lambda m: _as_text(outputs.lookup(m.group(1), m.group(2))), value)
+    if isinstance(value, dict):
+        return {k: resolve_args(v, outputs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_args(v, outputs) for v in value]
+    return value
+
+
+def _as_text(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def sequence_issues(calls: list[tuple[str, str, bool]], sequence: dict[str, Any] | None) -> list[dict[str, Any]]:
+    # calls are (tool_name, canonical args, polled); deliberate polls are not repeats.
+    opts = sequence or {}
+    keys = [(tool, args) for tool, args, polled in calls if not polled]
+    issues: list[dict[str, Any]] = []
+    if not opts.get("allow_repeats", False):
+        for i in range(1, len(keys)):
+            if keys[i] == keys[i - 1]:
+                issues.append({"type": "adjacent_repeat", "at": i, "tool_name": keys[i][0]})
+    if not opts.get("allow_loops", False):
+        for period in range(2, len(keys) // 2 + 1):
+            for i in range(len(keys) - 2 * period + 1):
+                window = keys[i : i + period]
+                if len(set(window)) > 1 and window == keys[i + period : i + 2 * period]:
+                    issues.append({"type": "loop", "at": i + period, "period": period, "tools": [k[0] for k in window]})
+                    break
+    max_calls = opts.get("max_calls")
+    if isinstance(max_calls, int) and len(calls) > max_calls:
+        issues.append({"type": "too_many_calls", "calls": len(calls), "max": max_calls})
+    return issues
+
+
+def _add_phases(into: dict[str, float], phases: dict[str, float]) -> None:
+    for phase, ms in phases.items():
+        into[phase] = round(into.get(phase, 0.0) + ms, 3)
+
+
+async def _run_step(
+    server_url: str,
+    case_id: str,
+    step: SuiteStep,
+    args: dict[str, Any],
+    timeout_s: float,
+    calls: list[tuple[str, str, bool]],
+    **options: Any,
+) -> tuple[CaseResult, int]:
+    poll = step.poll or {}
+    max_attempts = max(1, int(poll.get("max_attempts", 1)))
+    interval_s = float(poll.get("interval_s", 1.0))
+    if step.poll is not None:
+        # A polled status must be fetched fresh every time.
+        options["cache"] = None
+    # Earlier polls and the waits between them are part of what the step cost.
+    spent_ms = 0
+    attempts = 0
+    phases: dict[str, float] = {}
+    for n in range(1, max_attempts + 1):
+        result = await run_one_case(
+            server_url,
+            ToolCall(tool_name=step.tool_name, args=args),
+            timeout_s,
+            case_id=f"{case_id}.{step.step_id}",
+            expect=step.expect,
+            **options,
+        )
+        if result.error != "policy_violation":
+            calls.append((step.tool_name, canonical_json(result.args_used), n > 1))
+        if result.ok or result.error is not None or n == max_attempts:
+            if n == 1:
+                return result, n
+            _add_phases(phases, result.phases_ms)
+            return (
+                replace(
+                    result,
+                    latency_ms=spent_ms + result.latency_ms,
+                    attempts=attempts + result.attempts,
+                    phases_ms=phases,
+                ),
+                n,
+            )
+        spent_ms += result.latency_ms
+        attempts += result.attempts
+        _add_phases(phases, result.phases_ms)
+        start = time.perf_counter()
+        await asyncio.sleep(interval_s)
+        waited_ms = (time.perf_counter() - start) * 1000
+        _add_phases(phases, {"poll_wait": waited_ms})
+        spent_ms += int(waited_ms)
+    raise AssertionError("unreachable")
+
+
+async def run_steps_case(
+    server_url: str,
+    case: SuiteCase,
+    timeout_s: float,
+    *,
+    policies: dict[str, ArgPolicy],
+    budget_n_results_max: int,
+    pool: SessionPool | None = None,
+    mode: str = "live",
+    cassette: Cassette | None = None,
+    cache: ResultCache | None = None,
+    oracle_max_bytes: int | None = DEFAULT_ORACLE_MAX_BYTES,
+    oracles: OracleCache | None = None,
+    blobs: BlobStore | None = None,
+    retry: RetryPolicies | None = None,
+) -> CaseResult:
+    phases: dict[str, float] = {}
+    steps: list[dict[str, Any]] = []
+    results: list[CaseResult] = []
+    calls: list[tuple[str, str, bool]] = []
+    outputs = StepOutputs(blobs)
+    error: str | None = None
+    oracle_error: str | None = None
+
+    # One session for the whole chain: steps share its handshake and any
+    # server-side state tied to it, until a transport failure replaces it.
+    chain = ChainSession(server_url, timeout_s, pool, phases) if mode != "replay" else None
+    try:
+        for step in case.steps or []:
+            try:
+                args = resolve_args(step.args, outputs)
+            except StepReferenceError as e:
+                error = oracle_error = f"{step.step_id}: reference error: {e}"
+                break
+            policy = policies.get(step.tool_name) or ArgPolicy(None, budget_n_results_max=budget_n_results_max)
+            result, polls = await _run_step(
+                server_url,
+                case.case_id,
+                step,
+                args,
+                timeout_s,
+                calls,
+                tool_schema=policy.tool_schema,
+                arg_policy=policy,
+                budget_n_results_max=budget_n_results_max,
+                pool=pool,
+                mode=mode,
+                cassette=cassette,
+                cache=cache,
+                oracle_max_bytes=oracle_max_bytes,
+                oracles=oracles,
+                blobs=blobs,
+                retry=retry,
+                chain=chain,
+            )
+            results.append(result)
+            steps.append({"step_id": step.step_id, "polls": polls, **asdict(result)})
+            if not result.ok:
+                if result.error is not None:
+                    error = f"{step.step_id}: {result.error}"
+                oracle_error = f"{step.step_id}: {result.oracle_error or result.error}"
+                break
+            outputs.add(step.step_id, result)
+    finally:
+        if chain is not None:
+            await chain.close()
+
+    for r in results:
+        _add_phases(phases, r.phases_ms)
+    issues = sequence_issues(calls, case.sequence)
+    policy_score = int(sum(r.policy_score for r in results) / len(results)) if results else 100
+    ok = error is None and oracle_error is None and len(results) == len(case.steps or [])
+    return CaseResult(
+        case_id=case.case_id,
+        server_url=server_url,
+        tool_name=case.tool_name,
+        args={},
+        args_used={},
+        policy_score=max(0, policy_score - SEQUENCE_PENALTY * len(issues)),
+        policy_repairs=[{**x, "step": s["step_id"]} for s in steps for x in s["policy_repairs"]],
+        policy_violations=[{**x, "step": s["step_id"]} for s in steps for x in s["policy_violations"]],
+        ok=ok,
+        latency_ms=sum(r.latency_ms for r in results),
+        error=error,
+        output_text=results[-1].output_text if results else None,
+        oracle_ok=ok,
+        oracle_error=None if ok else oracle_error or error,
+        cached=bool(results) and all(r.cached for r in results),
+        phases_ms=phases,
+        attempts=sum(r.attempts for r in results),
+        hedged=any(r.hedged for r in results),
+        hedge_won=any(r.hedge_won for r in results),
+        steps=steps,
+        sequence_issues=issues,
+    )
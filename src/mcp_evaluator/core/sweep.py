@@ -0,0 +1,47 @@
+from typing import Any
+
+DEFAULT_LEVELS = (1, 2, 4, 8)
+
+
+def sweep_point(concurrency: int, summary: dict[str, Any], wall_s: float) -> dict[str, Any]:
+    total = int(summary.get("total") or 0)
+    passed = int(summary.get("passed") or 0)
+    latency = summary.get("latency") or {}
+    return {
+        "concurrency": concurrency,
+        "total": total,
+        "passed": passed,
+        "wall_s": round(wall_s, 3),
+        "throughput_rps": round(total / wall_s, 2) if wall_s > 0 else 0.0,
+        "p50_ms": int(latency.get("p50", 0)),
+        "p95_ms": int(latency.get("p95", 0)),
+        "fail_rate": round((total - passed) / max(1, total), 4),
+    }
+
+
+def find_knee(
+    points: list[dict[str, Any]],
+    *,
+    min_gain: float = 0.1,
+    latency_tolerance: float = 2.0,
+    max_fail_rate: float = 0.05,
+) -> int | None:
+    # The knee is the last level that still bought throughput (>= min_gain over
+    # the previous level) without p95 exceeding latency_tolerance x the lowest
+    # level's p95 or failures climbing past max_fail_rate.
+    if not points:
+        return None
+    ordered = sorted(range(len(points)), key=lambda i: points[i]["concurrency"])
+    base_p95 = max(1, points[ordered[0]]["p95_ms"])
+    knee = ordered[0]
+    for prev, cur in zip(ordered, ordered[1:]):
+        p, c = points[prev], points[cur]
+        gain = c["throughput_rps"] / p["throughput_rps"] - 1 if p["throughput_rps"] > 0 else 0.0
+        if (
+            gain < min_gain
+            or c["p95_ms"] > base_p95 * latency_tolerance
+            or c["fail_rate"] > max(max_fail_rate, points[ordered[0]]["fail_rate"])
+        ):
+            break
+        knee = cur
+    return knee
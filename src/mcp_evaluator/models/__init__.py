@@ -1,3 +1,3 @@
-from .schemas import CaseResult, SuiteCase, ToolCall, ToolSchema
+from .schemas import CaseResult, SuiteCase, SuiteStep, ToolCall, ToolSchema
 
-__all__ = ["ToolCall", "SuiteCase", "CaseResult", "ToolSchema"]
+__all__ = ["ToolCall", "SuiteCase", "SuiteStep", "CaseResult", "ToolSchema"]
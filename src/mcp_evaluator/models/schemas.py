@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -8,12 +8,24 @@ class ToolCall:
     args: dict[str, Any]
 
 
+@dataclass
+class SuiteStep:
+    step_id: str
+    tool_name: str
+    args: dict[str, Any]
+    expect: dict[str, Any] | None
+    # {"max_attempts": n, "interval_s": s}: re-call until `expect` passes.
+    poll: dict[str, Any] | None = None
+
+
 @dataclass
 class SuiteCase:
     case_id: str
     tool_name: str
     args: dict[str, Any]
     expect: dict[str, Any] | None
+    steps: list[SuiteStep] | None = None
+    sequence: dict[str, Any] | None = None
 
 
 @dataclass
@@ -32,6 +44,18 @@ class CaseResult:
     output_text: str | None
     oracle_ok: bool
     oracle_error: str | None
+    cached: bool = False
+    phases_ms: dict[str, float] = field(default_factory=dict)
+    # Set when the output was spilled to the blob store; output_text then holds a preview.
+    output_blob: str | None = None
+    output_size: int | None = None
+    # Requests sent for this case, including retries and hedges.
+    attempts: int = 1
+    hedged: bool = False
+    hedge_won: bool = False
+    # Multi-step cases: one CaseResult dict per executed step, plus structural findings.
+    steps: list[dict[str, Any]] | None = None
+    sequence_issues: list[dict[str, Any]] | None = None
 
 
 @dataclass
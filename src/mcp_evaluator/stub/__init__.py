@@ -0,0 +1,10 @@
+from .profile import LATENCY_DISTS, StubProfiles, ToolProfile
+from .server import STUB_TOOLS, build_stub_server
+
+__all__ = [
+    "LATENCY_DISTS",
+    "STUB_TOOLS",
+    "StubProfiles",
+    "ToolProfile",
+    "build_stub_server",
+]
@@ -0,0 +1,93 @@
+import math
+import random
+from dataclasses import dataclass, fields, replace
+from typing import Any
+
+LATENCY_DISTS = ("constant", "uniform", "exponential", "lognormal")
+
+
+@dataclass(frozen=True)
+class ToolProfile:
+    # latency_ms is the constant value, the exponential mean or the lognormal
+    # median; uniform draws from [latency_min_ms, latency_max_ms].
+    latency: str = "lognormal"
+    latency_ms: float = 50.0
+    latency_sigma: float = 0.5
+    latency_min_ms: float = 0.0
+    latency_max_ms: float = 100.0
+    # Occasional slow outliers on top of the base distribution.
+    spike_rate: float = 0.0
+    spike_ms: float = 2000.0
+    # error_rate fails the call with a tool error; hang_rate holds it for
+    # hang_ms so the client's timeout fires instead.
+    error_rate: float = 0.0
+    hang_rate: float = 0.0
+    hang_ms: float = 600000.0
+    payload_bytes: int = 2048
+    max_results: int = 1000
+
+    def updated(self, raw: dict[str, Any]) -> "ToolProfile":
+        names = {f.name for f in fields(self)}
+        unknown = set(raw) - names
+        if unknown:
+            raise ValueError(f"unknown stub settings: {', '.join(sorted(unknown))}")
+        profile = replace(self, **raw)
+        if profile.latency not in LATENCY_DISTS:
+            raise ValueError(f"stub latency must be one of {', '.join(LATENCY_DISTS)}")
+        for name in ("spike_rate", "error_rate", "hang_rate"):
+            if not 0.0 <= getattr(profile, name) <= 1.0:
+                raise ValueError(f"stub {name} must be between 0 and 1")
+        return profile
+
+    def describe_latency(self) -> str:
+        if self.latency == "uniform":
+            text = f"uniform {self.latency_min_ms:g}-{self.latency_max_ms:g}ms"
+        else:
+            text = f"{self.latency} {self.latency_ms:g}ms"
+        if self.spike_rate:
+            text += f" (+{self.spike_ms:g}ms at {self.spike_rate * 100:g}%)"
+        return text
+
+    def sample_latency_ms(self, rng: random.Random) -> float:
+        if self.latency == "constant":
+            ms = self.latency_ms
+        elif self.latency == "uniform":
+            ms = rng.uniform(self.latency_min_ms, self.latency_max_ms)
+        elif self.latency == "exponential":
+            ms = rng.expovariate(1 / self.latency_ms) if self.latency_ms > 0 else 0.0
+        else:
+            ms = rng.lognormvariate(math.log(max(self.latency_ms, 1e-3)), self.latency_sigma)
+        if self.spike_rate and rng.random() < self.spike_rate:
+            ms += self.spike_ms
+        return max(0.0, ms)
+
+
+class StubProfiles:
+    def __init__(
+        self,
+        default: ToolProfile | None = None,
+        tools: dict[str, ToolProfile] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.default = default or ToolProfile()
+        self.tools = tools or {}
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def from_config(cls, raw: Any, seed: int | None = None) -> "StubProfiles":
+        if not isinstance(raw, dict):
+            return cls(seed=seed)
+        raw = dict(raw)
+        tools = raw.pop("tools", None) or {}
+        if not isinstance(tools, dict):
+            raise ValueError("stub.tools must be an object")
+        config_seed = raw.pop("seed", None)
+        default = ToolProfile().updated(raw)
+        return cls(
+            default,
+            {name: default.updated(cfg) for name, cfg in tools.items()},
+            seed=seed if seed is not None else config_seed,
+        )
+
+    def for_tool(self, tool_name: str) -> ToolProfile:
+        return self.tools.get(tool_name, self.default)
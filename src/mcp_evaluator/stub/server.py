@@ -0,0 +1,182 @@
+import asyncio
+import json
+from typing import Any, Callable, Literal
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+
+from .profile import StubProfiles
+
+Format = Literal["cif", "json"]
+DEFAULT_PROVIDERS = ["alexandria", "cod", "mp", "oqmd", "tcod"]
+
+STUB_TOOLS = (
+    "fetch_bohrium_crystals",
+    "fetch_mofs_sql",
+    "fetch_openlam_structures",
+    "fetch_structures_with_filter",
+    "fetch_structures_with_spg",
+    "fetch_structures_with_bandgap",
+)
+
+_CIF_LINE = "Fe1 Fe 0.00000 0.00000 0.00000 1.0\n"
+
+
+def _cif(n_bytes: int) -> str:
+    # Sized by its JSON-encoded length, in which every newline takes two bytes.
+    text = "data_stub\n_symmetry_space_group_name_H-M 'P 1'\nloop_\n"
+    if n_bytes > len(text):
+        text += _CIF_LINE * ((n_bytes - len(text)) // len(_CIF_LINE) + 1)
+    text = text[: max(0, n_bytes)]
+    return text[: len(text) - text.count("\n")]
+
+
+def render(meta: dict[str, Any], records: list[dict[str, Any]], payload_bytes: int) -> str:
+    # Records carry a CIF-like body sized so the whole response lands close to
+    # payload_bytes; the content is a pure function of the query.
+    body = {**meta, "n_found": len(records), "results": records}
+    missing = payload_bytes - len(json.dumps(body, ensure_ascii=False).encode("utf-8"))
+    if missing > 0 and records:
+        per_record = missing // len(records) - len(', "cif": ""')
+        for r in records:
+            r["cif"] = _cif(per_record)
+    return json.dumps(body, ensure_ascii=False)
+
+
+def build_stub_server(profiles: StubProfiles, name: str = "mcp-evaluator-stub") -> FastMCP:
+    server = FastMCP(name)
+
+    async def respond(
+        tool_name: str,
+        meta: dict[str, Any],
+        n_results: int,
+        record: Callable[[int], dict[str, Any]],
+    ) -> str:
+        profile = profiles.for_tool(tool_name)
+        rng = profiles.rng
+        if profile.hang_rate and rng.random() < profile.hang_rate:
+            await asyncio.sleep(profile.hang_ms / 1000)
+        else:
+            await asyncio.sleep(profile.sample_latency_ms(rng) / 1000)
+        if profile.error_rate and rng.random() < profile.error_rate:
+            raise ToolError(f"stub: injected failure in {tool_name}")
+        records = [record(i) for i in range(max(0, min(n_results, profile.max_results)))]
+        return render(meta, records, profile.payload_bytes)
+
+    @server.tool(output_schema=None)
+    async def fetch_bohrium_crystals(
+        formula: str | None = None,
+        elements: list[str] | None = None,
+        match_mode: Literal[0, 1] = 0,
+        spacegroup_number: int | None = None,
+        atom_count_range: list[str] | None = None,
+        formation_energy_range: list[str] | None = None,
+        band_gap_range: list[str] | None = None,
+        n_results: int = 10,
+        output_formats: list[Format] = ["json"],
+    ) -> str:
+        label = formula or "".join(elements or []) or "SrTiO3"
+        return await respond(
+            "fetch_bohrium_crystals",
+            {"code": 0, "match_mode": match_mode, "output_formats": output_formats},
+            n_results,
+            lambda i: {
+                "id": f"bohr-{i:05d}",
+                "formula": label,
+                "spacegroup_number": spacegroup_number or 221,
+                "n_atoms": 5 + i,
+                "band_gap": round(0.5 + 0.1 * i, 3),
+                "formation_energy": round(-1.0 - 0.01 * i, 3),
+            },
+        )
+
+    @server.tool(output_schema=None)
+    async def fetch_mofs_sql(sql: str, n_results: int = 10) -> str:
+        return await respond(
+            "fetch_mofs_sql",
+            {"name": "mofdb", "sql": sql},
+            n_results,
+            lambda i: {
+                "name": f"tobmof-{27 + i}",
+                "database": "Tobacco",
+                "n_atom": 40 + i,
+                "lcd": round(10.0 + 0.1 * i, 3),
+                "pld": round(5.0 + 0.1 * i, 3),
+                "surface_area_m2g": 800 + 10 * i,
+            },
+        )
+
+    @server.tool(output_schema=None)
+    async def fetch_openlam_structures(
+        formula: str | None = None,
+        min_energy: float | None = None,
+        max_energy: float | None = None,
+        min_submission_time: str | None = None,
+        max_submission_time: str | None = None,
+        n_results: int = 10,
+        output_formats: list[Format] = ["cif"],
+    ) -> str:
+        low = min_energy if min_energy is not None else -10.0
+        return await respond(
+            "fetch_openlam_structures",
+            {"code": 0, "output_formats": output_formats},
+            n_results,
+            lambda i: {
+                "id": f"openlam-{i:05d}",
+                "formula": formula or "Fe2O3",
+                "energy": round(low + 0.1 * i, 3),
+                "submission_time": min_submission_time or max_submission_time or "2024-01-01T00:00:00Z",
+            },
+        )
+
+    def optimade_record(i: int, providers: list[str], **fields: Any) -> dict[str, Any]:
+        provider = providers[i % len(providers)] if providers else "mp"
+        return {"provider": provider, "id": f"{provider}-{i:05d}", "chemical_formula_reduced": "Fe2O3", **fields}
+
+    @server.tool(output_schema=None)
+    async def fetch_structures_with_filter(
+        filter: str,
+        as_format: Format = "cif",
+        n_results: int = 2,
+        providers: list[str] = DEFAULT_PROVIDERS,
+    ) -> str:
+        return await respond(
+            "fetch_structures_with_filter",
+            {"filter": filter, "as_format": as_format, "providers": providers},
+            n_results * max(1, len(providers)),
+            lambda i: optimade_record(i, providers),
+        )
+
+    @server.tool(output_schema=None)
+    async def fetch_structures_with_spg(
+        base_filter: str,
+        spg_number: int,
+        as_format: Format = "cif",
+        n_results: int = 3,
+        providers: list[str] = DEFAULT_PROVIDERS,
+    ) -> str:
+        return await respond(
+            "fetch_structures_with_spg",
+            {"filter": base_filter, "spg_number": spg_number, "as_format": as_format, "providers": providers},
+            n_results * max(1, len(providers)),
+            lambda i: optimade_record(i, providers, space_group_number=spg_number),
+        )
+
+    @server.tool(output_schema=None)
+    async def fetch_structures_with_bandgap(
+        base_filter: str,
+        min_bg: float | None = None,
+        max_bg: float | None = None,
+        as_format: Format = "json",
+        n_results: int = 2,
+        providers: list[str] = DEFAULT_PROVIDERS,
+    ) -> str:
+        low = min_bg if min_bg is not None else 0.0
+        return await respond(
+            "fetch_structures_with_bandgap",
+            {"filter": base_filter, "min_bg": min_bg, "max_bg": max_bg, "as_format": as_format, "providers": providers},
+            n_results * max(1, len(providers)),
+            lambda i: optimade_record(i, providers, band_gap=round(low + 0.05 * i, 3)),
+        )
+
+    return server
@@ -1,11 +1,56 @@
-from .report import render_human_report, render_human_report_md, write_json, write_text
-from .suite import load_json, parse_suite_cases
+from .histogram import LatencyHistogram
+from .history import DEFAULT_HISTORY_PATH, HistoryStore, git_commit, record_history
+from .report import (
+    ReportAccumulator,
+    SuiteAggregator,
+    render_bench_report_md,
+    render_diff_report_md,
+    render_human_report,
+    render_human_report_md,
+    render_load_report_md,
+    render_sweep_report_md,
+    write_json,
+    write_text,
+)
+from .stream import (
+    FSYNC_POLICIES,
+    ResultWriter,
+    compact_jsonl,
+    fold_report,
+    iter_json_array,
+    iter_jsonl,
+    iter_report_cases,
+    write_json_stream,
+)
+from .suite import CaseSource, expand_matrix, iter_suite_cases, load_json, parse_suite_cases
 
 __all__ = [
     "write_json",
     "write_text",
     "render_human_report",
     "render_human_report_md",
+    "render_load_report_md",
+    "render_sweep_report_md",
+    "render_bench_report_md",
+    "render_diff_report_md",
     "load_json",
     "parse_suite_cases",
+    "iter_suite_cases",
+    "expand_matrix",
+    "CaseSource",
+    "LatencyHistogram",
+    "ReportAccumulator",
+    "SuiteAggregator",
+    "FSYNC_POLICIES",
+    "ResultWriter",
+    "iter_jsonl",
+    "iter_json_array",
+    "iter_report_cases",
+    "fold_report",
+    "compact_jsonl",
+    "write_json_stream",
+    "DEFAULT_HISTORY_PATH",
+    "HistoryStore",
+    "git_commit",
+    "record_history",
 ]
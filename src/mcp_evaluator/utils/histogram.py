@@ -0,0 +1,98 @@
+import math
+from typing import Any, Iterable
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class LatencyHistogram:
+    # Log-bucketed so that any percentile is within `precision` relative error and
+    # histograms from different suites, tools or processes can be summed.
+    def __init__(self, precision: float = 0.01) -> None:
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    @classmethod
+    def of(cls, values: Iterable[float]) -> "LatencyHistogram":
+        hist = cls()
+        for v in values:
+            hist.record(v)
+        return hist
+
+    def _index(self, value: float) -> int:
+        if value < 1:
+            return 0
+        return int(math.log(value) / self._log_base) + 1
+
+    def _upper(self, index: int) -> float:
+        if index == 0:
+            return 1.0
+        return math.exp(index * self._log_base)
+
+    def record(self, value: float) -> None:
+        value = max(0.0, float(value))
+        idx = self._index(value)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if other.precision != self.precision:
+            raise ValueError("cannot merge histograms with different precision")
+        for idx, c in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + c
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(max(self._upper(idx), self.min or 0.0), self.max or 0.0)
+        return self.max or 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"count": self.count, "mean": int(self.mean)}
+        for q in PERCENTILES:
+            out[f"p{q}"] = int(round(self.percentile(q)))
+        out["max"] = int(round(self.max or 0.0))
+        return out
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "counts": {str(k): v for k, v in sorted(self.counts.items())},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> "LatencyHistogram":
+        hist = cls(float(raw.get("precision", 0.01)))
+        hist.counts = {int(k): int(v) for k, v in (raw.get("counts") or {}).items()}
+        hist.count = int(raw.get("count", 0))
+        hist.total = float(raw.get("total", 0.0))
+        hist.min = raw.get("min")
+        hist.max = raw.get("max")
+        return hist
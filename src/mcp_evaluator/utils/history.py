@@ -0,0 +1,227 @@
+import json
+import os
+import sqlite3
+import subprocess
+import time
+from typing import Any, Iterable, Iterator
+
+from .histogram import LatencyHistogram
+from .report import ensure_parent_dir
+
+DEFAULT_HISTORY_PATH = os.path.join("reports", "history.sqlite")
+HISTORY_KINDS = ("mcp", "agent")
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, kind TEXT NOT NULL, suite TEXT NOT NULL, "
+    "server_url TEXT, mode TEXT, git_commit TEXT, created_at REAL NOT NULL, "
+    "total INTEGER, passed INTEGER, UNIQUE (kind, suite, run_id))",
+    "CREATE INDEX IF NOT EXISTS runs_created ON runs (kind, created_at)",
+    "CREATE INDEX IF NOT EXISTS runs_server ON runs (server_url, created_at)",
+    "CREATE TABLE IF NOT EXISTS mcp_results ("
+    "run INTEGER NOT NULL, created_at REAL NOT NULL, case_id TEXT NOT NULL, step_id TEXT, "
+    "tool_name TEXT NOT NULL, server_url TEXT NOT NULL, ok INTEGER NOT NULL, oracle_ok INTEGER, "
+    "policy_score INTEGER, latency_ms INTEGER NOT NULL, cached INTEGER, attempts INTEGER, "
+    "error TEXT, phases_ms TEXT)",
+    "CREATE INDEX IF NOT EXISTS mcp_results_tool ON mcp_results (tool_name, created_at)",
+    "CREATE INDEX IF NOT EXISTS mcp_results_server ON mcp_results (server_url, created_at)",
+    "CREATE INDEX IF NOT EXISTS mcp_results_run ON mcp_results (run, tool_name)",
+    "CREATE TABLE IF NOT EXISTS agent_results ("
+    "run INTEGER NOT NULL, created_at REAL NOT NULL, item_id INTEGER NOT NULL, ok INTEGER NOT NULL, "
+    "returncode INTEGER, final_state TEXT, total_turns INTEGER, duration_s REAL, log_file TEXT)",
+    "CREATE INDEX IF NOT EXISTS agent_results_run ON agent_results (run)",
+)
+
+
+def git_commit(cwd: str | None = None) -> str | None:
+    commit = os.getenv("GIT_COMMIT")
+    if commit:
+        return commit
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None if out.returncode == 0 else None
+
+
+def _flag(value: Any) -> int | None:
+    return None if value is None else int(bool(value))
+
+
+def _mcp_rows(run: int, created_at: float, results: Iterable[dict[str, Any]]) -> Iterator[tuple]:
+    for r in results:
+        # Multi-step cases are stored per step, so per-tool queries see every call.
+        for step in r.get("steps") or [r]:
+            phases = step.get("phases_ms")
+            yield (
+                run,
+                created_at,
+                r["case_id"],
+                step.get("step_id"),
+                step.get("tool_name") or r.get("tool_name") or "",
+                step.get("server_url") or r.get("server_url") or "",
+                int(bool(step.get("ok"))),
+                _flag(step.get("oracle_ok")),
+                step.get("policy_score"),
+                int(step.get("latency_ms") or 0),
+                _flag(step.get("cached")),
+                step.get("attempts"),
+                step.get("error"),
+                _encode(phases) if phases else None,
+            )
+
+
+def _agent_rows(run: int, created_at: float, items: Iterable[dict[str, Any]]) -> Iterator[tuple]:
+    for item in items:
+        final_state = item.get("final_state")
+        ok = item.get("returncode") == 0 and final_state in (None, "satisfied")
+        yield (
+            run,
+            created_at,
+            item["item_id"],
+            int(ok),
+            item.get("returncode"),
+            final_state,
+            item.get("total_turns"),
+            item.get("duration_s"),
+            item.get("log_file"),
+        )
+
+
+class HistoryStore:
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH) -> None:
+        self.path = path
+        ensure_parent_dir(path)
+        # Suites finishing together ingest from separate threads; wait for the lock.
+        self._db = sqlite3.connect(path, isolation_level=None, timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+
+    def _begin_run(self, kind: str, run: dict[str, Any]) -> tuple[int, float]:
+        # Re-ingesting a run (e.g. after --resume) replaces its rows but keeps
+        # the time it was first seen, so trends stay in start order.
+        key = (kind, run["suite"], run["run_id"])
+        row = self._db.execute(
+            "SELECT id, created_at FROM runs WHERE kind = ? AND suite = ? AND run_id = ?", key
+        ).fetchone()
+        fields = (run.get("server_url"), run.get("mode"), run.get("git_commit"), run.get("total"), run.get("passed"))
+        if row is not None:
+            self._db.execute(f"DELETE FROM {kind}_results WHERE run = ?", (row[0],))
+            self._db.execute(
+                "UPDATE runs SET server_url = ?, mode = ?, git_commit = ?, total = ?, passed = ? WHERE id = ?",
+                (*fields, row[0]),
+            )
+            return row[0], row[1]
+        created_at = float(run.get("created_at") or time.time())
+        cur = self._db.execute(
+            "INSERT INTO runs (run_id, kind, suite, server_url, mode, git_commit, total, passed, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run["run_id"], kind, run["suite"], *fields, created_at),
+        )
+        return cur.lastrowid, created_at
+
+    def _ingest(self, kind: str, run: dict[str, Any], rows: Any) -> int:
+        # One transaction and one executemany over a generator: the rows are never
+        # all in memory and tens of thousands insert well under a second.
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            run_key, created_at = self._begin_run(kind, run)
+            if kind == "mcp":
+                sql = "INSERT INTO mcp_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            else:
+                sql = "INSERT INTO agent_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            cur = self._db.executemany(sql, rows(run_key, created_at))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return cur.rowcount
+
+    def ingest_mcp_run(self, run: dict[str, Any], results: Iterable[dict[str, Any]]) -> int:
+        return self._ingest("mcp", run, lambda key, at: _mcp_rows(key, at, results))
+
+    def ingest_agent_run(self, run: dict[str, Any], items: Iterable[dict[str, Any]]) -> int:
+        return self._ingest("agent", run, lambda key, at: _agent_rows(key, at, items))
+
+    def trends(
+        self,
+        kind: str = "mcp",
+        *,
+        tool_name: str | None = None,
+        server_url: str | None = None,
+        suite: str | None = None,
+        last_runs: int = 30,
+        since: float | None = None,
+    ) -> list[dict[str, Any]]:
+        if kind not in HISTORY_KINDS:
+            raise ValueError(f"unknown history kind: {kind}")
+        where = ["r.kind = ?"]
+        params: list[Any] = [kind]
+        if suite:
+            where.append("r.suite = ?")
+            params.append(suite)
+        if server_url:
+            where.append("r.server_url = ?")
+            params.append(server_url)
+        if since is not None:
+            where.append("r.created_at >= ?")
+            params.append(since)
+        if tool_name:
+            where.append("EXISTS (SELECT 1 FROM mcp_results m WHERE m.run = r.id AND m.tool_name = ?)")
+            params.append(tool_name)
+        # A run id spans every suite run together, so trends are grouped by it.
+        runs = self._db.execute(
+            f"SELECT r.run_id, MIN(r.created_at), MAX(r.git_commit), GROUP_CONCAT(r.id) FROM runs r "
+            f"WHERE {' AND '.join(where)} GROUP BY r.run_id ORDER BY MIN(r.created_at) DESC LIMIT ?",
+            (*params, max(1, last_runs)),
+        ).fetchall()
+        points: list[dict[str, Any]] = []
+        for run_id, created_at, commit, keys in reversed(runs):
+            run_keys = [int(k) for k in keys.split(",")]
+            marks = ", ".join("?" * len(run_keys))
+            if kind == "mcp":
+                sql = f"SELECT ok, latency_ms, cached IS 1 FROM mcp_results WHERE run IN ({marks})"
+                if tool_name:
+                    sql += " AND tool_name = ?"
+                args = (*run_keys, tool_name) if tool_name else tuple(run_keys)
+            else:
+                sql = f"SELECT ok, duration_s * 1000, 0 FROM agent_results WHERE run IN ({marks})"
+                args = tuple(run_keys)
+            hist = LatencyHistogram()
+            total = passed = 0
+            for ok, latency_ms, cached in self._db.execute(sql, args):
+                total += 1
+                passed += ok
+                # Cache hits count toward the pass rate but not the latency trend.
+                if not cached:
+                    hist.record(latency_ms or 0)
+            points.append(
+                {
+                    "run_id": run_id,
+                    "created_at": created_at,
+                    "git_commit": commit,
+                    "total": total,
+                    "passed": passed,
+                    "pass_rate": round(passed / total, 4) if total else 0.0,
+                    "latency_ms": hist.summary(),
+                }
+            )
+        return points
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def record_history(path: str, kind: str, run: dict[str, Any], results: Iterable[dict[str, Any]]) -> int:
+    store = HistoryStore(path)
+    try:
+        if kind == "mcp":
+            return store.ingest_mcp_run(run, results)
+        return store.ingest_agent_run(run, results)
+    finally:
+        store.close()
@@ -2,6 +2,10 @@ import json
 import os
 from typing import Any
 
+from .histogram import LatencyHistogram
+
+PHASES = ("policy", "connect", "initialize", "call", "retry", "oracle")
+
 
 def truncate_text(text: str, limit: int) -> str:
     if len(text) <= limit:
@@ -37,11 +41,267 @@ def format_latency(ms: int) -> str:
     return f"{minutes}m{rem_seconds:.1f}s"
 
 
-def render_human_report(report: dict[str, Any]) -> str:
+def format_percentiles(hist: LatencyHistogram) -> str:
+    stats = hist.summary()
+    return (
+        f"P50 {format_latency(stats['p50'])} / P90 {format_latency(stats['p90'])} / "
+        f"P95 {format_latency(stats['p95'])} / P99 {format_latency(stats['p99'])} / 最大 {format_latency(stats['max'])}"
+    )
+
+
+def format_concurrency(concurrency: dict[str, Any]) -> str:
+    trajectory = concurrency.get("trajectory") if isinstance(concurrency.get("trajectory"), list) else []
+    limits = [p.get("limit") for p in trajectory if isinstance(p, dict)]
+    path = " → ".join(str(x) for x in limits[:12])
+    if len(limits) > 12:
+        path += " → … → " + str(limits[-1])
+    return f"{concurrency.get('mode')} {path or concurrency.get('final')} (峰值并发 {concurrency.get('peak_in_flight', 0)})"
+
+
+class ToolStats:
+    def __init__(self) -> None:
+        self.total = 0
+        self.passed = 0
+        self.policy_sum = 0
+        self.latency_sum = 0
+        self.timed = 0
+        self.hist = LatencyHistogram()
+
+    def add(self, ok: bool, policy: int, latency: int, cached: bool) -> None:
+        self.total += 1
+        self.passed += 1 if ok else 0
+        self.policy_sum += policy
+        if not cached:
+            self.latency_sum += latency
+            self.timed += 1
+            self.hist.record(latency)
+
+    @classmethod
+    def from_summary(cls, stats: dict[str, Any], hist: dict[str, Any] | None) -> "ToolStats":
+        st = cls()
+        st.total = int(stats.get("total") or 0)
+        st.passed = int(stats.get("passed") or 0)
+        st.policy_sum = int(stats.get("policy_sum") or 0)
+        if isinstance(hist, dict):
+            st.hist = LatencyHistogram.from_dict(hist)
+            st.latency_sum = int(st.hist.total)
+            st.timed = st.hist.count
+        return st
+
+    def merge(self, other: "ToolStats") -> "ToolStats":
+        self.total += other.total
+        self.passed += other.passed
+        self.policy_sum += other.policy_sum
+        self.latency_sum += other.latency_sum
+        self.timed += other.timed
+        self.hist.merge(other.hist)
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"total": self.total, "passed": self.passed, "policy_sum": self.policy_sum}
+
+    @property
+    def avg_policy(self) -> int:
+        return int(self.policy_sum / max(1, self.total))
+
+    @property
+    def avg_latency(self) -> int:
+        # Cache hits are served locally and would drag the latency average down.
+        return int(self.latency_sum / max(1, self.timed))
+
+
+class ReportAccumulator:
+    # Folds cases one at a time so reports can be built from a result stream
+    # without holding the case list in memory.
+    def __init__(self, max_failures: int = 50) -> None:
+        self.max_failures = max_failures
+        self.suite = ToolStats()
+        self.tools: dict[str, ToolStats] = {}
+        self.phases: dict[str, LatencyHistogram] = {}
+        self.failures: list[dict[str, Any]] = []
+        self.failed = 0
+        self.repair_counts: dict[str, int] = {}
+        self.violation_counts: dict[str, int] = {}
+        self.sequence_counts: dict[str, int] = {}
+        self.retried = 0
+        self.extra_attempts = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def of(cls, cases: Any) -> "ReportAccumulator":
+        acc = cls()
+        for c in cases if isinstance(cases, list) else []:
+            acc.add(c)
+        return acc
+
+    def add(self, c: Any) -> None:
+        if not isinstance(c, dict):
+            return
+        tool = c.get("tool_name")
+        if not isinstance(tool, str) or not tool:
+            tool = "<unknown>"
+        ok = c.get("ok") is True
+        policy = int(c.get("policy_score") or 0)
+        latency = int(c.get("latency_ms") or 0)
+        cached = bool(c.get("cached"))
+        self.suite.add(ok, policy, latency, cached)
+        # A multi-step case counts once for the suite; per-tool stats and
+        # retries come from its individual calls.
+        calls = [s for s in c["steps"] if isinstance(s, dict)] if isinstance(c.get("steps"), list) else [c]
+        for call in calls:
+            call_tool, call_ok, call_policy, call_latency = tool, ok, policy, latency
+            if call is not c:
+                call_tool = call.get("tool_name") if isinstance(call.get("tool_name"), str) else "<unknown>"
+                call_ok = call.get("ok") is True
+                call_policy = int(call.get("policy_score") or 0)
+                call_latency = int(call.get("latency_ms") or 0)
+            stats = self.tools.setdefault(call_tool, ToolStats())
+            stats.add(call_ok, call_policy, call_latency, bool(call.get("cached")))
+
+            attempts = int(call.get("attempts") or 1)
+            hedged = bool(call.get("hedged"))
+            self.retried += 1 if attempts > (2 if hedged else 1) else 0
+            self.extra_attempts += max(0, attempts - 1)
+            self.hedged += 1 if hedged else 0
+            self.hedge_wins += 1 if call.get("hedge_won") else 0
+
+        phases = c.get("phases_ms")
+        if not cached and isinstance(phases, dict):
+            for phase, ms in phases.items():
+                if isinstance(ms, (int, float)):
+                    self.phases.setdefault(phase, LatencyHistogram()).record(ms)
+
+        if not ok:
+            self.failed += 1
+            if len(self.failures) < self.max_failures:
+                self.failures.append(
+                    {
+                        "case_id": c.get("case_id"),
+                        "tool_name": c.get("tool_name"),
+                        "error": c.get("error"),
+                        "oracle_error": c.get("oracle_error"),
+                    }
+                )
+
+        repairs = c.get("policy_repairs")
+        if isinstance(repairs, list):
+            for r in repairs:
+                if isinstance(r, dict) and isinstance(r.get("type"), str):
+                    self.repair_counts[r["type"]] = self.repair_counts.get(r["type"], 0) + 1
+        violations = c.get("policy_violations")
+        if isinstance(violations, list):
+            for v in violations:
+                if isinstance(v, dict) and isinstance(v.get("type"), str):
+                    self.violation_counts[v["type"]] = self.violation_counts.get(v["type"], 0) + 1
+        issues = c.get("sequence_issues")
+        if isinstance(issues, list):
+            for i in issues:
+                if isinstance(i, dict) and isinstance(i.get("type"), str):
+                    self.sequence_counts[i["type"]] = self.sequence_counts.get(i["type"], 0) + 1
+
+    def ordered_phases(self) -> dict[str, LatencyHistogram]:
+        ordered = [p for p in PHASES if p in self.phases] + sorted(p for p in self.phases if p not in PHASES)
+        return {p: self.phases[p] for p in ordered}
+
+    def summary(self) -> dict[str, Any]:
+        tools = sorted(self.tools.items())
+        return {
+            "total": self.suite.total,
+            "passed": self.suite.passed,
+            "policy_sum": self.suite.policy_sum,
+            "avg_policy_score": self.suite.avg_policy,
+            "avg_latency_ms": self.suite.avg_latency,
+            "latency": self.suite.hist.summary(),
+            "tool_latency": {t: st.hist.summary() for t, st in tools},
+            "tool_stats": {t: st.to_dict() for t, st in tools},
+            "phase_latency": {p: h.summary() for p, h in self.ordered_phases().items()},
+            "retries": {
+                "retried": self.retried,
+                "extra_attempts": self.extra_attempts,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+            },
+            "histograms": {
+                "latency": self.suite.hist.to_dict(),
+                "tools": {t: st.hist.to_dict() for t, st in tools},
+            },
+        }
+
+
+def suite_tool_stats(summary: dict[str, Any]) -> dict[str, ToolStats]:
+    hists = (summary.get("histograms") or {}).get("tools") or {}
+    return {t: ToolStats.from_summary(st, hists.get(t)) for t, st in sorted((summary.get("tool_stats") or {}).items())}
+
+
+def _stats_summary(st: ToolStats) -> dict[str, Any]:
+    return {
+        "total": st.total,
+        "passed": st.passed,
+        "pass_rate": round(st.passed / st.total, 4) if st.total else 0.0,
+        "avg_policy_score": st.avg_policy,
+        "avg_latency_ms": st.avg_latency,
+        "latency": st.hist.summary(),
+    }
+
+
+class SuiteAggregator:
+    # Folds each suite's report into the cross-suite report as the suite
+    # finishes, from its summary counts and mergeable histograms alone.
+    def __init__(self) -> None:
+        self.suites: list[dict[str, Any]] = []
+        self.failed_suites: list[dict[str, Any]] = []
+        self.overall = ToolStats()
+        self.tools: dict[str, ToolStats] = {}
+        self.servers: dict[str, ToolStats] = {}
+        self.server_suites: dict[str, list[str]] = {}
+
+    def add(self, report: dict[str, Any]) -> None:
+        summary = report.get("summary") if isinstance(report.get("summary"), dict) else {}
+        hists = summary.get("histograms") or {}
+        suite = ToolStats.from_summary(summary, hists.get("latency"))
+        self.overall.merge(suite)
+        url = str(report.get("server_url"))
+        self.servers.setdefault(url, ToolStats()).merge(suite)
+        self.server_suites.setdefault(url, []).append(report.get("agent_name") or "Unknown")
+        for tool, st in suite_tool_stats(summary).items():
+            self.tools.setdefault(tool, ToolStats()).merge(st)
+        self.suites.append({k: v for k, v in report.items() if k not in ("results_path", "tools")})
+
+    def fail(self, suite: str, error: str) -> None:
+        self.failed_suites.append({"suite": suite, "error": error})
+
+    def report(self, **head: Any) -> dict[str, Any]:
+        tools = sorted(self.tools.items())
+        return {
+            "version": "l1-mvp-1",
+            **head,
+            "suites": sorted(self.suites, key=lambda r: str(r.get("agent_name") or "")),
+            "failed_suites": self.failed_suites,
+            "summary": {
+                "suites": len(self.suites),
+                **_stats_summary(self.overall),
+                "policy_sum": self.overall.policy_sum,
+                "tool_latency": {t: st.hist.summary() for t, st in tools},
+                "tool_stats": {t: st.to_dict() for t, st in tools},
+                "histograms": {
+                    "latency": self.overall.hist.to_dict(),
+                    "tools": {t: st.hist.to_dict() for t, st in tools},
+                },
+            },
+            "servers": {
+                url: {"suites": sorted(self.server_suites[url]), **_stats_summary(st)}
+                for url, st in sorted(self.servers.items())
+            },
+        }
+
+
+def render_human_report(report: dict[str, Any], acc: ReportAccumulator | None = None) -> str:
     summary = report.get("summary") if isinstance(report.get("summary"), dict) else {}
-    cases = report.get("cases") if isinstance(report.get("cases"), list) else []
+    if acc is None:
+        acc = ReportAccumulator.of(report.get("cases"))
 
-    total = int(summary.get("total") or len(cases) or 0)
+    total = int(summary.get("total") or acc.suite.total or 0)
     passed = int(summary.get("passed") or 0)
     avg_policy = summary.get("avg_policy_score")
     avg_latency = summary.get("avg_latency_ms")
@@ -57,36 +317,39 @@ def render_human_report(report: dict[str, Any]) -> str:
         header_lines.append(f"- 平均策略分: {int(avg_policy)}")
     if isinstance(avg_latency, (int, float)):
         header_lines.append(f"- 平均耗时: {format_latency(int(avg_latency))}")
-
-    by_tool: dict[str, list[dict[str, Any]]] = {}
-    for c in cases:
-        if not isinstance(c, dict):
-            continue
-        tool = c.get("tool_name")
-        if not isinstance(tool, str) or not tool:
-            tool = "<unknown>"
-        by_tool.setdefault(tool, []).append(c)
+    if acc.suite.hist.count:
+        header_lines.append(f"- 耗时分位: {format_percentiles(acc.suite.hist)}")
+    concurrency = summary.get("concurrency")
+    if isinstance(concurrency, dict):
+        header_lines.append(f"- 并发: {format_concurrency(concurrency)}")
+    cache_stats = summary.get("cache")
+    if isinstance(cache_stats, dict):
+        header_lines.append(f"- 缓存命中: {cache_stats.get('hits', 0)}  未命中: {cache_stats.get('misses', 0)}")
+    if acc.extra_attempts:
+        header_lines.append(
+            f"- 重试: {acc.retried} 个用例  额外请求: {acc.extra_attempts}  对冲: {acc.hedged}  对冲胜出: {acc.hedge_wins}"
+        )
 
     tool_lines: list[str] = []
-    for tool in sorted(by_tool.keys()):
-        items = by_tool[tool]
-        tool_total = len(items)
-        tool_passed = sum(1 for x in items if x.get("ok") is True)
-        avg_tool_latency = int(
-            sum(int(x.get("latency_ms") or 0) for x in items) / max(1, tool_total)
-        )
-        avg_tool_policy = int(
-            sum(int(x.get("policy_score") or 0) for x in items) / max(1, tool_total)
-        )
+    for tool in sorted(acc.tools.keys()):
+        st = acc.tools[tool]
+        tool_stats = st.hist.summary()
         tool_lines.append(
-            f"- {tool}: {tool_passed}/{tool_total}  平均策略分 {avg_tool_policy}  平均耗时 {format_latency(avg_tool_latency)}"
+            f"- {tool}: {st.passed}/{st.total}  平均策略分 {st.avg_policy}  平均耗时 {format_latency(st.avg_latency)}"
+            f"  P95 {format_latency(tool_stats['p95'])}  P99 {format_latency(tool_stats['p99'])}"
         )
 
+    phase_lines: list[str] = []
+    phase_hists = acc.ordered_phases()
+    if phase_hists:
+        phase_lines.append("阶段耗时")
+        for phase, hist in phase_hists.items():
+            phase_lines.append(f"- {phase}: {format_percentiles(hist)}")
+
     failed_lines: list[str] = []
-    failed = [c for c in cases if isinstance(c, dict) and c.get("ok") is not True]
-    if failed:
+    if acc.failures:
         failed_lines.append("失败用例")
-        for c in failed[:20]:
+        for c in acc.failures[:20]:
             case_id = c.get("case_id") if isinstance(c.get("case_id"), str) else "<unknown>"
             tool = c.get("tool_name") if isinstance(c.get("tool_name"), str) else "<unknown>"
             err = c.get("error") if isinstance(c.get("error"), str) else ""
@@ -94,34 +357,32 @@ def render_human_report(report: dict[str, Any]) -> str:
             msg = err or oracle_err or "unknown"
             failed_lines.append(f"- {case_id} ({tool}): {msg}")
 
-    repair_counts: dict[str, int] = {}
-    violation_counts: dict[str, int] = {}
-    for c in cases:
-        if not isinstance(c, dict):
-            continue
-        repairs = c.get("policy_repairs")
-        if isinstance(repairs, list):
-            for r in repairs:
-                if isinstance(r, dict) and isinstance(r.get("type"), str):
-                    repair_counts[r["type"]] = repair_counts.get(r["type"], 0) + 1
-        violations = c.get("policy_violations")
-        if isinstance(violations, list):
-            for v in violations:
-                if isinstance(v, dict) and isinstance(v.get("type"), str):
-                    violation_counts[v["type"]] = violation_counts.get(v["type"], 0) + 1
-
     policy_lines: list[str] = []
-    if repair_counts or violation_counts:
+    if acc.repair_counts or acc.violation_counts or acc.sequence_counts:
         policy_lines.append("策略统计")
-        for k, v in sorted(repair_counts.items()):
+        for k, v in sorted(acc.repair_counts.items()):
             policy_lines.append(f"- [修复] {k}: {v}")
-        for k, v in sorted(violation_counts.items()):
+        for k, v in sorted(acc.violation_counts.items()):
             policy_lines.append(f"- [违规] {k}: {v}")
+        for k, v in sorted(acc.sequence_counts.items()):
+            policy_lines.append(f"- [序列] {k}: {v}")
 
-    return "\n".join(header_lines + [""] + tool_lines + [""] + failed_lines + [""] + policy_lines)
+    lines = header_lines + [""] + tool_lines + [""]
+    if phase_lines:
+        lines += phase_lines + [""]
+    return "\n".join(lines + failed_lines + [""] + policy_lines)
 
 
-def render_human_report_md(report: dict[str, Any]) -> str:
+def render_tool_row(tool: str, st: ToolStats) -> str:
+    hist = st.hist.summary()
+    return (
+        f"| {tool} | {st.passed}/{st.total} | {st.avg_policy} | {format_latency(st.avg_latency)} | "
+        f"{format_latency(hist['p50'])} | {format_latency(hist['p95'])} | {format_latency(hist['p99'])} | "
+        f"{format_latency(hist['max'])} |"
+    )
+
+
+def render_human_report_md(report: dict[str, Any], acc: ReportAccumulator | None = None) -> str:
     # This could be a single report or an aggregated report
     is_aggregated = "suites" in report
     
@@ -142,10 +403,17 @@ def render_human_report_md(report: dict[str, Any]) -> str:
         md.append(f"- **总体通过率**: {(passed/max(1, total)*100):.1f}%")
         md.append(f"- **平均策略分**: {int(avg_policy)}")
         md.append(f"- **平均耗时**: {format_latency(int(avg_latency))}")
+        latency_hist = (summary.get("histograms") or {}).get("latency")
+        if isinstance(latency_hist, dict) and latency_hist.get("count"):
+            md.append(f"- **耗时分位**: {format_percentiles(LatencyHistogram.from_dict(latency_hist))}")
+        if report.get("wall_s") is not None:
+            md.append(f"- **墙钟耗时**: {report['wall_s']}s")
+        for f in report.get("failed_suites") or []:
+            md.append(f"- **套件失败**: {f.get('suite')}: {f.get('error')}")
         
         md.append("\n## 套件概览")
-        md.append("| 套件名称 | 通过率 | 平均策略分 | 平均耗时 |")
-        md.append("| :--- | :--- | :--- | :--- |")
+        md.append("| 套件名称 | 通过率 | 平均策略分 | 平均耗时 | P95 |")
+        md.append("| :--- | :--- | :--- | :--- | :--- |")
         for s in report["suites"]:
             s_name = s.get("agent_name") or "Unknown"
             s_sum = s.get("summary", {})
@@ -153,7 +421,33 @@ def render_human_report_md(report: dict[str, Any]) -> str:
             s_passed = s_sum.get("passed", 0)
             s_policy = s_sum.get("avg_policy_score", 0)
             s_latency = s_sum.get("avg_latency_ms", 0)
-            md.append(f"| {s_name} | {s_passed}/{s_total} | {s_policy} | {format_latency(int(s_latency))} |")
+            s_p95 = (s_sum.get("latency") or {}).get("p95", 0)
+            md.append(
+                f"| {s_name} | {s_passed}/{s_total} | {s_policy} | {format_latency(int(s_latency))} | "
+                f"{format_latency(int(s_p95))} |"
+            )
+
+        servers = report.get("servers") or {}
+        if servers:
+            md.append("\n## 服务器")
+            md.append("| 服务器 | 套件 | 通过率 | 平均策略分 | 平均耗时 | P50 | P95 | P99 |")
+            md.append("| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |")
+            for url, sv in servers.items():
+                lat = sv.get("latency") or {}
+                md.append(
+                    f"| `{url}` | {', '.join(sv.get('suites') or [])} | {sv.get('passed', 0)}/{sv.get('total', 0)} | "
+                    f"{sv.get('avg_policy_score', 0)} | {format_latency(int(sv.get('avg_latency_ms', 0)))} | "
+                    f"{format_latency(int(lat.get('p50', 0)))} | {format_latency(int(lat.get('p95', 0)))} | "
+                    f"{format_latency(int(lat.get('p99', 0)))} |"
+                )
+
+        all_tools = suite_tool_stats(summary)
+        if all_tools:
+            md.append("\n## 工具统计 (全部套件)")
+            md.append("| 工具 | 通过率 | 平均策略分 | 平均耗时 | P50 | P95 | P99 | 最大 |")
+            md.append("| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |")
+            for tool, st in all_tools.items():
+                md.append(render_tool_row(tool, st))
             
         md.append("\n## 详细统计 (按套件)")
         for s in report["suites"]:
@@ -161,26 +455,21 @@ def render_human_report_md(report: dict[str, Any]) -> str:
             md.append(f"\n### {s_name}")
             md.append(f"- **Server**: `{s.get('server_url')}`")
             
-            cases = s.get("cases", [])
-            by_tool: dict[str, list[dict[str, Any]]] = {}
-            for c in cases:
-                tool = c.get("tool_name") or "<unknown>"
-                by_tool.setdefault(tool, []).append(c)
-                
-            md.append("| 工具 | 通过率 | 平均策略分 | 平均耗时 |")
-            md.append("| :--- | :--- | :--- | :--- |")
-            for tool in sorted(by_tool.keys()):
-                items = by_tool[tool]
-                t_total = len(items)
-                t_passed = sum(1 for x in items if x.get("ok") is True)
-                t_latency = int(sum(int(x.get("latency_ms") or 0) for x in items) / t_total)
-                t_policy = int(sum(int(x.get("policy_score") or 0) for x in items) / t_total)
-                md.append(f"| {tool} | {t_passed}/{t_total} | {t_policy} | {format_latency(t_latency)} |")
+            s_sum = s.get("summary", {})
+            if "tool_stats" in s_sum:
+                s_tools = suite_tool_stats(s_sum)
+            else:
+                s_tools = ReportAccumulator.of(s.get("cases", [])).tools
+            md.append("| 工具 | 通过率 | 平均策略分 | 平均耗时 | P50 | P95 | P99 | 最大 |")
+            md.append("| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |")
+            for tool in sorted(s_tools.keys()):
+                md.append(render_tool_row(tool, s_tools[tool]))
     else:
         summary = report.get("summary") if isinstance(report.get("summary"), dict) else {}
-        cases = report.get("cases") if isinstance(report.get("cases"), list) else []
+        if acc is None:
+            acc = ReportAccumulator.of(report.get("cases"))
 
-        total = int(summary.get("total") or len(cases) or 0)
+        total = int(summary.get("total") or acc.suite.total or 0)
         passed = int(summary.get("passed") or 0)
         avg_policy = summary.get("avg_policy_score")
         avg_latency = summary.get("avg_latency_ms")
@@ -195,33 +484,176 @@ def render_human_report_md(report: dict[str, Any]) -> str:
             md.append(f"- **平均策略分**: {int(avg_policy)}")
         if isinstance(avg_latency, (int, float)):
             md.append(f"- **平均耗时**: {format_latency(int(avg_latency))}")
+        if acc.suite.hist.count:
+            md.append(f"- **耗时分位**: {format_percentiles(acc.suite.hist)}")
+        concurrency = summary.get("concurrency")
+        if isinstance(concurrency, dict):
+            md.append(f"- **并发**: {format_concurrency(concurrency)}")
+        cache_stats = summary.get("cache")
+        if isinstance(cache_stats, dict):
+            md.append(f"- **缓存命中**: {cache_stats.get('hits', 0)} / 未命中 {cache_stats.get('misses', 0)}")
+        if acc.extra_attempts:
+            md.append(
+                f"- **重试**: {acc.retried} 个用例重试，额外请求 {acc.extra_attempts} 次；"
+                f"对冲 {acc.hedged} 次，对冲胜出 {acc.hedge_wins} 次"
+            )
 
         md.append("\n## 工具统计")
-        by_tool: dict[str, list[dict[str, Any]]] = {}
-        for c in cases:
-            if isinstance(c, dict):
-                tool = c.get("tool_name") or "<unknown>"
-                by_tool.setdefault(tool, []).append(c)
+        md.append("| 工具 | 通过率 | 平均策略分 | 平均耗时 | P50 | P95 | P99 | 最大 |")
+        md.append("| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |")
+        for tool in sorted(acc.tools.keys()):
+            md.append(render_tool_row(tool, acc.tools[tool]))
 
-        md.append("| 工具 | 通过率 | 平均策略分 | 平均耗时 |")
-        md.append("| :--- | :--- | :--- | :--- |")
-        for tool in sorted(by_tool.keys()):
-            items = by_tool[tool]
-            t_total = len(items)
-            t_passed = sum(1 for x in items if x.get("ok") is True)
-            t_latency = int(sum(int(x.get("latency_ms") or 0) for x in items) / t_total)
-            t_policy = int(sum(int(x.get("policy_score") or 0) for x in items) / t_total)
-            md.append(f"| {tool} | {t_passed}/{t_total} | {t_policy} | {format_latency(t_latency)} |")
-
-        failed = [c for c in cases if isinstance(c, dict) and c.get("ok") is not True]
-        if failed:
+        phase_hists = acc.ordered_phases()
+        if phase_hists:
+            md.append("\n## 阶段耗时")
+            md.append("| 阶段 | P50 | P90 | P95 | P99 | 最大 |")
+            md.append("| :--- | :--- | :--- | :--- | :--- | :--- |")
+            for phase, hist in phase_hists.items():
+                st = hist.summary()
+                md.append(
+                    f"| {phase} | {format_latency(st['p50'])} | {format_latency(st['p90'])} | "
+                    f"{format_latency(st['p95'])} | {format_latency(st['p99'])} | {format_latency(st['max'])} |"
+                )
+
+        if acc.failures:
             md.append("\n## 失败用例详情")
             md.append("| 用例ID | 工具 | 错误原因 |")
             md.append("| :--- | :--- | :--- |")
-            for c in failed[:50]:
+            for c in acc.failures[:50]:
                 cid = c.get("case_id") or "N/A"
                 tool = c.get("tool_name") or "N/A"
                 err = c.get("error") or c.get("oracle_error") or "unknown"
                 md.append(f"| {cid} | {tool} | {err} |")
 
     return "\n".join(md)
+
+
+def render_load_report_md(report: dict[str, Any]) -> str:
+    s = report.get("summary") if isinstance(report.get("summary"), dict) else {}
+    latency = s.get("latency") or {}
+    md = ["# MCP 压测报告"]
+    md.append(f"- **Agent**: `{report.get('agent_name', 'Unknown')}`")
+    md.append(f"- **服务器**: `{report.get('server_url')}`")
+    md.append(f"- **目标速率**: {s.get('rate')} req/s ({s.get('arrival')})，持续 {s.get('duration_s')}s，窗口 {s.get('window_s')}s")
+    md.append(f"- **发送/完成/丢弃**: {s.get('sent', 0)} / {s.get('completed', 0)} / {s.get('dropped', 0)}")
+    md.append(f"- **吞吐**: {s.get('throughput_rps', 0)} req/s")
+    md.append(f"- **错误率**: {s.get('error_rate', 0) * 100:.1f}%  **未通过率**: {s.get('fail_rate', 0) * 100:.1f}%")
+    if latency:
+        md.append(
+            f"- **响应耗时**: P50 {format_latency(latency.get('p50', 0))} / P90 {format_latency(latency.get('p90', 0))} / "
+            f"P95 {format_latency(latency.get('p95', 0))} / P99 {format_latency(latency.get('p99', 0))} / 最大 {format_latency(latency.get('max', 0))}"
+        )
+    md.append(f"- **最大发送延迟**: {format_latency(int(s.get('max_send_lag_ms', 0)))}")
+
+    md.append("\n## 时间窗口")
+    md.append("| 起始 | 发送 | 完成 | 吞吐 | 错误率 | P50 | P95 | P99 |")
+    md.append("| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |")
+    for w in s.get("windows") or []:
+        wl = w.get("latency") or {}
+        md.append(
+            f"| {w.get('t_s')}s | {w.get('sent', 0)} | {w.get('completed', 0)} | {w.get('throughput_rps', 0)} | "
+            f"{w.get('error_rate', 0) * 100:.1f}% | {format_latency(wl.get('p50', 0))} | "
+            f"{format_latency(wl.get('p95', 0))} | {format_latency(wl.get('p99', 0))} |"
+        )
+    return "\n".join(md)
+
+
+def render_sweep_report_md(report: dict[str, Any]) -> str:
+    md = ["# MCP 并发扫描报告"]
+    md.append(f"- **Agent**: `{report.get('agent_name', 'Unknown')}`")
+    md.append(f"- **服务器**: `{report.get('server_url')}`")
+    md.append(f"- **并发级别**: {', '.join(str(p.get('concurrency')) for p in report.get('points') or [])}")
+    recommended = report.get("recommended_concurrency")
+    md.append(f"- **推荐并发**: {recommended if recommended is not None else 'N/A'}")
+
+    md.append("\n## 吞吐-耗时")
+    md.append("| 并发 | 吞吐 | P50 | P95 | 失败率 | 通过 | 耗时 |")
+    md.append("| :--- | :--- | :--- | :--- | :--- | :--- | :--- |")
+    knee = report.get("knee_index")
+    for i, p in enumerate(report.get("points") or []):
+        marker = " ← 拐点" if i == knee else ""
+        md.append(
+            f"| {p.get('concurrency')}{marker} | {p.get('throughput_rps')} req/s | {format_latency(p.get('p50_ms', 0))} | "
+            f"{format_latency(p.get('p95_ms', 0))} | {p.get('fail_rate', 0) * 100:.1f}% | "
+            f"{p.get('passed', 0)}/{p.get('total', 0)} | {p.get('wall_s')}s |"
+        )
+    return "\n".join(md)
+
+
+def render_bench_report_md(report: dict[str, Any]) -> str:
+    md = ["# 评估器性能基准"]
+    md.append(f"- **时间**: {report.get('created_at')}")
+    md.append(f"- **环境**: Python {report.get('python')} / {report.get('platform')}")
+    md.append(f"- **基线**: `{report.get('baseline_path')}`" if report.get("baseline_path") else "- **基线**: 无")
+    md.append(f"- **回归阈值**: 下降超过 {report.get('threshold', 0) * 100:.0f}%")
+    regressions = [r for r in report.get("comparison") or [] if r.get("regressed")]
+    md.append(f"- **回归**: {len(regressions)} 项")
+
+    md.append("\n## 结果")
+    md.append("| 基准 | 结果 | 基线 | 变化 | 状态 |")
+    md.append("| :--- | :--- | :--- | :--- | :--- |")
+    for r in report.get("comparison") or []:
+        unit = r.get("unit", "")
+        baseline = f"{r['baseline']} {unit}" if r.get("baseline") is not None else "-"
+        change = f"{r['change'] * 100:+.1f}%" if r.get("change") is not None else "-"
+        status = "❌ 回归" if r.get("regressed") else ("✅" if r.get("baseline") is not None else "新增")
+        md.append(f"| {r.get('name')} | {r.get('value')} {unit} | {baseline} | {change} | {status} |")
+    return "\n".join(md)
+
+
+DIFF_VERDICTS = {"regressed": "❌ 变慢", "improved": "✅ 变快", "unchanged": "无显著变化", "untested": "样本不足"}
+
+
+def render_diff_report_md(diff: dict[str, Any], limit: int = 50) -> str:
+    old, new = diff.get("old") or {}, diff.get("new") or {}
+    md = ["# MCP 运行对比"]
+    md.append(f"- **旧**: `{old.get('path')}` (run {old.get('run_id') or '-'})")
+    md.append(f"- **新**: `{new.get('path')}` (run {new.get('run_id') or '-'})")
+    md.append(
+        f"- **通过率**: {old.get('pass_rate', 0) * 100:.1f}% ({old.get('passed', 0)}/{old.get('total', 0)}) → "
+        f"{new.get('pass_rate', 0) * 100:.1f}% ({new.get('passed', 0)}/{new.get('total', 0)})"
+    )
+    md.append(f"- **平均策略分**: {old.get('policy_score_mean')} → {new.get('policy_score_mean')}")
+    md.append(
+        f"- **用例变化**: 通过→失败 {len(diff.get('broke') or [])}，失败→通过 {len(diff.get('fixed') or [])}，"
+        f"新增 {len(diff.get('added') or [])}，移除 {len(diff.get('removed') or [])}"
+    )
+    md.append(
+        f"- **耗时判定**: Mann-Whitney U 双侧检验 p < {diff.get('alpha')} 且中位数变化超过 "
+        f"{diff.get('min_shift', 0) * 100:.0f}%"
+    )
+
+    md.append("\n## 工具耗时")
+    md.append("| 工具 | 旧 次数 | 新 次数 | 旧 P50 / P95 | 新 P50 / P95 | 中位数变化 | p 值 | 判定 |")
+    md.append("| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |")
+    for t in diff.get("tools") or []:
+        o, n = t.get("old") or {}, t.get("new") or {}
+        shift = f"{t['shift'] * 100:+.1f}%" if t.get("shift") is not None else "-"
+        p = f"{t['p_value']:.2g}" if t.get("p_value") is not None else "-"
+        md.append(
+            f"| `{t.get('tool_name')}` | {o.get('count', 0)} | {n.get('count', 0)} | "
+            f"{format_latency(o.get('p50', 0))} / {format_latency(o.get('p95', 0))} | "
+            f"{format_latency(n.get('p50', 0))} / {format_latency(n.get('p95', 0))} | {shift} | {p} | "
+            f"{DIFF_VERDICTS.get(t.get('verdict'), t.get('verdict'))} |"
+        )
+
+    for title, key in (("通过→失败", "broke"), ("失败→通过", "fixed"), ("新增用例", "added"), ("移除用例", "removed")):
+        ids = diff.get(key) or []
+        if not ids:
+            continue
+        md.append(f"\n## {title} ({len(ids)})")
+        md.extend(f"- `{case_id}`" for case_id in ids[:limit])
+        if len(ids) > limit:
+            md.append(f"- … 另有 {len(ids) - limit} 个")
+
+    changes = diff.get("policy_score_changes") or []
+    if changes:
+        md.append(f"\n## 策略分变化 ({len(changes)})")
+        md.append("| 用例 | 旧 | 新 | 变化 |")
+        md.append("| :--- | :--- | :--- | :--- |")
+        for c in changes[:limit]:
+            md.append(f"| `{c.get('case_id')}` | {c.get('old')} | {c.get('new')} | {c.get('delta'):+} |")
+        if len(changes) > limit:
+            md.append(f"\n… 另有 {len(changes) - limit} 个")
+    return "\n".join(md)
@@ -0,0 +1,225 @@
+import json
+import os
+import re
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+from .report import ReportAccumulator, ensure_parent_dir
+
+FSYNC_POLICIES = ("always", "batch", "never")
+_WS = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class ResultWriter:
+    # Appends one JSON object per line as results complete, so an interrupted
+    # run keeps everything finished so far.
+    def __init__(self, path: str, *, fsync: str = "batch", batch_size: int = 32, append: bool = False) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"unknown fsync policy: {fsync} (expected one of {', '.join(FSYNC_POLICIES)})")
+        ensure_parent_dir(path)
+        self.path = path
+        self.fsync = fsync
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._pending = 0
+        self._f = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record: dict[str, Any]) -> None:
+        # Every line reaches the OS immediately (survives a process crash); the
+        # fsync policy only decides how much a power loss may cost.
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        self.count += 1
+        self._pending += 1
+        if self.fsync == "always" or self._pending >= self.batch_size:
+            self.sync()
+
+    def sync(self) -> None:
+        self._f.flush()
+        if self.fsync != "never":
+            os.fsync(self._f.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self.sync()
+        self._f.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def iter_jsonl(path: str) -> Iterator[dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write leaves at most one torn trailing line.
+                continue
+            if isinstance(obj, dict):
+                yield obj
+
+
+class _ChunkReader:
+    # Decodes one JSON value at a time with the C decoder, reading the file in
+    # chunks; only the unconsumed tail and the value being decoded are held.
+    def __init__(self, f: TextIO, chunk_size: int) -> None:
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+
+    def more(self) -> bool:
+        # Reads at least as much as is buffered, so a value spanning many
+        # chunks is re-decoded a logarithmic number of times.
+        chunk = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if c == "" or c not in chars:
+            raise ValueError(f"invalid json: expected one of {chars!r} at offset {self.pos}")
+        self.pos += 1
+        return c
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            # A number cut at the chunk edge ("2.5e") decodes as a shorter one;
+            # only trust it once a delimiter follows.
+            if (
+                not isinstance(value, (dict, list, str))
+                and (end == len(self.buf) or self.buf[end] not in " \t\n\r,]}")
+                and self.more()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(
+    path: str,
+    key: str,
+    on_field: Callable[[str, Any], None] | None = None,
+    chunk_size: int = 1 << 20,
+) -> Iterator[Any]:
+    # Yields the items of the top-level object's `key` array one by one; every
+    # other top-level member is decoded whole and passed to on_field.
+    with open(path, "r", encoding="utf-8") as f:
+        r = _ChunkReader(f, chunk_size)
+        r.expect("{")
+        if r.peek() == "}":
+            return
+        while True:
+            name = r.value()
+            r.expect(":")
+            if name == key and r.peek() == "[":
+                r.pos += 1
+                if r.peek() == "]":
+                    r.pos += 1
+                else:
+                    while True:
+                        yield r.value()
+                        if r.expect(",]") == "]":
+                            break
+            elif on_field is not None:
+                on_field(name, r.value())
+            else:
+                r.value()
+            if r.expect(",}") == "}":
+                return
+
+
+def iter_report_cases(path: str, on_field: Callable[[str, Any], None] | None = None) -> Iterator[dict[str, Any]]:
+    # A results JSONL or a report JSON; in the latter the report's other
+    # members (head and summary) go to on_field as they are passed.
+    if path.endswith(".jsonl"):
+        yield from iter_jsonl(path)
+        return
+    for case in iter_json_array(path, "cases", on_field):
+        if isinstance(case, dict):
+            yield case
+
+
+def fold_report(path: str) -> tuple[dict[str, Any], ReportAccumulator]:
+    # One pass in bounded memory: cases are folded into the accumulator as they
+    # are read and only the report's other members are kept. A results JSONL
+    # has no summary of its own, so the accumulator's stands in.
+    report: dict[str, Any] = {}
+    acc = ReportAccumulator()
+    for case in iter_report_cases(path, report.__setitem__):
+        acc.add(case)
+        if "server_url" not in report:
+            report["server_url"] = case.get("server_url")
+    if path.endswith(".jsonl"):
+        report["summary"] = acc.summary()
+    return report, acc
+
+
+def compact_jsonl(path: str, keep: Callable[[dict[str, Any]], bool]) -> int:
+    # Rewrites a results file without torn lines or dropped records so it can
+    # be appended to again; returns the number of records kept.
+    tmp = path + ".tmp"
+    kept = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        for record in iter_jsonl(path):
+            if keep(record):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                kept += 1
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return kept
+
+
+def _indented(value: Any, prefix: str) -> str:
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + prefix)
+
+
+def write_json_stream(path: str, head: dict[str, Any], key: str, items: Iterable[Any], tail: dict[str, Any]) -> None:
+    # Same bytes as write_json(head | {key: list(items)} | tail) without
+    # materialising the list; written to a temp file and swapped in atomically.
+    ensure_parent_dir(path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("{")
+        first = True
+        for k, v in head.items():
+            f.write(("\n" if first else ",\n") + f"  {json.dumps(k, ensure_ascii=False)}: {_indented(v, '  ')}")
+            first = False
+        f.write(("\n" if first else ",\n") + f"  {json.dumps(key, ensure_ascii=False)}: [")
+        empty = True
+        for item in items:
+            f.write(("\n" if empty else ",\n") + "    " + _indented(item, "    "))
+            empty = False
+        f.write("]" if empty else "\n  ]")
+        for k, v in tail.items():
+            f.write(",\n" + f"  {json.dumps(k, ensure_ascii=False)}: {_indented(v, '  ')}")
+        f.write("\n}\n")
+    os.replace(tmp, path)
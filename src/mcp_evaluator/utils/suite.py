@@ -1,7 +1,14 @@
+import copy
+import itertools
 import json
-from typing import Any
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
 
-from ..models import SuiteCase
+from ..models import SuiteCase, SuiteStep
+
+# "${step_id}" is a step's whole output text, "${step_id.$.path}" a value in its JSON output.
+REFERENCE = re.compile(r"\$\{([A-Za-z0-9_-]+)(?:\.(\$[^}]*))?\}")
 
 
 def load_json(path: str) -> Any:
@@ -9,29 +16,215 @@ def load_json(path: str) -> Any:
         return json.load(f)
 
 
-def parse_suite_cases(raw: Any) -> list[SuiteCase]:
+def _case_items(raw: Any) -> list[Any]:
     if isinstance(raw, dict) and isinstance(raw.get("cases"), list):
-        items = raw["cases"]
-    elif isinstance(raw, list):
-        items = raw
-    else:
-        raise ValueError("cases.json must be a list or an object with cases")
+        return raw["cases"]
+    if isinstance(raw, list):
+        return raw
+    raise ValueError("cases.json must be a list or an object with cases")
+
+
+def parse_case(item: Any) -> SuiteCase:
+    if not isinstance(item, dict):
+        raise ValueError("case item must be object")
+    case_id = item.get("case_id")
+    if isinstance(case_id, str) and case_id and "steps" in item:
+        return parse_steps_case(case_id, item)
+    tool_name = item.get("tool_name")
+    args = item.get("args")
+    expect = item.get("expect")
+    if not isinstance(case_id, str) or not case_id:
+        raise ValueError("case_id must be string")
+    if not isinstance(tool_name, str) or not tool_name:
+        raise ValueError("tool_name must be string")
+    if not isinstance(args, dict):
+        raise ValueError("args must be object")
+    if expect is not None and not isinstance(expect, dict):
+        raise ValueError("expect must be object")
+    return SuiteCase(case_id=case_id, tool_name=tool_name, args=args, expect=expect)
+
+
+def _label(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "+".join(_label(v) for v in value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _substitute(value: Any, placeholder: re.Pattern[str], params: dict[str, Any]) -> Any:
+    # A string that is exactly "{name}" takes the parameter's value and type;
+    # a placeholder inside a longer string is replaced by its text form.
+    if isinstance(value, str):
+        m = placeholder.fullmatch(value)
+        if m is not None:
+            return copy.deepcopy(params[m.group(1)])
+        return placeholder.sub(lambda m: _label(params[m.group(1)]), value)
+    if isinstance(value, dict):
+        return {k: _substitute(v, placeholder, params) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, placeholder, params) for v in value]
+    return value
+
+
+def _matrix_grids(case_id: str, matrix: Any) -> list[dict[str, list[Any]]]:
+    grids = matrix if isinstance(matrix, list) else [matrix]
+    if not grids:
+        raise ValueError(f"{case_id}: matrix must not be empty")
+    for grid in grids:
+        if not isinstance(grid, dict) or not grid:
+            raise ValueError(f"{case_id}: matrix must be an object of parameter lists, or a list of them")
+        for name, values in grid.items():
+            if not re.fullmatch(r"[A-Za-z0-9_]+", name):
+                raise ValueError(f"{case_id}: matrix parameter names must be letters, digits or '_'")
+            if not isinstance(values, list) or not values:
+                raise ValueError(f"{case_id}: matrix.{name} must be a non-empty list")
+            if len({_canonical(v) for v in values}) != len(values):
+                raise ValueError(f"{case_id}: matrix.{name} has duplicate values")
+    return grids
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _varying(grids: list[dict[str, list[Any]]]) -> set[str]:
+    # Parameters that take more than one value across the matrix (being absent
+    # from a grid counts as a value); these must all be named in the case_id.
+    varying = set()
+    for name in {name for grid in grids for name in grid}:
+        values = {_canonical(v) if name in grid else "" for grid in grids for v in grid.get(name, [None])}
+        if len(values) > 1:
+            varying.add(name)
+    return varying
+
+
+def expand_matrix(item: dict[str, Any]) -> Iterator[SuiteCase]:
+    # One case per point of each grid, produced on demand: the cartesian
+    # product is never materialised, only the case being yielded.
+    case_id = item.get("case_id")
+    if not isinstance(case_id, str) or not case_id:
+        raise ValueError("case_id must be string")
+    grids = _matrix_grids(case_id, item["matrix"])
+    template = {k: v for k, v in item.items() if k != "matrix"}
+    names = sorted({name for grid in grids for name in grid}, key=len, reverse=True)
+    # "${...}" is a step reference, never a matrix parameter.
+    placeholder = re.compile(r"(?<!\$)\{(" + "|".join(names) + r")\}")
+    # Ids must stay unique: --resume, diff and history all key on case_id.
+    numbered = not _varying(grids) <= set(placeholder.findall(case_id))
+    index = 0
+    for grid in grids:
+        for point in itertools.product(*grid.values()):
+            params = dict(zip(grid, point))
+            try:
+                case = _substitute(template, placeholder, params)
+            except KeyError as e:
+                raise ValueError(f"{case_id}: {{{e.args[0]}}} is not set by every matrix grid") from None
+            index += 1
+            if numbered:
+                case["case_id"] = f"{case['case_id']}-{index}"
+            yield parse_case(case)
+
 
-    cases: list[SuiteCase] = []
+def iter_cases(items: Iterable[Any]) -> Iterator[SuiteCase]:
     for item in items:
-        if not isinstance(item, dict):
-            raise ValueError("case item must be object")
-        case_id = item.get("case_id")
-        tool_name = item.get("tool_name")
-        args = item.get("args")
-        expect = item.get("expect")
-        if not isinstance(case_id, str) or not case_id:
-            raise ValueError("case_id must be string")
+        if isinstance(item, dict) and "matrix" in item:
+            yield from expand_matrix(item)
+        else:
+            yield parse_case(item)
+
+
+def parse_suite_cases(raw: Any) -> list[SuiteCase]:
+    return list(iter_cases(_case_items(raw)))
+
+
+def _iter_jsonl_items(path: str) -> Iterator[Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{lineno}: {e}") from None
+
+
+def iter_suite_cases(path: str) -> Iterator[SuiteCase]:
+    # cases.jsonl is read one line at a time; cases.json is loaded whole, but
+    # its matrices still expand lazily.
+    if path.endswith(".jsonl"):
+        yield from iter_cases(_iter_jsonl_items(path))
+    else:
+        yield from iter_cases(_case_items(load_json(path)))
+
+
+@dataclass(frozen=True)
+class CaseSource:
+    # A picklable, re-iterable slice of a cases file: every `step`-th case from
+    # `start`, minus `skip`. Worker processes read their own shard from the
+    # file instead of being sent the cases.
+    path: str
+    start: int = 0
+    step: int = 1
+    skip: frozenset[str] = frozenset()
+
+    def __iter__(self) -> Iterator[SuiteCase]:
+        cases = itertools.islice(iter_suite_cases(self.path), self.start, None, self.step)
+        return (c for c in cases if c.case_id not in self.skip)
+
+
+def _references(value: Any) -> list[str]:
+    if isinstance(value, str):
+        return [m.group(1) for m in REFERENCE.finditer(value)]
+    if isinstance(value, dict):
+        return [ref for v in value.values() for ref in _references(v)]
+    if isinstance(value, list):
+        return [ref for v in value for ref in _references(v)]
+    return []
+
+
+def parse_steps_case(case_id: str, item: dict[str, Any]) -> SuiteCase:
+    raw_steps = item.get("steps")
+    if not isinstance(raw_steps, list) or not raw_steps:
+        raise ValueError(f"{case_id}: steps must be a non-empty list")
+    sequence = item.get("sequence")
+    if sequence is not None and not isinstance(sequence, dict):
+        raise ValueError(f"{case_id}: sequence must be object")
+
+    steps: list[SuiteStep] = []
+    for i, raw in enumerate(raw_steps):
+        if not isinstance(raw, dict):
+            raise ValueError(f"{case_id}: step item must be object")
+        step_id = raw.get("id", f"step{i + 1}")
+        tool_name = raw.get("tool_name")
+        args = raw.get("args", {})
+        expect = raw.get("expect")
+        poll = raw.get("poll")
+        if not isinstance(step_id, str) or not REFERENCE.fullmatch(f"${{{step_id}}}"):
+            raise ValueError(f"{case_id}: step id must be a string of letters, digits, '_' or '-'")
+        if any(s.step_id == step_id for s in steps):
+            raise ValueError(f"{case_id}: duplicate step id {step_id}")
         if not isinstance(tool_name, str) or not tool_name:
-            raise ValueError("tool_name must be string")
+            raise ValueError(f"{case_id}.{step_id}: tool_name must be string")
         if not isinstance(args, dict):
-            raise ValueError("args must be object")
+            raise ValueError(f"{case_id}.{step_id}: args must be object")
         if expect is not None and not isinstance(expect, dict):
-            raise ValueError("expect must be object")
-        cases.append(SuiteCase(case_id=case_id, tool_name=tool_name, args=args, expect=expect))
-    return cases
+            raise ValueError(f"{case_id}.{step_id}: expect must be object")
+        if poll is not None and not isinstance(poll, dict):
+            raise ValueError(f"{case_id}.{step_id}: poll must be object")
+        for ref in _references(args):
+            if not any(s.step_id == ref for s in steps):
+                raise ValueError(f"{case_id}.{step_id}: reference to unknown or later step {ref}")
+        steps.append(SuiteStep(step_id=step_id, tool_name=tool_name, args=args, expect=expect, poll=poll))
+
+    return SuiteCase(
+        case_id=case_id,
+        tool_name=" → ".join(s.tool_name for s in steps),
+        args={},
+        expect=None,
+        steps=steps,
+        sequence=sequence,
+    )
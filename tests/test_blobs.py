@@ -0,0 +1,35 @@
+import os
+
+from mcp.types import CallToolResult, ImageContent, TextContent
+
+from mcp_evaluator.core.blobs import BlobStore
+from mcp_evaluator.core.oracle import text_size
+
+CIF = "data_Fe2O3\n_chemical_name_common 'α-氧化铁'\n" * 50
+
+
+def test_outputs_round_trip_and_are_stored_once(tmp_path):
+    store = BlobStore(str(tmp_path), threshold_bytes=10)
+    parts = [CIF, "\n", "tail"]
+    digest, size = store.put(parts)
+    assert size == len("".join(parts).encode("utf-8"))
+    assert store.get(digest) == "".join(parts)
+    assert store.put(["".join(parts)]) == (digest, size)
+    assert store.stats()["written"] == 1 and store.stats()["deduplicated"] == 1
+    assert store.stats()["bytes_stored"] == os.path.getsize(store.path_of(digest))
+    assert not [f for _, _, files in os.walk(tmp_path) for f in files if f.endswith(".tmp")]
+
+
+def test_preview_is_cut_across_parts(tmp_path):
+    store = BlobStore(str(tmp_path), preview_chars=5)
+    assert store.preview(["abc", "def", "ghi"]) == "abcde…"
+    assert store.preview(["abc", "de"]) == "abcde"
+
+
+def test_spill_size_is_measured_in_utf8_bytes():
+    # The same unit put() reports as output_size, so non-ASCII text spills on time.
+    image = ImageContent(type="image", data="eA==", mimeType="image/png")
+    result = CallToolResult(content=[TextContent(type="text", text=CIF), image, TextContent(type="text", text="é")])
+    # Text parts are joined by a newline.
+    assert text_size(result) == len(CIF.encode("utf-8")) + 1 + 2
+    assert text_size(CallToolResult(content=[TextContent(type="text", text="ascii")])) == 5
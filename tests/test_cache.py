@@ -0,0 +1,99 @@
+import asyncio
+import json
+import sqlite3
+
+from mcp.types import CallToolResult, TextContent
+
+from mcp_evaluator.core.cache import ResultCache
+
+
+def _result(text):
+    return CallToolResult(content=[TextContent(type="text", text=text)])
+
+
+def _size(path):
+    db = sqlite3.connect(path)
+    try:
+        return db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    finally:
+        db.close()
+
+
+def _entry_size():
+    return len(json.dumps(_result("x" * 100).model_dump(mode="json", by_alias=True, exclude_none=True)))
+
+
+def test_hit_returns_result_and_live_latency(tmp_path):
+    cache = ResultCache(str(tmp_path / "c.sqlite"))
+    cache.put("u", "t", {"a": 1}, _result("x"), 42)
+    result, latency_ms = cache.lookup("u", "t", {"a": 1})
+    assert result.content[0].text == "x" and latency_ms == 42
+    assert cache.lookup("u", "t", {"a": 2}) is None
+    assert cache.lookup("other", "t", {"a": 1}) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_expired_entry_is_a_miss_and_dropped(tmp_path, monkeypatch):
+    path = str(tmp_path / "c.sqlite")
+    cache = ResultCache(path, ttl_s=10, tool_ttl_s={"slow": 100, "off": 0})
+    now = [1000.0]
+    monkeypatch.setattr("mcp_evaluator.core.cache.time.time", lambda: now[0])
+    for tool in ("t", "slow", "off"):
+        cache.put("u", tool, {}, _result(tool))
+    now[0] += 50
+    assert cache.lookup("u", "t", {}) is None
+    assert cache.lookup("u", "slow", {}) is not None
+    assert cache.lookup("u", "off", {}) is None
+    cache.close()
+    assert cache.stats()["bytes"] == _size(path) > 0
+
+
+def test_error_results_are_not_cached(tmp_path):
+    cache = ResultCache(str(tmp_path / "c.sqlite"))
+    cache.put("u", "t", {}, CallToolResult(content=[], isError=True))
+    assert cache.lookup("u", "t", {}) is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("mcp_evaluator.core.cache.time.time", lambda: now[0])
+    entry = _entry_size()
+    cache = ResultCache(str(tmp_path / "c.sqlite"), max_bytes=3 * entry + entry // 2)
+    for i in range(3):
+        now[0] += 1
+        cache.put("u", "t", {"i": i}, _result("x" * 100))
+    now[0] += 1
+    assert cache.lookup("u", "t", {"i": 0}) is not None
+    now[0] += 1
+    cache.put("u", "t", {"i": 3}, _result("x" * 100))
+    assert cache.evictions == 1
+    assert cache.lookup("u", "t", {"i": 1}) is None
+    assert all(cache.lookup("u", "t", {"i": i}) is not None for i in (0, 2, 3))
+
+
+def test_eviction_counts_entries_written_by_other_workers(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    entry = _entry_size()
+    first = ResultCache(path, max_bytes=4 * entry)
+    second = ResultCache(path, max_bytes=4 * entry)
+    for i in range(3):
+        second.put("u", "t", {"w": 2, "i": i}, _result("x" * 100))
+    for i in range(3):
+        first.put("u", "t", {"w": 1, "i": i}, _result("x" * 100))
+    first.close()
+    second.close()
+    assert first.stats()["bytes"] == _size(path) <= 4 * entry
+    assert first.evictions == 2
+
+
+def test_lookups_and_writes_run_in_threads(tmp_path):
+    cache = ResultCache(str(tmp_path / "c.sqlite"))
+
+    async def run():
+        await asyncio.gather(
+            *(asyncio.to_thread(cache.put, "u", "t", {"i": i}, _result(str(i)), i) for i in range(20))
+        )
+        return await asyncio.gather(*(asyncio.to_thread(cache.lookup, "u", "t", {"i": i}) for i in range(20)))
+
+    entries = asyncio.run(run())
+    assert [(r.content[0].text, ms) for r, ms in entries] == [(str(i), i) for i in range(20)]
@@ -0,0 +1,55 @@
+import asyncio
+import json
+import os
+
+from mcp_evaluator.cli import run_suite
+
+
+def _suite(root, name, n):
+    suite_dir = os.path.join(root, "cases", name)
+    os.makedirs(suite_dir)
+    cases = [{"case_id": f"{name}-{i}", "tool_name": "echo", "args": {}, "expect": {"kind": "json"}} for i in range(n)]
+    with open(os.path.join(suite_dir, "cases.json"), "w", encoding="utf-8") as f:
+        json.dump({"cases": cases}, f)
+    os.makedirs(os.path.join(root, "cassettes"), exist_ok=True)
+    with open(os.path.join(root, "cassettes", f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump({"server_url": "http://stub/sse", "tools": [{"name": "echo"}], "calls": {}}, f)
+    return suite_dir
+
+
+def test_suites_sharing_report_path_stream_to_own_files(tmp_path):
+    root = str(tmp_path)
+    report_path = os.path.join(root, "reports")
+    suites = {"alpha": 3, "beta": 5}
+    dirs = {name: _suite(root, name, n) for name, n in suites.items()}
+
+    async def run_all():
+        await asyncio.gather(
+            *(
+                run_suite(
+                    suite_dir=suite_dir,
+                    config_path=None,
+                    cases_path=None,
+                    server_url_override="http://stub/sse",
+                    timeout_s_cli=1.0,
+                    budget_n_results_max_cli=None,
+                    print_tools_cli=False,
+                    threads_cli=2,
+                    report_path_cli=report_path,
+                    report_detail_path_cli=None,
+                    report_md_path_cli=None,
+                    global_config={},
+                    mode_cli="replay",
+                    cassette_dir_cli=os.path.join(root, "cassettes"),
+                    run_id="r1",
+                    history_cli=False,
+                )
+                for suite_dir in dirs.values()
+            )
+        )
+
+    asyncio.run(run_all())
+    for name, n in suites.items():
+        with open(os.path.join(report_path, name, "runs", "r1", f"{name}.jsonl"), encoding="utf-8") as f:
+            ids = [json.loads(line).get("case_id") for line in f if line.strip()]
+        assert sorted(i for i in ids if i) == sorted(f"{name}-{i}" for i in range(n))
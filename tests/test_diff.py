@@ -0,0 +1,73 @@
+import json
+import random
+
+from mcp_evaluator.core.diff import diff_reports, mann_whitney
+
+
+def _case(case_id, ok=True, latency_ms=100, **extra):
+    return {"case_id": case_id, "tool_name": "fetch", "ok": ok, "latency_ms": latency_ms, **extra}
+
+
+def _jsonl(path, cases):
+    path.write_text("".join(json.dumps(c) + "\n" for c in cases))
+    return str(path)
+
+
+def _report(path, cases):
+    path.write_text(json.dumps({"run_id": "r1", "server_url": "http://stub/sse", "cases": cases, "summary": {}}))
+    return str(path)
+
+
+def test_identical_samples_are_not_significant():
+    _, p = mann_whitney([5] * 20, [5] * 20)
+    assert p == 1.0
+    assert mann_whitney([], [1, 2]) == (0.0, 1.0)
+
+
+def test_clear_shift_is_significant_both_ways():
+    rng = random.Random(0)
+    old = [rng.randint(90, 110) for _ in range(40)]
+    new = [rng.randint(140, 160) for _ in range(40)]
+    u, p = mann_whitney(old, new)
+    assert p < 1e-6 and u == 40 * 40
+    assert mann_whitney(new, old)[1] == p
+
+
+def test_case_flips_additions_and_score_changes(tmp_path):
+    old = [_case("a"), _case("b", ok=False), _case("c", policy_score=80), _case("gone")]
+    new = [_case("a", ok=False), _case("b"), _case("c", policy_score=60), _case("new")]
+    diff = diff_reports(_report(tmp_path / "old.json", old), _jsonl(tmp_path / "new.jsonl", new))
+    assert (diff["broke"], diff["fixed"], diff["added"], diff["removed"]) == (["a"], ["b"], ["new"], ["gone"])
+    assert diff["policy_score_changes"] == [{"case_id": "c", "old": 80, "new": 60, "delta": -20}]
+    assert diff["old"]["run_id"] == "r1" and diff["old"]["pass_rate"] == 0.75
+
+
+def test_latency_verdict_needs_significance_and_a_large_enough_shift(tmp_path):
+    old = [_case(f"c{i}", latency_ms=100 + i % 5) for i in range(30)]
+    slower = [_case(f"c{i}", latency_ms=200 + i % 5) for i in range(30)]
+    nudged = [_case(f"c{i}", latency_ms=104 + i % 5) for i in range(30)]
+    old_path = _jsonl(tmp_path / "old.jsonl", old)
+    diff = diff_reports(old_path, _jsonl(tmp_path / "slower.jsonl", slower))
+    assert diff["regressed_tools"] == ["fetch"] and diff["tools"][0]["shift"] > 0.9
+    # Significant with this many samples, but the median moves less than min_shift.
+    (row,) = diff_reports(old_path, _jsonl(tmp_path / "nudged.jsonl", nudged))["tools"]
+    assert row["p_value"] < 0.01 and row["verdict"] == "unchanged"
+    (row,) = diff_reports(_jsonl(tmp_path / "few.jsonl", old[:5]), old_path)["tools"]
+    assert row["verdict"] == "untested" and row["p_value"] is None
+
+
+def test_steps_are_sampled_per_tool(tmp_path):
+    steps = [{"tool_name": "search", "latency_ms": 10}, {"tool_name": "fetch", "latency_ms": 20}]
+    cases = [{"case_id": f"c{i}", "ok": True, "steps": steps} for i in range(10)]
+    diff = diff_reports(_jsonl(tmp_path / "old.jsonl", cases), _jsonl(tmp_path / "new.jsonl", cases))
+    assert [(t["tool_name"], t["old"]["count"]) for t in diff["tools"]] == [("fetch", 10), ("search", 10)]
+
+
+def test_cache_hits_are_not_latency_samples(tmp_path):
+    old = [_case(f"c{i}", latency_ms=100 + i % 5) for i in range(20)]
+    new = [_case(f"c{i}", latency_ms=0, cached=True) for i in range(12)]
+    new += [_case(f"d{i}", latency_ms=100 + i % 5) for i in range(10)]
+    diff = diff_reports(_jsonl(tmp_path / "old.jsonl", old), _jsonl(tmp_path / "new.jsonl", new))
+    (row,) = diff["tools"]
+    assert row["new"]["count"] == 10 and row["verdict"] == "unchanged"
+    assert diff["regressed_tools"] == []
@@ -0,0 +1,69 @@
+import pytest
+
+from mcp_evaluator.utils.history import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite"))
+    yield store
+    store.close()
+
+
+def _run(run_id, suite="a1", created_at=1000.0, **extra):
+    return {"run_id": run_id, "suite": suite, "server_url": "http://stub/sse", "created_at": created_at, **extra}
+
+
+def _result(case_id, tool_name="fetch", ok=True, latency_ms=100, **extra):
+    return {"case_id": case_id, "tool_name": tool_name, "ok": ok, "latency_ms": latency_ms, **extra}
+
+
+def test_runs_are_grouped_by_run_id_across_suites(store):
+    store.ingest_mcp_run(_run("r1"), [_result("a"), _result("b", ok=False)])
+    store.ingest_mcp_run(_run("r1", suite="a2", created_at=1001.0), [_result("c")])
+    store.ingest_mcp_run(_run("r2", created_at=2000.0), [_result("a")])
+    points = store.trends()
+    assert [(p["run_id"], p["total"], p["passed"]) for p in points] == [("r1", 3, 2), ("r2", 1, 1)]
+    assert [p["run_id"] for p in store.trends(last_runs=1)] == ["r2"]
+    assert [p["run_id"] for p in store.trends(since=1500.0)] == ["r2"]
+    assert [p["total"] for p in store.trends(suite="a2")] == [1]
+
+
+def test_reingesting_a_run_replaces_its_rows_and_keeps_its_start(store):
+    store.ingest_mcp_run(_run("r1"), [_result("a"), _result("b")])
+    store.ingest_mcp_run(_run("r1", created_at=5000.0), [_result("a", ok=False)])
+    (point,) = store.trends()
+    assert (point["total"], point["passed"], point["created_at"]) == (1, 0, 1000.0)
+
+
+def test_steps_are_stored_per_tool(store):
+    steps = [
+        {"step_id": "s1", "tool_name": "search", "ok": True, "latency_ms": 10},
+        {"step_id": "s2", "tool_name": "fetch", "ok": False, "latency_ms": 30},
+    ]
+    assert store.ingest_mcp_run(_run("r1"), [{"case_id": "chain", "ok": False, "steps": steps}]) == 2
+    (point,) = store.trends(tool_name="search")
+    assert (point["total"], point["passed"], point["latency_ms"]["max"]) == (1, 1, 10)
+    assert store.trends(tool_name="missing") == []
+
+
+def test_cache_hits_count_toward_pass_rate_but_not_latency(store):
+    results = [_result(f"c{i}", latency_ms=200) for i in range(4)]
+    results += [_result(f"h{i}", latency_ms=0, cached=True) for i in range(6)]
+    store.ingest_mcp_run(_run("r1"), results)
+    (point,) = store.trends()
+    assert (point["total"], point["pass_rate"]) == (10, 1.0)
+    assert point["latency_ms"]["count"] == 4 and point["latency_ms"]["p50"] >= 199
+
+
+def test_agent_runs_count_only_satisfied_items(store):
+    items = [
+        {"item_id": 1, "returncode": 0, "final_state": "satisfied", "duration_s": 1.5},
+        {"item_id": 2, "returncode": 0, "final_state": "gave_up", "duration_s": 2.0},
+        {"item_id": 3, "returncode": 1, "duration_s": 0.5},
+    ]
+    store.ingest_agent_run(_run("r1", suite="agent"), items)
+    (point,) = store.trends("agent")
+    assert (point["total"], point["passed"], point["latency_ms"]["count"]) == (3, 1, 3)
+    with pytest.raises(ValueError):
+        store.trends("other")
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from mcp_evaluator.core.limiter import AdaptiveLimiter
+from mcp_evaluator.core.runner import run_cases
+from mcp_evaluator.core.scheduler import Scheduler
+from mcp_evaluator.models import SuiteCase
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("mcp_evaluator.core.limiter.time.monotonic", lambda: now[0])
+    return now
+
+
+def _window(limiter, clock, latency_ms, *, saturated=True, errors=0):
+    # One full observation window at the current limit, sent after any earlier back-off.
+    clock[0] += 60
+    limiter._window_saturated = saturated
+    for i in range(max(4, limiter.current)):
+        limiter.observe(latency_ms, error=i < errors)
+    return limiter.current
+
+
+def test_limit_grows_only_while_saturated(clock):
+    async def run():
+        limiter = AdaptiveLimiter(2, max_limit=4)
+        grown = [_window(limiter, clock, 10) for _ in range(2)]
+        idle = _window(limiter, clock, 10, saturated=False)
+        capped = _window(limiter, clock, 10)
+        return grown, idle, capped, limiter
+
+    grown, idle, capped, limiter = asyncio.run(run())
+    assert (grown, idle, capped) == ([3, 4], 4, 4)
+    assert [p["reason"] for p in limiter.trajectory] == ["initial", "increase", "increase"]
+
+
+def test_latency_and_errors_halve_the_limit(clock):
+    async def run():
+        limiter = AdaptiveLimiter(8, latency_slack_ms=0)
+        _window(limiter, clock, 10)
+        return _window(limiter, clock, 100), _window(limiter, clock, 10, errors=2), limiter
+
+    after_latency, after_errors, limiter = asyncio.run(run())
+    assert (after_latency, after_errors) == (4, 2)
+    assert [p["reason"] for p in limiter.trajectory][-2:] == ["latency", "errors"]
+
+
+def test_timeout_backs_off_at_once_and_ignores_older_requests(clock):
+    async def run():
+        limiter = AdaptiveLimiter(8, min_limit=3)
+        limiter.observe(50, timeout=True)
+        clock[0] += 1
+        limiter.observe(5_000, timeout=True)
+        return limiter.current
+
+    assert asyncio.run(run()) == 4
+
+
+def test_fixed_limit_ignores_observations(clock):
+    async def run():
+        limiter = AdaptiveLimiter(3, adaptive=False)
+        limiter.observe(1, timeout=True)
+        return _window(limiter, clock, 10_000, errors=3)
+
+    assert asyncio.run(run()) == 3
+
+
+def test_in_flight_never_exceeds_the_limit():
+    async def run():
+        limiter = AdaptiveLimiter(3)
+
+        async def work():
+            async with limiter:
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work() for _ in range(20)))
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.peak_in_flight == 3 and limiter.in_flight == 0
+
+
+class _Catalog:
+    async def get_policy(self, server_url, tool_name, budget):
+        if tool_name == "boom":
+            raise RuntimeError("boom")
+        await asyncio.sleep(10)
+
+
+def test_failing_case_releases_every_slot():
+    async def run():
+        scheduler = Scheduler(4)
+        limiter = scheduler.register("u", 2, adaptive=False)
+        cases = [SuiteCase(str(i), "boom" if i == 0 else "slow", {}, None) for i in range(6)]
+        results = []
+        with pytest.raises(RuntimeError):
+            await run_cases(
+                "u",
+                cases,
+                1.0,
+                scheduler=scheduler,
+                catalog=_Catalog(),
+                on_result=results.append,
+                budget_n_results_max=50,
+            )
+        # Every slot can be taken again.
+        for _ in range(2):
+            await asyncio.wait_for(scheduler.acquire("u"), timeout=1)
+        return limiter
+
+    assert asyncio.run(run()).in_flight == 2
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from mcp.types import CallToolResult, ImageContent, TextContent
+
+from mcp_evaluator.core.oracle import check_oracle, text_chunks
+
+INVALID = [
+    "[Error: tool failed]",
+    "{not json at all}",
+    "tru",
+    '{"a": hello}',
+    '{"a": 1,}',
+    '{"a": 01}',
+    '{"a": 1x}',
+    '{"a" 1}',
+    '{"a": 1 "b": 2}',
+    '{"a": [1}',
+    '{"a": {]}',
+    '{"a": 1}}',
+    '["\\x"]',
+    '{"a": 1, "b": "\\u00f"}',
+]
+VALID = ['{"a": 1}', '{"a": [1, {"b": "x\\"y"}, [], {}], "c": null}', "-0.5e+3", '"\\u00fc"']
+EXPECTS = [
+    {"kind": "json"},
+    {"kind": "json", "must_have": ["a"]},
+    {"kind": "json", "checks": [{"path": "$.a", "type": "number"}]},
+]
+
+
+def _chunks(text: str, size: int):
+    return (text[i : i + size] for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize("expect", EXPECTS)
+@pytest.mark.parametrize("text", INVALID)
+@pytest.mark.parametrize("size", [1, 3, 1 << 16])
+def test_invalid_json_fails(expect, text, size):
+    ok, _ = check_oracle(expect=expect, error=None, chunks=_chunks(text, size))
+    assert not ok
+
+
+@pytest.mark.parametrize("text", VALID)
+@pytest.mark.parametrize("size", [1, 3, 1 << 16])
+def test_valid_json_passes(text, size):
+    json.loads(text)
+    assert check_oracle(expect={"kind": "json"}, error=None, chunks=_chunks(text, size)) == (True, None)
+
+
+def test_bare_json_reports_invalid_output():
+    ok, reason = check_oracle(expect={"kind": "json"}, error=None, output_text="[Error: tool failed]")
+    assert (ok, reason) == (False, "output not valid json")
+
+
+@pytest.mark.parametrize("kind", ["number", "string", "boolean", "null"])
+@pytest.mark.parametrize("text", ['{"a": hello}', '{"a": 1x}', '{"a": tru}', '{"a": nul, "b": 1}', '{"a": -}'])
+def test_type_check_rejects_garbage_values(kind, text):
+    expect = {"kind": "json", "checks": [{"path": "$.a", "type": kind}]}
+    assert check_oracle(expect=expect, error=None, output_text=text) == (False, "output not valid json")
+
+
+@pytest.mark.parametrize("expect", [{"kind": "json"}, {"kind": "text_contains", "text": "missing"}])
+def test_budget_counts_utf8_bytes(expect):
+    text = json.dumps({"a": "中" * 100}, ensure_ascii=False)
+    assert len(text) < 200 < len(text.encode("utf-8"))
+    ok, reason = check_oracle(expect=expect, error=None, chunks=_chunks(text, 7), max_bytes=200)
+    assert (ok, reason) == (False, "oracle budget exceeded: 200 bytes")
+
+
+def test_budget_allows_output_at_the_limit():
+    text = json.dumps({"a": "x" * 100})
+    assert check_oracle(expect={"kind": "json"}, error=None, output_text=text, max_bytes=len(text)) == (True, None)
+
+
+DUPLICATES = [
+    ('{"a": 1, "a": 2}', {"path": "$.a", "equals": 2}, True),
+    ('{"a": 1, "a": 2}', {"path": "$.a", "equals": 1}, False),
+    ('{"a": {"b": 1}, "a": {}}', {"path": "$.a.b"}, False),
+    ('{"a": {}, "a": {"b": 1}}', {"path": "$.a.b"}, True),
+    ('{"a": "x", "a": 3}', {"path": "$.a", "type": "number"}, True),
+    ('{"a": 1, "b": 2, "a": 3}', {"path": "$", "min_len": 3}, False),
+]
+
+
+@pytest.mark.parametrize("text,check,expected", DUPLICATES)
+@pytest.mark.parametrize("size", [1, 4, 1 << 16])
+def test_duplicate_keys_keep_the_last_like_json_loads(text, check, expected, size):
+    ok, _ = check_oracle(expect={"kind": "json", "checks": [check]}, error=None, chunks=_chunks(text, size))
+    assert ok is expected
+
+
+def test_result_without_text_part_is_missing_output():
+    image = CallToolResult(content=[ImageContent(type="image", data="", mimeType="image/png")])
+    assert text_chunks(image) is None
+    expect = {"kind": "text_in", "values": [""]}
+    assert check_oracle(expect=expect, error=None, chunks=text_chunks(image)) == (False, "missing output_text")
+    empty = CallToolResult(content=[TextContent(type="text", text="")])
+    assert check_oracle(expect=expect, error=None, chunks=text_chunks(empty)) == (True, None)
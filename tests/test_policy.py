@@ -0,0 +1,162 @@
+import asyncio
+import copy
+import glob
+import os
+
+import pytest
+
+from mcp_evaluator.core.mcp import parse_tool_schema
+from mcp_evaluator.core.policy import ArgPolicy
+from mcp_evaluator.stub import StubProfiles, build_stub_server
+from mcp_evaluator.utils.suite import iter_suite_cases
+
+CASES_ROOT = os.path.join(os.path.dirname(__file__), os.pardir, "cases", "mcp_cases")
+BUDGET = 50
+
+
+def _baseline(tool_schema, original_args, *, budget_n_results_max):
+    # The argument policy as it stood before it was compiled per tool.
+    args_used = dict(original_args)
+    repairs = []
+    violations = []
+    penalty = 0
+
+    if tool_schema is None:
+        violations.append({"type": "schema_missing", "message": "tool input schema not available; skip validation"})
+        return args_used, 60, repairs, violations
+
+    allowed_keys = set(tool_schema.properties.keys())
+    for k in [k for k in list(args_used.keys()) if k not in allowed_keys]:
+        old = args_used.pop(k, None)
+        repairs.append({"type": "drop_unknown", "field": k, "from": old, "to": None})
+        penalty += 5
+
+    for name in tool_schema.required:
+        if name not in args_used or args_used.get(name) in (None, ""):
+            if name in tool_schema.properties and "default" in tool_schema.properties[name]:
+                default = tool_schema.properties[name].get("default")
+                args_used[name] = default
+                repairs.append({"type": "fill_required_default", "field": name, "to": default})
+                penalty += 10
+            else:
+                violations.append({"type": "missing_required", "field": name})
+
+    if "n_results" in args_used:
+        try:
+            n = int(args_used["n_results"])
+            if n < 1:
+                repairs.append({"type": "clip_min", "field": "n_results", "from": n, "to": 1})
+                args_used["n_results"] = 1
+                penalty += 10
+            if n > budget_n_results_max:
+                repairs.append(
+                    {"type": "clip_max_budget", "field": "n_results", "from": n, "to": budget_n_results_max}
+                )
+                args_used["n_results"] = budget_n_results_max
+                penalty += 10
+        except Exception:
+            violations.append({"type": "type_error", "field": "n_results"})
+
+    if "output_formats" in args_used:
+        of = args_used.get("output_formats")
+        if isinstance(of, str):
+            normalized = [s.strip() for s in of.split(",") if s.strip()]
+            repairs.append({"type": "coerce_array", "field": "output_formats", "from": of, "to": normalized})
+            args_used["output_formats"] = normalized
+            penalty += 5
+        elif isinstance(of, list):
+            normalized = [x for x in of if isinstance(x, str) and x.strip()]
+            if normalized != of:
+                repairs.append({"type": "filter_array", "field": "output_formats", "from": of, "to": normalized})
+                args_used["output_formats"] = normalized
+                penalty += 5
+
+        prop = tool_schema.properties.get("output_formats")
+        if isinstance(prop, dict) and prop.get("type") == "array":
+            allowed = None
+            items = prop.get("items")
+            if isinstance(items, dict) and isinstance(items.get("enum"), list):
+                allowed = [x for x in items.get("enum") if isinstance(x, str)]
+            if allowed is not None and isinstance(args_used.get("output_formats"), list):
+                current = args_used["output_formats"]
+                filtered = [x for x in current if x in allowed]
+                if filtered != current:
+                    if filtered:
+                        repairs.append({"type": "filter_enum", "field": "output_formats", "from": current, "to": filtered})
+                        args_used["output_formats"] = filtered
+                        penalty += 15
+                    else:
+                        default = prop.get("default")
+                        if not default and allowed:
+                            default = [allowed[0]]
+                        if default:
+                            repairs.append(
+                                {"type": "fallback_default", "field": "output_formats", "from": current, "to": default}
+                            )
+                            args_used["output_formats"] = default
+                            penalty += 15
+                        else:
+                            violations.append({"type": "invalid_enum", "field": "output_formats"})
+
+    return args_used, max(0, 100 - penalty), repairs, violations
+
+
+def _tool_schemas():
+    server = build_stub_server(StubProfiles())
+    return {name: parse_tool_schema(t.parameters) for name, t in asyncio.run(server.get_tools()).items()}
+
+
+def _variants(args, schema):
+    # The suites' own arguments, plus the mistakes the baseline policy handled.
+    yield args
+    yield {**args, "unexpected": True}
+    for n in (0, -3, 500, "7", "many", None):
+        yield {**args, "n_results": n}
+    for formats in ("cif, json", " ", ["cif", "", 3, None], ["xyz"], [], ["json", "  "]):
+        yield {**args, "output_formats": formats}
+    for name in schema.required:
+        yield {**args, name: None}
+        yield {**args, name: ""}
+        yield {k: v for k, v in args.items() if k != name}
+
+
+def _suite_calls():
+    schemas = _tool_schemas()
+    for path in sorted(glob.glob(os.path.join(CASES_ROOT, "*", "cases.json"))):
+        for case in iter_suite_cases(path):
+            schema = schemas[case.tool_name]
+            for args in _variants(case.args, schema):
+                if "output_formats" in args and "output_formats" not in schema.properties:
+                    continue
+                yield case.case_id, schema, args
+
+
+CALLS = list(_suite_calls())
+
+
+def test_suites_cover_every_tool():
+    assert {case_id.split("-")[0] for case_id, _, _ in CALLS} == {"bohrium", "mof", "openlam", "optimade"}
+
+
+@pytest.mark.parametrize("case_id,schema,args", CALLS, ids=[c[0] for c in CALLS])
+def test_policy_matches_baseline(case_id, schema, args):
+    policy = ArgPolicy(schema, budget_n_results_max=BUDGET)
+    assert policy(copy.deepcopy(args)) == _baseline(schema, copy.deepcopy(args), budget_n_results_max=BUDGET)
+
+
+def test_required_null_is_missing_and_type_error():
+    schema = parse_tool_schema(
+        {"properties": {"n_results": {"type": "integer"}}, "required": ["n_results"], "type": "object"}
+    )
+    _, _, _, violations = ArgPolicy(schema, budget_n_results_max=BUDGET)({"n_results": None})
+    assert violations == [
+        {"type": "missing_required", "field": "n_results"},
+        {"type": "type_error", "field": "n_results"},
+    ]
+
+
+def test_untyped_array_drops_empty_and_non_string_entries():
+    schema = parse_tool_schema({"properties": {"tags": {"type": "array"}}, "type": "object"})
+    args, _, repairs, _ = ArgPolicy(schema, budget_n_results_max=BUDGET)({"tags": ["a", "", 3, " b"]})
+    assert args == {"tags": ["a", " b"]}
+    assert [r["type"] for r in repairs] == ["filter_array"]
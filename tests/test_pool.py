@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import pytest
+
+from mcp_evaluator.core.pool import PooledSession, SessionPool
+
+
+class FakeSession:
+    def __init__(self, ping_ok=True):
+        self.ping_ok = ping_ok
+
+    async def send_ping(self):
+        if not self.ping_ok:
+            raise ConnectionError("gone")
+
+
+@pytest.fixture
+def handshake(monkeypatch):
+    # Replaces the SSE connection with a delay, optionally failing.
+    options = {"delay_s": 0.05, "error": None, "opened": 0}
+
+    async def run(self, timeout_s):
+        try:
+            options["opened"] += 1
+            await asyncio.sleep(options["delay_s"])
+            if options["error"] is not None:
+                raise options["error"]
+            self.session = FakeSession()
+            self._ready.set()
+            await self._closing.wait()
+        except Exception as e:
+            if not self._ready.is_set():
+                self._error = e
+        finally:
+            self.broken = True
+            self._ready.set()
+
+    monkeypatch.setattr(PooledSession, "_run", run)
+    return options
+
+
+async def _use(pool, url="http://s/sse", hold_s=0.0):
+    async with pool.session(url) as session:
+        await asyncio.sleep(hold_s)
+        return session
+
+
+def test_handshakes_do_not_hold_the_server_lock(handshake):
+    handshake["delay_s"] = 0.2
+
+    async def run():
+        pool = SessionPool(size=3)
+        start = time.perf_counter()
+        sessions = await asyncio.gather(*(_use(pool, hold_s=0.05) for _ in range(3)))
+        elapsed = time.perf_counter() - start
+        await pool.drain()
+        return sessions, elapsed, pool
+
+    sessions, elapsed, pool = asyncio.run(run())
+    assert len({id(s) for s in sessions}) == 3 and pool.connects == 3
+    assert elapsed < 0.4
+
+
+def test_callers_share_a_session_still_connecting(handshake):
+    async def run():
+        pool = SessionPool(size=1)
+        sessions = await asyncio.gather(*(_use(pool) for _ in range(4)))
+        await pool.drain()
+        return sessions, pool
+
+    sessions, pool = asyncio.run(run())
+    assert len({id(s) for s in sessions}) == 1
+    assert (pool.connects, handshake["opened"]) == (1, 1)
+
+
+def test_failed_handshake_fails_every_waiter_and_leaves_no_slot(handshake):
+    handshake["error"] = ConnectionError("refused")
+
+    async def run():
+        pool = SessionPool(size=1)
+        results = await asyncio.gather(*(_use(pool) for _ in range(3)), return_exceptions=True)
+        handshake["error"] = None
+        session = await _use(pool)
+        await pool.drain()
+        return results, session, pool
+
+    results, session, pool = asyncio.run(run())
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert isinstance(session, FakeSession)
+    assert (pool.connects, pool.reconnects) == (1, 0)
+
+
+def test_broken_session_is_replaced(handshake):
+    async def run():
+        pool = SessionPool(size=1)
+        with pytest.raises(ConnectionError):
+            async with pool.session("http://s/sse"):
+                raise ConnectionError("reset")
+        session = await _use(pool)
+        await pool.drain()
+        return session, pool
+
+    session, pool = asyncio.run(run())
+    assert isinstance(session, FakeSession)
+    assert (pool.connects, pool.reconnects) == (2, 1)
+
+
+def test_idle_session_failing_its_ping_is_replaced(handshake):
+    async def run():
+        pool = SessionPool(size=1, health_check_interval_s=0.0)
+        first = await _use(pool)
+        first.ping_ok = False
+        second = await _use(pool)
+        third = await _use(pool)
+        await pool.drain()
+        return first, second, third, pool
+
+    first, second, third, pool = asyncio.run(run())
+    assert second is not first and third is second
+    assert (pool.connects, pool.reconnects) == (2, 1)
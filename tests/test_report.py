@@ -0,0 +1,30 @@
+from mcp_evaluator.utils.report import ReportAccumulator, render_human_report
+
+
+def _case(case_id, ok, **extra):
+    return {"case_id": case_id, "tool_name": "t", "ok": ok, "policy_score": 100, "latency_ms": 10, **extra}
+
+
+def test_text_report_without_phases_has_no_empty_section():
+    cases = [_case("a", True), _case("b", False, error="boom")]
+    text = render_human_report({"server_url": "http://s/sse", "summary": {"total": 2, "passed": 1}, "cases": cases})
+    assert "阶段耗时" not in text
+    assert "\n\n\n" not in text
+    assert "\n\n失败用例\n- b (t): boom" in text
+
+
+def test_text_report_lists_phases_between_tools_and_failures():
+    cases = [_case("a", True, phases_ms={"call": 8.0, "oracle": 1.0}), _case("b", False, error="boom")]
+    text = render_human_report({"server_url": "http://s/sse", "summary": {}, "cases": cases})
+    assert text.index("- t: ") < text.index("阶段耗时\n- call:") < text.index("失败用例")
+    assert "\n\n\n" not in text
+
+
+def test_multi_step_case_counts_by_its_own_verdict():
+    steps = [
+        {"tool_name": "search", "ok": True, "policy_score": 100, "latency_ms": 5},
+        {"tool_name": "fetch", "ok": True, "policy_score": 90, "latency_ms": 7},
+    ]
+    acc = ReportAccumulator.of([_case("chain", False, steps=steps, oracle_error="final check failed")])
+    assert acc.failed == 1 and acc.failures[0]["case_id"] == "chain"
+    assert {tool: (st.passed, st.total) for tool, st in acc.tools.items()} == {"search": (1, 1), "fetch": (1, 1)}
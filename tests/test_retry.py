@@ -0,0 +1,113 @@
+import asyncio
+import random
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from mcp_evaluator.core.retry import AttemptLog, RetryPolicies, RetryPolicy, call_with_retry
+
+FAST = RetryPolicy(max_attempts=3, base_delay_s=0.001, max_delay_s=0.001)
+
+
+def _flaky(failures, *, delay_s=0.0, error=ConnectionError):
+    calls = []
+
+    async def call(phases):
+        calls.append(phases)
+        phases["call"] = 1.0
+        await asyncio.sleep(delay_s)
+        if len(calls) <= failures:
+            raise error("down")
+        return len(calls)
+
+    return call, calls
+
+
+def _run(call, policy, hedge_after_s=None):
+    log = AttemptLog()
+    phases = {}
+
+    async def run():
+        return await call_with_retry(
+            call, policy, rng=random.Random(0), phases=phases, log=log, hedge_after_s=hedge_after_s
+        )
+
+    return asyncio.run(run()), log, phases
+
+
+def test_transient_failures_are_retried_and_timed():
+    call, calls = _flaky(2)
+    result, log, phases = _run(call, FAST)
+    assert result == 3 and log.attempts == 3
+    assert phases["call"] == 1.0 and phases["retry"] > 0
+
+
+def test_gives_up_after_max_attempts():
+    call, calls = _flaky(5)
+    with pytest.raises(ConnectionError):
+        _run(call, FAST)
+    assert len(calls) == 3
+
+
+def test_tool_errors_are_not_retried():
+    def error(message):
+        return McpError(ErrorData(code=-32602, message=message))
+
+    call, calls = _flaky(1, error=error)
+    with pytest.raises(McpError):
+        _run(call, FAST)
+    assert len(calls) == 1
+
+
+def test_exception_groups_retry_only_when_every_error_is_transient():
+    assert FAST.retryable(ExceptionGroup("g", [ConnectionError(), TimeoutError()]))
+    assert not FAST.retryable(ExceptionGroup("g", [ConnectionError(), ValueError()]))
+
+
+def test_backoff_is_jittered_under_the_cap():
+    policy = RetryPolicy(base_delay_s=0.1, max_delay_s=0.3)
+    rng = random.Random(1)
+    delays = [policy.backoff_s(attempt, rng) for attempt in (1, 2, 3, 4) for _ in range(50)]
+    assert all(0 <= d <= 0.3 for d in delays)
+    assert max(delays[:50]) <= 0.1 < max(delays[100:])
+
+
+def test_hedge_wins_when_the_primary_is_slow():
+    slow = {"n": 0}
+
+    async def call(phases):
+        slow["n"] += 1
+        await asyncio.sleep(1.0 if slow["n"] == 1 else 0.01)
+        return slow["n"]
+
+    result, log, phases = _run(call, RetryPolicy(), hedge_after_s=0.02)
+    assert result == 2
+    assert (log.attempts, log.hedged, log.hedge_won) == (2, True, True)
+    assert phases["call"] < 500
+
+
+def test_hedge_is_not_sent_when_the_primary_answers_in_time():
+    call, calls = _flaky(0, delay_s=0.001)
+    result, log, _ = _run(call, RetryPolicy(), hedge_after_s=0.5)
+    assert result == 1 and (log.attempts, log.hedged) == (1, False)
+
+
+def test_hedge_delay_needs_enough_samples():
+    policies = RetryPolicies.from_config({"tools": {"slow": {"hedge": True, "hedge_min_samples": 3}}})
+    for ms in (100, 200):
+        policies.observe("u", "slow", ms)
+    assert policies.hedge_delay_s("u", "slow") is None
+    policies.observe("u", "slow", 300)
+    assert 0.2 <= policies.hedge_delay_s("u", "slow") <= 0.32
+    policies.observe("u", "fast", 1)
+    assert policies.hedge_delay_s("u", "fast") is None
+
+
+def test_config_rejects_unknown_settings():
+    with pytest.raises(ValueError):
+        RetryPolicies.from_config({"max_attempts": 2, "jitter": True})
+    with pytest.raises(ValueError):
+        RetryPolicies.from_config({"max_attempts": 0})
+    policies = RetryPolicies.from_config({"max_attempts": 4, "tools": {"t": {"hedge": True}}})
+    assert (policies.for_tool("t").max_attempts, policies.for_tool("t").hedge) == (4, True)
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+
+from mcp_evaluator.core.cassette import call_key
+from mcp_evaluator.core.runner import (
+    ShardConfig,
+    merge_shard_stats,
+    run_sharded,
+    shard_cases,
+    shard_configs,
+    split_evenly,
+)
+from mcp_evaluator.models import SuiteCase
+
+TOOLS = [{"name": "echo", "inputSchema": {"type": "object", "properties": {"q": {"type": "string"}}}}]
+
+
+def _cases(n):
+    return [SuiteCase(f"c{i}", "echo", {"q": str(i)}, {"kind": "json", "must_have": ["q"]}) for i in range(n)]
+
+
+def _config(**overrides):
+    return ShardConfig(
+        **{
+            "server_url": "http://stub/sse",
+            "timeout_s": 5.0,
+            "budget_n_results_max": 50,
+            "threads": 4,
+            "pool_size": 1,
+            "health_check_interval_s": 30.0,
+            **overrides,
+        }
+    )
+
+
+def test_cases_are_dealt_round_robin_without_empty_shards():
+    cases = _cases(7)
+    shards = shard_cases(cases, 3)
+    assert [[c.case_id for c in s] for s in shards] == [["c0", "c3", "c6"], ["c1", "c4"], ["c2", "c5"]]
+    assert len(shard_cases(cases[:2], 4)) == 2
+
+
+def test_concurrency_budget_is_divided_between_workers():
+    assert split_evenly(5, 3) == [2, 2, 1]
+    config = _config(threads=5, max_concurrency=4, limiter={"max_limit": 7, "min_limit": 1})
+    shards = shard_configs(config, 3)
+    assert [s.threads for s in shards] == [2, 2, 1]
+    assert [s.max_concurrency for s in shards] == [2, 1, 1]
+    assert [s.limiter["max_limit"] for s in shards] == [3, 2, 2]
+    assert all(s.limiter["min_limit"] == 1 for s in shards)
+
+
+def test_shard_stats_are_summed():
+    def stats(connections, hits, misses):
+        concurrency = {"mode": "fixed", "initial": 2, "final": 2, "max": 2, "peak_in_flight": 2, "trajectory": []}
+        cache = {"hits": hits, "misses": misses, "hit_rate": 0.0, "evictions": 0, "bytes": 10 * hits}
+        return {
+            "connections": connections,
+            "reconnects": 0,
+            "concurrency": concurrency,
+            "cache": cache,
+            "blobs": None,
+            "calls": {f"k{connections}": {}},
+            "tools": None,
+        }
+
+    merged = merge_shard_stats([stats(1, 3, 1), stats(2, 1, 3)])
+    assert merged["connections"] == 3 and merged["concurrency"]["final"] == 4
+    assert merged["cache"]["hit_rate"] == 0.5 and merged["cache"]["bytes"] == 30
+    assert set(merged["calls"]) == {"k1", "k2"}
+
+
+def test_workers_replay_every_case_once(tmp_path):
+    cases = _cases(9)
+    calls = {
+        call_key("echo", c.args): {
+            "result": {"content": [{"type": "text", "text": json.dumps(c.args)}]},
+            "latency_ms": 5,
+            "error": None,
+        }
+        for c in cases
+    }
+    cassette = tmp_path / "suite.json"
+    cassette.write_text(json.dumps({"server_url": "http://stub/sse", "tools": TOOLS, "calls": calls}))
+    config = _config(mode="replay", cassette_path=str(cassette))
+    results = []
+    stats = asyncio.run(run_sharded(shard_configs(config, 3), shard_cases(cases, 3), results.append))
+    assert sorted(r["case_id"] for r in results) == sorted(c.case_id for c in cases)
+    assert all(r["ok"] for r in results)
+    assert len(stats) == 3
+
+
+def test_failing_worker_fails_the_run(tmp_path):
+    config = _config(mode="replay", cassette_path=str(tmp_path / "missing.json"))
+    with pytest.raises(RuntimeError, match="worker 0 failed"):
+        asyncio.run(run_sharded([config], [_cases(2)], lambda r: None))
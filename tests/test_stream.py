@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from mcp_evaluator.utils.report import ReportAccumulator, write_json
+from mcp_evaluator.utils.stream import (
+    ResultWriter,
+    compact_jsonl,
+    fold_report,
+    iter_json_array,
+    iter_jsonl,
+    write_json_stream,
+)
+
+CASES = [
+    {"case_id": "a", "tool_name": "t", "ok": True, "policy_score": 100, "latency_ms": 12, "score": 2.5e-3},
+    {"case_id": "b\"\\", "tool_name": "t", "ok": False, "latency_ms": 1234567, "error": "晶体 } ] ,"},
+    {"case_id": "c", "tool_name": "u", "ok": True, "latency_ms": 7, "steps": [], "nested": {"x": [[], {}]}},
+]
+
+
+def test_streamed_report_matches_write_json(tmp_path):
+    head = {"server_url": "http://s/sse", "created_at": 1.5}
+    tail = {"summary": ReportAccumulator.of(CASES).summary()}
+    write_json(str(tmp_path / "a.json"), {**head, "cases": CASES, **tail})
+    write_json_stream(str(tmp_path / "b.json"), head, "cases", iter(CASES), tail)
+    assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+    write_json(str(tmp_path / "a.json"), {"cases": []})
+    write_json_stream(str(tmp_path / "b.json"), {}, "cases", iter([]), {})
+    assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+def test_array_items_survive_any_chunk_boundary(tmp_path, chunk_size):
+    path = tmp_path / "r.json"
+    path.write_text(json.dumps({"n": 12.75e2, "cases": CASES, "summary": {"total": 3}, "last": -0.5}, indent=1))
+    fields = {}
+    items = list(iter_json_array(str(path), "cases", fields.__setitem__, chunk_size=chunk_size))
+    assert items == CASES
+    assert fields == {"n": 1275.0, "summary": {"total": 3}, "last": -0.5}
+
+
+def test_missing_or_empty_array_and_broken_json(tmp_path):
+    path = tmp_path / "r.json"
+    path.write_text('{"cases": [], "x": 1}')
+    assert list(iter_json_array(str(path), "cases")) == []
+    path.write_text("{}")
+    assert list(iter_json_array(str(path), "cases")) == []
+    path.write_text('{"cases": [1, 2')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path), "cases", chunk_size=2))
+
+
+def test_fold_report_matches_for_json_and_jsonl(tmp_path):
+    detail = tmp_path / "report_detail.json"
+    results = tmp_path / "results.jsonl"
+    summary = ReportAccumulator.of(CASES).summary()
+    write_json(str(detail), {"server_url": "http://s/sse", "cases": CASES, "summary": summary})
+    results.write_text("".join(json.dumps(c) + "\n" for c in CASES))
+    report, acc = fold_report(str(detail))
+    assert "cases" not in report and report["summary"] == summary
+    jsonl_report, jsonl_acc = fold_report(str(results))
+    assert jsonl_report["summary"] == summary
+    assert (acc.failed, jsonl_acc.failed) == (1, 1)
+
+
+def test_torn_lines_are_skipped_and_compacted(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with ResultWriter(path, fsync="never") as writer:
+        for case in CASES:
+            writer.write(case)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"case_id": "d", "ok"')
+    assert [c["case_id"] for c in iter_jsonl(path)] == ["a", 'b"\\', "c"]
+    assert compact_jsonl(path, lambda c: c["ok"]) == 2
+    with ResultWriter(path, append=True) as writer:
+        writer.write({"case_id": "e"})
+    assert [c["case_id"] for c in iter_jsonl(path)] == ["a", "c", "e"]
+    with pytest.raises(ValueError):
+        ResultWriter(path, fsync="sometimes")
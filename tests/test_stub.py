@@ -0,0 +1,21 @@
+import random
+
+import pytest
+
+from mcp_evaluator.stub.profile import StubProfiles
+
+
+def test_tool_settings_override_the_defaults():
+    uniform = {"latency": "uniform", "latency_min_ms": 200, "latency_max_ms": 800, "spike_rate": 0.01}
+    raw = {"latency": "constant", "latency_ms": 20, "tools": {"slow": uniform}}
+    profiles = StubProfiles.from_config(raw, seed=1)
+    assert profiles.for_tool("other").describe_latency() == "constant 20ms"
+    slow = profiles.for_tool("slow")
+    assert slow.describe_latency() == "uniform 200-800ms (+2000ms at 1%)"
+    assert all(200 <= slow.sample_latency_ms(random.Random(i)) <= 2800 for i in range(50))
+
+
+@pytest.mark.parametrize("raw", [{"latency": "gamma"}, {"error_rate": 1.5}, {"jitter": 1}, {"tools": [1]}])
+def test_invalid_settings_are_rejected(raw):
+    with pytest.raises(ValueError):
+        StubProfiles.from_config(raw)
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from mcp_evaluator.utils.suite import iter_suite_cases, parse_suite_cases
+
+
+def _matrix(case_id, matrix, args=None):
+    return {
+        "case_id": case_id,
+        "tool_name": "fetch",
+        "args": args if args is not None else {"formula": "{formula}", "n_results": "{n}"},
+        "matrix": matrix,
+    }
+
+
+def test_matrix_expands_every_point_with_typed_values():
+    cases = parse_suite_cases([_matrix("m-{formula}-{n}", {"formula": ["Fe2O3", "SiO2"], "n": [1, 5]})])
+    assert [c.case_id for c in cases] == ["m-Fe2O3-1", "m-Fe2O3-5", "m-SiO2-1", "m-SiO2-5"]
+    assert cases[1].args == {"formula": "Fe2O3", "n_results": 5}
+
+
+def test_ids_not_naming_every_parameter_are_numbered():
+    cases = parse_suite_cases([_matrix("m-{formula}", {"formula": ["Fe2O3", "SiO2"], "n": [1, 5]})])
+    assert [c.case_id for c in cases] == ["m-Fe2O3-1", "m-Fe2O3-2", "m-SiO2-3", "m-SiO2-4"]
+
+
+def test_grids_differing_in_a_fixed_parameter_keep_ids_unique():
+    # "n" has one value per grid but differs between them, so it still varies.
+    grids = [{"formula": ["Fe2O3"], "n": [1]}, {"formula": ["Fe2O3"], "n": [5]}]
+    cases = parse_suite_cases([_matrix("m-{formula}", grids)])
+    assert len({c.case_id for c in cases}) == 2
+    assert [c.args["n_results"] for c in cases] == [1, 5]
+
+
+def test_list_values_label_the_id_and_keep_their_type():
+    args = {"elements": "{elements}"}
+    cases = parse_suite_cases([_matrix("m-{elements}", {"elements": [["Fe", "O"], ["Si"]]}, args)])
+    assert [(c.case_id, c.args["elements"]) for c in cases] == [("m-Fe+O", ["Fe", "O"]), ("m-Si", ["Si"])]
+
+
+@pytest.mark.parametrize(
+    "matrix,message",
+    [
+        ({"formula": []}, "non-empty list"),
+        ({"formula": ["Fe", "Fe"]}, "duplicate values"),
+        ({"bad-name": [1]}, "parameter names"),
+        ([{"formula": ["Fe"]}, {"other": [1]}], "not set by every matrix grid"),
+        ([], "must not be empty"),
+    ],
+)
+def test_invalid_matrix_is_rejected(matrix, message):
+    with pytest.raises(ValueError, match=message):
+        parse_suite_cases([_matrix("m-{formula}", matrix, {"formula": "{formula}"})])
+
+
+def test_step_references_are_not_matrix_parameters():
+    item = {
+        "case_id": "chain-{formula}",
+        "steps": [
+            {"id": "s1", "tool_name": "search", "args": {"formula": "{formula}"}},
+            {"id": "s2", "tool_name": "fetch", "args": {"ids": "${s1.$.ids}"}},
+        ],
+        "matrix": {"formula": ["Fe"]},
+    }
+    (case,) = parse_suite_cases([item])
+    assert case.steps[0].args == {"formula": "Fe"}
+    assert case.steps[1].args == {"ids": "${s1.$.ids}"}
+
+
+def test_jsonl_cases_are_read_lazily(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    lines = [json.dumps(_matrix("m-{formula}", {"formula": ["Fe", "Si"]}, {"formula": "{formula}"})), "", "{broken"]
+    path.write_text("\n".join(lines))
+    cases = iter_suite_cases(str(path))
+    assert [next(cases).case_id, next(cases).case_id] == ["m-Fe", "m-Si"]
+    with pytest.raises(ValueError):
+        next(cases)